@@ -0,0 +1,120 @@
+"""
+Measure the cost of looking up the transforms of many active animations.
+
+Before the transform tables, every call to frameTransform built a new chain
+of QTransforms in python, and combined animations multiplied the transforms
+of all of their children again. Now the transforms of every frame are
+computed once per size and each call is a table lookup.
+"""
+
+import os
+import sys
+import timeit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Use the iconify in this checkout, without it needing to be installed
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import iconify as ico  # noqa: E402
+from iconify.qt import QtCore, QtGui  # noqa: E402
+
+SIZE = QtCore.QSize(32, 32)
+ANIMATION_COUNT = 300
+# One second of ticks at the default frame rate
+TICKS = 60
+REPEAT = 5
+
+
+def spinTransform(anim, size, frame):
+    # type: (ico.anim.Spin, QtCore.QSize, int) -> QtGui.QTransform
+    """
+    Spin.frameTransform prior to the transform tables.
+    """
+    halfSize = size / 2
+    rotation = 360.0 / anim.maxFrame()
+
+    xfm = QtGui.QTransform()
+    xfm = xfm.translate(halfSize.width(), halfSize.height())
+    xfm = xfm.scale(anim._scale, anim._scale)
+    xfm = xfm.rotate(rotation * frame)
+    xfm = xfm.translate(-halfSize.width(), -halfSize.height())
+    return xfm
+
+
+def breatheTransform(anim, size, frame):
+    # type: (ico.anim.Breathe, QtCore.QSize, int) -> QtGui.QTransform
+    """
+    Breathe.frameTransform prior to the transform tables.
+    """
+    halfWay = anim.maxFrame() / 2
+    if frame > halfWay:
+        t = float(frame - halfWay) / halfWay
+        scale = 0.9 - (0.2 * anim._parametricEase(t))
+    else:
+        t = float(frame) / halfWay
+        scale = 0.7 + (0.2 * anim._parametricEase(t))
+
+    halfSize = size / 2
+    xfm = QtGui.QTransform()
+    xfm = xfm.translate(halfSize.width(), halfSize.height())
+    xfm = xfm.scale(scale, scale)
+    xfm = xfm.translate(-halfSize.height(), -halfSize.width())
+    return xfm
+
+
+def createAnimations():
+    # type: () -> list
+    anims = []
+    for index in range(ANIMATION_COUNT):
+        if index % 3 == 0:
+            anims.append(ico.anim.Spin())
+        elif index % 3 == 1:
+            anims.append(ico.anim.Breathe())
+        else:
+            anims.append(ico.anim.Spin() + ico.anim.Breathe())
+    return anims
+
+
+def main():
+    # type: () -> None
+    app = QtGui.QGuiApplication([])  # noqa: F841
+    anims = createAnimations()
+
+    def before():
+        # type: () -> None
+        for tick in range(TICKS):
+            for anim in anims:
+                frame = anim.minFrame() + tick % anim.frameCount()
+                if isinstance(anim, ico.anim.Spin):
+                    spinTransform(anim, SIZE, frame)
+                elif isinstance(anim, ico.anim.Breathe):
+                    breatheTransform(anim, SIZE, frame)
+                else:
+                    spin, breathe = anim._anims
+                    spinFrame, breatheFrame = anim.childFrames(frame)
+                    breatheTransform(breathe, SIZE, breatheFrame) * \
+                        spinTransform(spin, SIZE, spinFrame)
+
+    def after():
+        # type: () -> None
+        for tick in range(TICKS):
+            for anim in anims:
+                frame = anim.minFrame() + tick % anim.frameCount()
+                anim.frameTransform(SIZE, frame)
+
+    # Build the tables so only the lookups are measured.
+    for anim in anims:
+        anim.frameTransforms(SIZE)
+
+    for name, func in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(func, number=REPEAT, repeat=3)) / REPEAT
+        print(
+            "{:>6}: {:.2f}ms per second of {} active animations".format(
+                name, seconds * 1000, ANIMATION_COUNT
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
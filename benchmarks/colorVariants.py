@@ -0,0 +1,81 @@
+"""
+Measure the cost of a color variant cache miss in PixmapGenerator.pixmap.
+
+Before the mask cache, every color variant re-rendered the svg and copied
+it's alpha channel onto a second image. Now the svg is rendered once per
+size & frame and each color variant is a single composition pass.
+"""
+
+import os
+import sys
+import timeit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Use the iconify in this checkout, without it needing to be installed
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault(
+    "ICONIFY_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "icons")
+)
+
+import iconify as ico  # noqa: E402
+from iconify.qt import QtCore, QtGui, QtSvg  # noqa: E402
+
+ICON = "delete"
+SIZE = QtCore.QSize(64, 64)
+COLORS = [
+    QtGui.QColor(name) for name in (
+        "red", "green", "blue", "orange", "salmon", "seagreen", "gray",
+        "lightblue"
+    )
+]
+REPEAT = 200
+
+
+def before():
+    # type: () -> None
+    """
+    The color variant pipeline prior to the mask cache.
+    """
+    renderer = QtSvg.QSvgRenderer(ico.path.findIcon(ICON))
+    for color in COLORS:
+        image = QtGui.QImage(SIZE, QtGui.QImage.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(image)
+        renderer.render(painter)
+        painter.end()
+
+        colorImage = QtGui.QImage(
+            SIZE, QtGui.QImage.Format_ARGB32_Premultiplied
+        )
+        colorImage.fill(color)
+        colorImage.setAlphaChannel(image.alphaChannel())
+        QtGui.QPixmap.fromImage(colorImage)
+
+
+def after():
+    # type: () -> None
+    """
+    The current pipeline, with the mask already rendered.
+    """
+    ico.PixmapGenerator.pixmapCache().clear()
+    for color in COLORS:
+        ico.PixmapGenerator(ICON, color=color).pixmap(SIZE)
+
+
+def main():
+    # type: () -> None
+    app = QtGui.QGuiApplication([])  # noqa: F841
+
+    # Prime the mask cache so only the color variant misses are measured.
+    ico.PixmapGenerator(ICON).pixmap(SIZE)
+
+    for name, func in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(func, number=REPEAT, repeat=3))
+        perVariant = seconds / (REPEAT * len(COLORS)) * 1e6
+        print("{:>6}: {:.1f}us per color variant miss".format(name, perVariant))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure the cost of filtering a large icon library as the user types.
+
+Before the search index, the browser handed a `.*term.*` regex to a
+QSortFilterProxyModel, which ran it over every name on each keystroke. Now
+the names holding the words of the query are found through a trigram index
+of the words used by the names.
+"""
+
+import os
+import random
+import string
+import sys
+import timeit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Use the iconify in this checkout, without it needing to be installed
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import iconify as ico  # noqa: E402
+from iconify.qt import QtCore, QtGui  # noqa: E402
+
+NAME_COUNT = 50000
+WORD_COUNT = 5000
+NAMESPACES = (
+    "font-awesome:solid",
+    "font-awesome:regular",
+    "material-design",
+    "feather",
+    "elusive",
+    "dash",
+)
+# The queries typed one character at a time
+QUERIES = ("a", "ar", "arr", "arro", "arrow")
+REPEAT = 5
+
+
+def createNames():
+    # type: () -> list
+    random.seed(0)
+    words = ["arrow"]
+    while len(words) < WORD_COUNT:
+        letters = random.sample(string.ascii_lowercase, random.randint(3, 8))
+        words.append("".join(letters))
+
+    names = set()
+    while len(names) < NAME_COUNT:
+        parts = random.sample(words, random.randint(1, 3))
+        names.add(random.choice(NAMESPACES) + ":" + "-".join(parts))
+    return sorted(names)
+
+
+def main():
+    # type: () -> None
+    app = QtGui.QGuiApplication([])  # noqa: F841
+    names = createNames()
+
+    model = QtCore.QStringListModel()
+    model.setStringList(names)
+    proxyModel = QtCore.QSortFilterProxyModel()
+    proxyModel.setSourceModel(model)
+    proxyModel.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+
+    index = ico.path.IconSearchIndex(names)
+
+    def before():
+        # type: () -> None
+        for query in QUERIES:
+            proxyModel.setFilterRegExp(".*%s.*$" % query)
+            proxyModel.rowCount()
+
+    def after():
+        # type: () -> None
+        for query in QUERIES:
+            index.search(query)
+
+    for name, func in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(func, number=REPEAT, repeat=3)) / REPEAT
+        print(
+            "{:>6}: {:.2f}ms per keystroke over {} names".format(
+                name, seconds * 1000 / len(QUERIES), NAME_COUNT
+            )
+        )
+
+    seconds = min(
+        timeit.repeat(lambda: ico.path.IconSearchIndex(names), number=1)
+    )
+    print(" build: {:.2f}ms".format(seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -51,8 +51,9 @@ view.setIconSize(QtCore.QSize(64, 64))
 
 view.setModel(model)
 
+# Repaints only the visible indexes with animated icons when the anim ticks
+view.setItemDelegate(ico.view.AnimatedIconDelegate(view))
 
-anim.tick.connect(view.viewport().update)
 anim.start()
 view.show()
 
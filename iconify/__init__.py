@@ -1,2 +1,14 @@
-from . import anim, fetch, path  # noqa: F401
+from . import (  # noqa: F401
+    anim,
+    archive,
+    cache,
+    export,
+    fetch,
+    offscreen,
+    pack,
+    path,
+    repaint,
+    view,
+    watch
+)
 from .core import Icon, PixmapGenerator  # noqa: F401
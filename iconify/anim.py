@@ -2,29 +2,69 @@
 The animation objects for iconify
 """
 
+import math
 from enum import Enum
-from typing import Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
 
+from iconify.cache import PixmapCache
 from iconify.qt import QtCore, QtGui
 
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List
+    Fingerprint = Tuple[Any, ...]
+
+
+def _lcm(a, b):
+    # type: (int, int) -> int
+    """
+    Return the lowest common multiple of the provided numbers.
+
+    Parameters
+    ----------
+    a : int
+    b : int
+
+    Returns
+    -------
+    int
+    """
+    x, y = a, b
+    while y:
+        x, y = y, x % y
+    return a * b // x
+
 
 class GlobalTick(QtCore.QObject):
     """
     A singleton timer used to trigger all animation objects created by iconify
+
+    The timer only runs while it has subscribers, so an application with no
+    active animations isn't woken up. It runs at the highest frame rate
+    requested by it's subscribers and each subscriber is called at the rate
+    it requested.
     """
 
+    # Emitted on every tick while the timer is running. Connecting to this
+    # signal doesn't start the timer, use subscribe for that.
     timeout = QtCore.Signal()
 
     _instance = None  # type: Optional[GlobalTick]
 
+    _defaultFps = 60.0
+
     def __init__(self):
         # type: () -> None
         # Note: No parent so it's owned by Qt
         super(GlobalTick, self).__init__()
         self._tick = QtCore.QTimer()
-        self._tick.timeout.connect(self.timeout.emit)
-        self._tick.setInterval(17)  # 60fps (ish)
-        self._tick.start()
+        self._tick.setTimerType(QtCore.Qt.PreciseTimer)
+        self._tick.timeout.connect(self._onTimeout)
+
+        self._clock = QtCore.QElapsedTimer()
+        self._clock.start()
+
+        # Maps callbacks to [fps, time of last call] lists
+        self._subscribers = {}  # type: Dict[Callable[[], None], List[Any]]
 
     @classmethod
     def instance(cls):
@@ -40,6 +80,143 @@ class GlobalTick(QtCore.QObject):
             cls._instance = cls()
         return cls._instance
 
+    @classmethod
+    def defaultFps(cls):
+        # type: () -> float
+        """
+        Return the frame rate of subscribers that don't request their own.
+
+        Returns
+        -------
+        float
+        """
+        return cls._defaultFps
+
+    @classmethod
+    def setDefaultFps(cls, fps):
+        # type: (float) -> None
+        """
+        Set the frame rate of subscribers that don't request their own.
+
+        Animations step one frame per tick, so they play slower at lower
+        frame rates.
+
+        Parameters
+        ----------
+        fps : float
+        """
+        cls._defaultFps = fps
+        if cls._instance is not None:
+            cls._instance._updateTimer()
+
+    def subscribe(self, callback, fps=None):
+        # type: (Callable[[], None], Optional[float]) -> None
+        """
+        Call the provided callback on every tick, starting the timer if it
+        isn't running. Subscribing an existing callback updates it's
+        frame rate.
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+        fps : Optional[float]
+            The rate to call the callback at. When not provided, the default
+            frame rate is used.
+        """
+        entry = self._subscribers.get(callback)
+        if entry is None:
+            self._subscribers[callback] = [fps, self._clock.elapsed()]
+        else:
+            entry[0] = fps
+        self._updateTimer()
+
+    def unsubscribe(self, callback):
+        # type: (Callable[[], None]) -> None
+        """
+        Stop calling the provided callback, stopping the timer if there are
+        no subscribers left.
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+        """
+        self._subscribers.pop(callback, None)
+        self._updateTimer()
+
+    def subscriberCount(self):
+        # type: () -> int
+        """
+        Return the number of callbacks subscribed to the ticker.
+
+        Returns
+        -------
+        int
+        """
+        return len(self._subscribers)
+
+    def isActive(self):
+        # type: () -> bool
+        """
+        Indicate if the timer is running.
+
+        Returns
+        -------
+        bool
+        """
+        return self._tick.isActive()
+
+    def elapsed(self):
+        # type: () -> int
+        """
+        Return the number of milliseconds since the ticker was created,
+        measured with a monotonic clock.
+
+        Returns
+        -------
+        int
+        """
+        return self._clock.elapsed()
+
+    def interval(self):
+        # type: () -> int
+        """
+        Return the number of milliseconds between ticks.
+
+        Returns
+        -------
+        int
+        """
+        return self._tick.interval()
+
+    def _updateTimer(self):
+        # type: () -> None
+        if not self._subscribers:
+            self._tick.stop()
+            return
+
+        fps = max(
+            entry[0] or self._defaultFps
+            for entry in self._subscribers.values()
+        )
+        self._tick.setInterval(max(1, int(round(1000.0 / fps))))
+        if not self._tick.isActive():
+            self._tick.start()
+
+    def _onTimeout(self):
+        # type: () -> None
+        now = self._clock.elapsed()
+        # Allow for the timer firing slightly early
+        tolerance = self._tick.interval() / 2.0
+
+        # Callbacks may subscribe or unsubscribe while they're called
+        for callback, entry in list(self._subscribers.items()):
+            fps = entry[0] or self._defaultFps
+            if now - entry[1] >= 1000.0 / fps - tolerance:
+                entry[1] = now
+                callback()
+
+        self.timeout.emit()
+
 
 class BaseAnimation(QtCore.QObject):
     """
@@ -52,11 +229,38 @@ class BaseAnimation(QtCore.QObject):
     _minFrame = 0
     _maxFrame = 100
 
+    # The number of frames played per second when the animation is time based
+    _frameRate = 60.0
+    # Whether the animation repeats once it reaches the last frame
+    _loop = True
+
+    _timeBasedDefault = False
+
+    # Maps (fingerprint, width, height) to the transform of every frame, so
+    # animations with the same parameters share their tables. The cost of a
+    # table is it's number of transforms, and the least recently used tables
+    # are evicted once there are more than _maxTableTransforms. Animations
+    # keep the tables they use regardless.
+    _maxTableTransforms = 64 * 1024
+    _transformTables = PixmapCache(maxCost=_maxTableTransforms)
+
     def __init__(self, parent=None):
         # type: (Optional[QtCore.QObject]) -> None
         super(BaseAnimation, self).__init__(parent=parent)
         self._frame = self._minFrame
         self._active = False
+        self._fps = None  # type: Optional[float]
+        self._suspended = False
+        self._timeBased = None  # type: Optional[bool]
+        self._maxDistinctFrames = None  # type: Optional[int]
+        self._transformOnPaint = False
+        # The time, in GlobalTick.elapsed milliseconds, the time based
+        # animation was at it's first frame.
+        self._startTime = 0.0
+        # Maps (width, height) to the transform table for that size
+        self._tables = {}  # type: Dict[Tuple[int, int], Tuple[Any, ...]]
+        # Built on first use, as it's part of the key of every cached pixmap
+        self._fingerprint = None  # type: Optional[Fingerprint]
 
     def __add__(self, other):
         # type: (object) -> BaseAnimation
@@ -66,15 +270,77 @@ class BaseAnimation(QtCore.QObject):
             return concatAnim
         raise ValueError("Unsupported operation!")
 
-    def transform(self, rect):
-        # type: (QtCore.QRect) -> QtGui.QTransform
+    def fingerprint(self):
+        # type: () -> Fingerprint
+        """
+        Return a hashable value that identifies the parameters of this
+        animation. It's made up of strings and numbers so it can be persisted.
+
+        Animations with the same fingerprint produce the same transform for a
+        given frame, which allows the images rendered for those frames to be
+        shared between them.
+
+        Subclasses should re-implement _buildFingerprint rather than this
+        method, which only builds the fingerprint once.
+
+        Returns
+        -------
+        Fingerprint
+        """
+        if self._fingerprint is None:
+            self._fingerprint = self._buildFingerprint()
+        return self._fingerprint
+
+    def _buildFingerprint(self):
+        # type: () -> Fingerprint
+        """
+        Return the fingerprint of this animation, see fingerprint.
+
+        Subclasses with additional parameters should extend the fingerprint
+        returned by this method, and set `_fingerprint` to None when those
+        parameters change.
+
+        Returns
+        -------
+        Fingerprint
+        """
+        cls = type(self)
+        return (
+            "{}.{}".format(cls.__module__, cls.__name__),
+            self._minFrame,
+            self._maxFrame,
+        )
+
+    def transform(self, size):
+        # type: (QtCore.QSize) -> QtGui.QTransform
         """
         Return a QtGui.QTransform for the current frame that will be used
-        when drawing an image in the provided QRect.
+        when drawing an image of the provided size.
+
+        Subclasses should re-implement frameTransform rather than this method
+        so that frames other than the current one can be rendered ahead
+        of time.
 
         Parameters
         ----------
-        rect : QtCore.QRect
+        size : QtCore.QSize
+
+        Returns
+        -------
+        QtGui.QTransform
+        """
+        return self.frameTransform(size, self._frame)
+
+    def frameTransform(self, size, frame):
+        # type: (QtCore.QSize, int) -> QtGui.QTransform
+        """
+        Return a QtGui.QTransform for the provided frame that will be used
+        when drawing an image of the provided size.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+        frame : int
 
         Returns
         -------
@@ -82,12 +348,200 @@ class BaseAnimation(QtCore.QObject):
         """
         return QtGui.QTransform()
 
+    def frameTransforms(self, size):
+        # type: (QtCore.QSize) -> Tuple[QtGui.QTransform, ...]
+        """
+        Return the transform of every frame, from the first to the last, that
+        will be used when drawing an image of the provided size.
+
+        The transforms are computed once per size and shared between
+        animations with the same fingerprint.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+
+        Returns
+        -------
+        Tuple[QtGui.QTransform, ...]
+        """
+        sizeKey = (size.width(), size.height())
+        table = self._tables.get(sizeKey)
+        if table is None:
+            tableKey = (self.fingerprint(), ) + sizeKey
+            table = BaseAnimation._transformTables.get(tableKey)
+            if table is None:
+                table = tuple(self._buildTransforms(size))
+                BaseAnimation._transformTables.insert(
+                    tableKey, table, cost=len(table)
+                )
+            self._tables[sizeKey] = table
+        return table
+
+    def _buildTransforms(self, size):
+        # type: (QtCore.QSize) -> List[QtGui.QTransform]
+        """
+        Return the transform of every frame for the provided size. Subclasses
+        which look their transforms up in the table returned by
+        frameTransforms should compute all of them here in a single pass.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+
+        Returns
+        -------
+        List[QtGui.QTransform]
+        """
+        return [
+            self.frameTransform(size, frame)
+            for frame in range(self._minFrame, self._maxFrame + 1)
+        ]
+
+    def _tableTransform(self, size, frame):
+        # type: (QtCore.QSize, int) -> QtGui.QTransform
+        """
+        Return the transform for the provided frame from the transform table
+        of the provided size.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+        frame : int
+
+        Returns
+        -------
+        QtGui.QTransform
+        """
+        table = self._tables.get((size.width(), size.height()))
+        if table is None:
+            table = self.frameTransforms(size)
+        return table[(frame - self._minFrame) % len(table)]
+
+    @classmethod
+    def timeBasedDefault(cls):
+        # type: () -> bool
+        """
+        Indicate if animations are time based when they haven't been told
+        otherwise.
+
+        Returns
+        -------
+        bool
+        """
+        return BaseAnimation._timeBasedDefault
+
+    @classmethod
+    def setTimeBasedDefault(cls, timeBased):
+        # type: (bool) -> None
+        """
+        Set whether animations, which haven't been given an explicit
+        timeBased value, derive their frame from the time since they
+        were started.
+
+        Parameters
+        ----------
+        timeBased : bool
+        """
+        BaseAnimation._timeBasedDefault = timeBased
+
+    def timeBased(self):
+        # type: () -> bool
+        """
+        Indicate if the frame of this animation is derived from the time since
+        it was started, rather than stepping once per tick.
+
+        Returns
+        -------
+        bool
+        """
+        if self._timeBased is None:
+            return BaseAnimation._timeBasedDefault
+        return self._timeBased
+
+    def setTimeBased(self, timeBased):
+        # type: (Optional[bool]) -> None
+        """
+        Set whether the frame of this animation is derived from the time since
+        it was started.
+
+        Time based animations play at the same speed regardless of the frame
+        rate they're ticked at, skipping frames when ticks are late, and only
+        emit the tick signal when the frame changes.
+
+        Parameters
+        ----------
+        timeBased : Optional[bool]
+            When None, the timeBasedDefault is used.
+        """
+        self._timeBased = timeBased
+        if self._active:
+            self._resetClock()
+
+    def maxDistinctFrames(self):
+        # type: () -> Optional[int]
+        """
+        Return the maximum number of distinct frames shown in each cycle of
+        a time based animation, if any.
+
+        Returns
+        -------
+        Optional[int]
+        """
+        return self._maxDistinctFrames
+
+    def setMaxDistinctFrames(self, maxDistinctFrames):
+        # type: (Optional[int]) -> None
+        """
+        Set the maximum number of distinct frames shown in each cycle of a
+        time based animation. Fewer frames means fewer images are rendered
+        and cached for the animation.
+
+        Parameters
+        ----------
+        maxDistinctFrames : Optional[int]
+            When None, every frame is shown.
+        """
+        self._maxDistinctFrames = maxDistinctFrames
+
+    def transformOnPaint(self):
+        # type: () -> bool
+        """
+        Indicate if the transform of this animation is applied when the icon
+        is painted, rather than when it's rendered.
+
+        Returns
+        -------
+        bool
+        """
+        return self._transformOnPaint
+
+    def setTransformOnPaint(self, transformOnPaint):
+        # type: (bool) -> None
+        """
+        Set whether the transform of this animation is applied when the icon
+        is painted, rather than rendering and caching an image per frame.
+
+        A single image is rendered for each size and color, and every frame
+        is drawn from it with a smooth transform. This is intended for
+        animations such as Spin and Scroll which only move the image, and
+        uses far less memory than an image per frame at the cost of
+        transforming the image each time it's drawn.
+
+        Parameters
+        ----------
+        transformOnPaint : bool
+        """
+        self._transformOnPaint = transformOnPaint
+
     def start(self):
         # type: () -> None
         """
         Start the animation.
         """
-        GlobalTick.instance().timeout.connect(self._tick)
+        self._resetClock()
+        if not self._suspended:
+            GlobalTick.instance().subscribe(self._tick, self._fps)
         self._active = True
 
     def stop(self):
@@ -103,10 +557,7 @@ class BaseAnimation(QtCore.QObject):
         """
         Stop the animation and maintain the current frame
         """
-        try:
-            GlobalTick.instance().timeout.disconnect(self._tick)
-        except RuntimeError:
-            pass
+        GlobalTick.instance().unsubscribe(self._tick)
         self._active = False
 
     def toggle(self):
@@ -130,6 +581,67 @@ class BaseAnimation(QtCore.QObject):
         """
         return self._active
 
+    def suspended(self):
+        # type: () -> bool
+        """
+        Indicate if the animation has been suspended.
+
+        Returns
+        -------
+        bool
+        """
+        return self._suspended
+
+    def setSuspended(self, suspended):
+        # type: (bool) -> None
+        """
+        Stop or resume ticking the animation without changing whether it's
+        active, e.g. while nothing that displays it is visible. Resumed
+        animations continue from the frame they were suspended at.
+
+        Parameters
+        ----------
+        suspended : bool
+        """
+        if suspended == self._suspended:
+            return
+
+        self._suspended = suspended
+        if not self._active:
+            return
+
+        if suspended:
+            GlobalTick.instance().unsubscribe(self._tick)
+        else:
+            self._resetClock()
+            GlobalTick.instance().subscribe(self._tick, self._fps)
+
+    def fps(self):
+        # type: () -> Optional[float]
+        """
+        Return the frame rate requested by this animation, if any.
+
+        Returns
+        -------
+        Optional[float]
+        """
+        return self._fps
+
+    def setFps(self, fps):
+        # type: (Optional[float]) -> None
+        """
+        Set the rate this animation is ticked at. The animation steps one
+        frame per tick, so it plays slower at lower frame rates.
+
+        Parameters
+        ----------
+        fps : Optional[float]
+            When None, the default frame rate of the GlobalTick is used.
+        """
+        self._fps = fps
+        if self._active and not self._suspended:
+            GlobalTick.instance().subscribe(self._tick, fps)
+
     def frame(self):
         # type: () -> int
         """
@@ -141,12 +653,48 @@ class BaseAnimation(QtCore.QObject):
         """
         return self._frame
 
+    def minFrame(self):
+        # type: () -> int
+        """
+        Return the first frame of the animation.
+
+        Returns
+        -------
+        int
+        """
+        return self._minFrame
+
+    def maxFrame(self):
+        # type: () -> int
+        """
+        Return the last frame of the animation.
+
+        Returns
+        -------
+        int
+        """
+        return self._maxFrame
+
+    def frameCount(self):
+        # type: () -> int
+        """
+        Return the number of distinct frames in one cycle of the animation.
+
+        Returns
+        -------
+        int
+        """
+        return self._maxFrame - self._minFrame + 1
+
     def forceTick(self):
         # type: () -> None
         """
         Manually increment the current frame.
         """
-        self._tick()
+        self.incrementFrame()
+        if self.timeBased():
+            self._resetClock()
+        self.tick.emit()
 
     def incrementFrame(self):
         # type: () -> None
@@ -159,9 +707,56 @@ class BaseAnimation(QtCore.QObject):
         else:
             self._frame += 1
 
+    def _resetClock(self):
+        # type: () -> None
+        """
+        Align the clock of a time based animation with the current frame, so
+        it continues from that frame.
+        """
+        offset = (self._frame - self._minFrame) * 1000.0 / self._frameRate
+        self._startTime = GlobalTick.instance().elapsed() - offset
+
+    def _timeFrame(self):
+        # type: () -> Optional[int]
+        """
+        Return the frame of a time based animation for the current time, or
+        None if a single shot animation has finished.
+
+        Returns
+        -------
+        Optional[int]
+        """
+        elapsed = GlobalTick.instance().elapsed() - self._startTime
+        # Allow for rounding errors when the clock was aligned with a frame
+        position = int(elapsed * self._frameRate / 1000.0 + 1e-6)
+        frameCount = self.frameCount()
+        if not self._loop and position >= frameCount:
+            return None
+
+        index = position % frameCount
+        maxDistinctFrames = self._maxDistinctFrames
+        if maxDistinctFrames and maxDistinctFrames < frameCount:
+            # Rounded up so the shown frames map back to themselves
+            step = float(frameCount) / maxDistinctFrames
+            index = int(math.ceil(int(index / step) * step))
+
+        return self._minFrame + index
+
     def _tick(self):
         # type: () -> None
-        self.incrementFrame()
+        if not self.timeBased():
+            self.incrementFrame()
+            self.tick.emit()
+            return
+
+        frame = self._timeFrame()
+        if frame is None:
+            self.stop()
+        elif frame == self._frame:
+            # Nothing needs to be redrawn
+            return
+        else:
+            self._frame = frame
         self.tick.emit()
 
 
@@ -171,6 +766,8 @@ class SingleShotMixin(object):
     animation loops once and then stops itself.
     """
 
+    _loop = False
+
     def incrementFrame(self):  # type: ignore[misc]  # noqa: F821
         # type: (BaseAnimation) -> None
         if self._frame == self._maxFrame:
@@ -190,26 +787,53 @@ class Spin(BaseAnimation):
         CLOCKWISE = 0
         ANTI_CLOCKWISE = 1
 
+    # The scale applied to the image so it's corners aren't clipped
+    _scale = 0.8
+
     def __init__(self, direction=Directions.CLOCKWISE, rpm=60):
         super(Spin, self).__init__()
         self._maxFrame = int(60.0 / (rpm / 60.0))
         self._direction = direction
 
-    def transform(self, size):
-        # type: (QtCore.QSize) -> QtGui.QTransform
+    def _buildFingerprint(self):
+        # type: () -> Fingerprint
+        return super(Spin, self)._buildFingerprint() + (
+            self._direction.value,
+            self._scale,
+        )
+
+    def frameTransform(self, size, frame):
+        # type: (QtCore.QSize, int) -> QtGui.QTransform
+        return self._tableTransform(size, frame)
+
+    def _buildTransforms(self, size):
+        # type: (QtCore.QSize) -> List[QtGui.QTransform]
         halfSize = size / 2
+        centerX = halfSize.width()
+        centerY = halfSize.height()
 
-        rotation = 360.0 / self._maxFrame
+        rotation = math.radians(360.0 / self._maxFrame)
         if self._direction == Spin.Directions.ANTI_CLOCKWISE:
             rotation *= -1
 
-        xfm = QtGui.QTransform()
-        xfm = xfm.translate(halfSize.width(), halfSize.height())
-        xfm = xfm.scale(0.8, 0.8)
-        xfm = xfm.rotate(rotation * self._frame)
-        xfm = xfm.translate(-halfSize.width(), -halfSize.height())
-
-        return xfm
+        # A rotation and scale about the center of the image
+        transforms = []
+        for frame in range(self._minFrame, self._maxFrame + 1):
+            angle = rotation * frame
+            cos = self._scale * math.cos(angle)
+            sin = self._scale * math.sin(angle)
+            transforms.append(
+                QtGui.QTransform(
+                    cos,
+                    sin,
+                    -sin,
+                    cos,
+                    centerX - cos * centerX + sin * centerY,
+                    centerY - sin * centerX - cos * centerY,
+                )
+            )
+
+        return transforms
 
 
 class SingleShotSpin(SingleShotMixin, Spin):
@@ -228,88 +852,139 @@ class Breathe(BaseAnimation):
         sqt = t * t
         return sqt / (2.0 * (sqt - t) + 1.0)
 
-    def transform(self, size):
-        # type: (QtCore.QSize) -> QtGui.QTransform
-        halfWay = self._maxFrame / 2
-
-        if self._frame > halfWay:
-            t = float(self._frame - halfWay) / halfWay
-            m = self._parametricEase(t)
-            scale = 0.9 - (0.2 * m)
-
-        else:
-            t = float(self._frame) / halfWay
-            m = self._parametricEase(t)
-            scale = 0.7 + (0.2 * m)
+    def frameTransform(self, size, frame):
+        # type: (QtCore.QSize, int) -> QtGui.QTransform
+        return self._tableTransform(size, frame)
 
+    def _buildTransforms(self, size):
+        # type: (QtCore.QSize) -> List[QtGui.QTransform]
+        halfWay = self._maxFrame / 2
         halfSize = size / 2
-
-        xfm = QtGui.QTransform()
-        xfm = xfm.translate(halfSize.width(), halfSize.height())
-
-        xfm = xfm.scale(scale, scale)
-        xfm = xfm.translate(-halfSize.height(), -halfSize.width())
-
-        return xfm
+        halfWidth = halfSize.width()
+        halfHeight = halfSize.height()
+
+        transforms = []
+        for frame in range(self._minFrame, self._maxFrame + 1):
+            if frame > halfWay:
+                t = float(frame - halfWay) / halfWay
+                scale = 0.9 - (0.2 * self._parametricEase(t))
+            else:
+                t = float(frame) / halfWay
+                scale = 0.7 + (0.2 * self._parametricEase(t))
+
+            transforms.append(
+                QtGui.QTransform(
+                    scale,
+                    0.0,
+                    0.0,
+                    scale,
+                    halfWidth - scale * halfHeight,
+                    halfHeight - scale * halfWidth,
+                )
+            )
+
+        return transforms
 
 
 class _ConcatAnim(BaseAnimation):
+    """
+    Combines the transforms of multiple animations.
+
+    The frames of the child animations are derived from the frame of this
+    animation, so it's period is the lowest common multiple of the number of
+    frames in each child. When that exceeds the maximum period, each child is
+    adjusted to complete a whole number of cycles within the maximum period.
+    Either way, the number of distinct frames, and therefore cached images,
+    is bounded.
+    """
 
     _maxFrame = 100000
 
+    # The maximum number of frames in a cycle of a combined animation
+    _maxPeriod = 1024
+
     def __init__(self, parent=None):
         # type: (Optional[QtGui.QObject]) -> None
         super(_ConcatAnim, self).__init__(parent=parent)
         self._anims = ()  # type: Tuple[BaseAnimation, ...]
+        # The number of times each child cycles in a period of this animation
+        self._cycles = ()  # type: Tuple[int, ...]
 
     def setAnimations(self, anims):
         # type: (Sequence[BaseAnimation]) -> None
         self._anims = tuple(anims)
-        self._maxFrame = max([a._maxFrame for a in anims])
 
-    def transform(self, rect):
-        # type: (QtCore.QRect) -> QtGui.QTransform
-        xfm = QtGui.QTransform()
+        frameCounts = [anim.frameCount() for anim in self._anims]
+        period = 1
+        for frameCount in frameCounts:
+            period = _lcm(period, frameCount)
+
+        if period > self._maxPeriod:
+            # Use as many whole cycles of the longest child as will fit.
+            longest = max(frameCounts)
+            period = max(longest, self._maxPeriod // longest * longest)
+            self._cycles = tuple(
+                max(1, int(round(float(period) / frameCount)))
+                for frameCount in frameCounts
+            )
+        else:
+            self._cycles = tuple(
+                period // frameCount for frameCount in frameCounts
+            )
+
+        self._maxFrame = self._minFrame + period - 1
+        self._tables = {}
+        self._fingerprint = None
+
+    def _buildFingerprint(self):
+        # type: () -> Fingerprint
+        return super(_ConcatAnim, self)._buildFingerprint() + tuple(
+            anim.fingerprint() for anim in self._anims
+        )
+
+    def childFrames(self, frame):
+        # type: (int) -> Tuple[int, ...]
+        """
+        Return the frame of each child animation for the provided frame.
 
-        for anim in self._anims:
-            xfm = anim.transform(rect) * xfm
+        Parameters
+        ----------
+        frame : int
 
-        return xfm
+        Returns
+        -------
+        Tuple[int, ...]
+        """
+        offset = frame - self._minFrame
+        period = self.frameCount()
+        childFrames = []
 
-    def start(self):
-        # type: () -> None
-        for anim in self._anims:
-            anim.start()
-        GlobalTick.instance().timeout.connect(self._tick)
-        self._active = True
+        for anim, cycles in zip(self._anims, self._cycles):
+            frameCount = anim.frameCount()
+            animOffset = offset * cycles * frameCount // period
+            childFrames.append(anim.minFrame() + animOffset % frameCount)
 
-    def stop(self):
-        # type: () -> None
-        for anim in self._anims:
-            anim.stop()
-        self._frame = self._minFrame
-        GlobalTick.instance().timeout.disconnect(self._tick)
-        self._active = False
+        return tuple(childFrames)
 
-    def pause(self):
-        # type: () -> None
-        for anim in self._anims:
-            anim.pause()
-        GlobalTick.instance().timeout.disconnect(self._tick)
-        self._active = False
+    def frameTransform(self, size, frame):
+        # type: (QtCore.QSize, int) -> QtGui.QTransform
+        return self._tableTransform(size, frame)
 
-    def toggle(self):
-        # type: () -> None
-        if self.active():
-            self.pause()
-        else:
-            self.start()
+    def _buildTransforms(self, size):
+        # type: (QtCore.QSize) -> List[QtGui.QTransform]
+        childTables = [anim.frameTransforms(size) for anim in self._anims]
+        childMinFrames = [anim.minFrame() for anim in self._anims]
 
-    def forceTick(self):
-        # type: () -> None
-        for anim in self._anims:
-            anim.forceTick()
-        super(_ConcatAnim, self).forceTick()
+        transforms = []
+        for frame in range(self._minFrame, self._maxFrame + 1):
+            xfm = QtGui.QTransform()
+            for table, minFrame, animFrame in zip(
+                childTables, childMinFrames, self.childFrames(frame)
+            ):
+                xfm = table[animFrame - minFrame] * xfm
+            transforms.append(xfm)
+
+        return transforms
 
 
 class Scroll(BaseAnimation):
@@ -328,7 +1003,16 @@ class Scroll(BaseAnimation):
         self._maxFrame = int(60.0 / (rpm / 60.0))
         self._direction = direction
 
-    def transform(self, rect):
+    def _buildFingerprint(self):
+        # type: () -> Fingerprint
+        return super(Scroll, self)._buildFingerprint() + (self._direction, )
+
+    def frameTransform(self, size, frame):
+        # type: (QtCore.QSize, int) -> QtGui.QTransform
+        return self._tableTransform(size, frame)
+
+    def _buildTransforms(self, size):
+        # type: (QtCore.QSize) -> List[QtGui.QTransform]
         if self._direction & Scroll.Directions.LEFT:
             xMult = 1
         elif self._direction & Scroll.Directions.RIGHT:
@@ -343,14 +1027,17 @@ class Scroll(BaseAnimation):
         else:
             yMult = 0
 
-        frame = self.frame()
         halfMaxFrame = self._maxFrame / 2
-        stepSize = rect.width() / halfMaxFrame
-        if frame > halfMaxFrame:
-            offset = stepSize * (self._maxFrame - frame)
-        else:
-            offset = stepSize * -frame
-
-        xfm = QtGui.QTransform()
-        xfm.translate(offset * xMult, offset * yMult)
-        return xfm
+        stepSize = size.width() / halfMaxFrame
+
+        transforms = []
+        for frame in range(self._minFrame, self._maxFrame + 1):
+            if frame > halfMaxFrame:
+                offset = stepSize * (self._maxFrame - frame)
+            else:
+                offset = stepSize * -frame
+            transforms.append(
+                QtGui.QTransform.fromTranslate(offset * xMult, offset * yMult)
+            )
+
+        return transforms
@@ -0,0 +1,269 @@
+"""
+Support for zip archives of svg files on the iconify path
+"""
+
+import fnmatch
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class IconArchive(object):
+    """
+    A read only view of the svg files in a zip archive, such as the archives
+    downloaded by the fetchers, which lets them be used without extracting
+    them.
+
+    The central directory of the archive is read once, into an in-memory
+    index of its svg files and directories. The archive is memory mapped
+    where possible and the data of each svg file is only read, and
+    decompressed, when it's requested.
+
+    Files within the archive are identified by their `/` separated location
+    relative to the root of the archive.
+    """
+
+    # signature, version, flags, compression, time, date, crc, compressed
+    # size, size, name length, extra length
+    _LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+    _LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+    def __init__(self, path):
+        # type: (str) -> None
+        self._path = path
+        stat = os.stat(path)
+        self._stat = (stat.st_mtime, stat.st_size)
+
+        # Maps the locations of the svg files to their entries
+        self._members = {}  # type: Dict[str, zipfile.ZipInfo]
+        # Maps directories to the names of the svg files and sub directories
+        # they hold
+        directories = {}  # type: Dict[str, Tuple[Set[str], Set[str]]]
+
+        with zipfile.ZipFile(path) as zipData:
+            infos = zipData.infolist()
+
+        for info in infos:
+            parts = info.filename.strip('/').split('/')
+            isDirectory = info.filename.endswith('/')
+            if not isDirectory:
+                if not fnmatch.fnmatch(parts[-1], '*.svg'):
+                    continue
+                self._members['/'.join(parts)] = info
+
+            for index in range(len(parts)):
+                parent = '/'.join(parts[:index])
+                listing = directories.setdefault(parent, (set(), set()))
+                if index < len(parts) - 1 or isDirectory:
+                    listing[1].add(parts[index])
+                else:
+                    listing[0].add(parts[index])
+
+        self._directories = {
+            directory: (sorted(filenames), sorted(dirnames))
+            for directory, (filenames, dirnames) in directories.items()
+        }  # type: Dict[str, Tuple[List[str], List[str]]]
+
+        self._mmap = None  # type: Optional[mmap.mmap]
+        if stat.st_size:
+            try:
+                with open(path, 'rb') as f:
+                    self._mmap = mmap.mmap(
+                        f.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+            except (IOError, OSError, ValueError):
+                pass
+
+    def path(self):
+        # type: () -> str
+        """
+        Return the location of the archive.
+
+        Returns
+        -------
+        str
+        """
+        return self._path
+
+    def stat(self):
+        # type: () -> Tuple[float, int]
+        """
+        Return the modification time and size of the archive when it was
+        opened.
+
+        Returns
+        -------
+        Tuple[float, int]
+        """
+        return self._stat
+
+    def contains(self, member):
+        # type: (str) -> bool
+        """
+        Indicate if the archive holds an svg file at the provided location.
+
+        Parameters
+        ----------
+        member : str
+
+        Returns
+        -------
+        bool
+        """
+        return member in self._members
+
+    def listDirectory(self, directory):
+        # type: (str) -> Tuple[List[str], List[str]]
+        """
+        Return the sorted names of the svg files and the sub directories in
+        the provided directory of the archive.
+
+        Parameters
+        ----------
+        directory : str
+            The location of the directory, or an empty string for the root
+            of the archive.
+
+        Returns
+        -------
+        Tuple[List[str], List[str]]
+        """
+        return self._directories.get(directory.strip('/'), ([], []))
+
+    def read(self, member):
+        # type: (str) -> bytes
+        """
+        Return the contents of the svg file at the provided location.
+
+        Parameters
+        ----------
+        member : str
+
+        Returns
+        -------
+        bytes
+        """
+        info = self._members.get(member)
+        if info is None:
+            raise IOError(
+                "No svg file named '{}' in archive: {}".format(
+                    member, self._path
+                )
+            )
+
+        # Encrypted files, and files compressed with methods that zlib
+        # doesn't support, are left to zipfile.
+        if info.flag_bits & 0x1 or info.compress_type not in (
+            zipfile.ZIP_STORED,
+            zipfile.ZIP_DEFLATED,
+        ):
+            with zipfile.ZipFile(self._path) as zipData:
+                return zipData.read(info)
+
+        header = self._LOCAL_HEADER.unpack(
+            self._readRange(info.header_offset, self._LOCAL_HEADER.size)
+        )
+        if header[0] != self._LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipfile(
+                "Invalid local header for '{}' in archive: {}".format(
+                    member, self._path
+                )
+            )
+
+        offset = info.header_offset + self._LOCAL_HEADER.size + \
+            header[9] + header[10]
+        data = self._readRange(offset, info.compress_size)
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+
+        if zlib.crc32(data) & 0xffffffff != info.CRC:
+            raise zipfile.BadZipfile(
+                "Bad CRC-32 for '{}' in archive: {}".format(
+                    member, self._path
+                )
+            )
+        return data
+
+    def _readRange(self, offset, length):
+        # type: (int, int) -> bytes
+        """
+        Return the provided range of bytes of the archive.
+
+        Parameters
+        ----------
+        offset : int
+        length : int
+
+        Returns
+        -------
+        bytes
+        """
+        if self._mmap is not None:
+            return self._mmap[offset:offset + length]
+        with open(self._path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+# Maps the locations of the archives that have been opened to their
+# IconArchives
+_archives = {}  # type: Dict[str, IconArchive]
+
+
+def openArchive(path):
+    # type: (str) -> IconArchive
+    """
+    Return the IconArchive for the provided zip file, which is only opened
+    again when the file has changed since it was last opened.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    IconArchive
+    """
+    stat = os.stat(path)
+    archive = _archives.get(path)
+    if archive is None or archive.stat() != (stat.st_mtime, stat.st_size):
+        archive = _archives[path] = IconArchive(path)
+    return archive
+
+
+def splitArchivePath(path):
+    # type: (str) -> Optional[Tuple[str, str]]
+    """
+    Split a location within a zip archive into the location of the archive
+    and the `/` separated location within it e.g.
+    `/icons/feather.zip/icons/x.svg` becomes
+    `('/icons/feather.zip', 'icons/x.svg')`.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    Optional[Tuple[str, str]]
+        None if the location isn't within, or of, a zip archive.
+    """
+    lowered = path.lower()
+    separators = (os.sep, os.altsep or os.sep)
+
+    start = lowered.find('.zip')
+    while start != -1:
+        end = start + len('.zip')
+        if end == len(path) or path[end] in separators:
+            archivePath = path[:end]
+            if archivePath in _archives or os.path.isfile(archivePath):
+                member = path[end:].replace(os.sep, '/')
+                if os.altsep:
+                    member = member.replace(os.altsep, '/')
+                return archivePath, member.strip('/')
+        start = lowered.find('.zip', end)
+
+    return None
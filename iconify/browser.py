@@ -3,11 +3,10 @@ A browser for exploring the available images and possible options.
 """
 
 import sys
-from typing import Any, NoReturn, Optional
+from typing import Any, Dict, NoReturn, Optional
 
 import iconify as ico
 from iconify.qt import QtCore, QtGui, QtWidgets
-from kids.cache import cache
 
 VIEW_COLUMNS = 5
 AUTO_SEARCH_TIMEOUT = 500
@@ -28,24 +27,21 @@ class Browser(QtWidgets.QMainWindow):
         self._currentAnim = None  # type: Optional[ico.anim.BaseAnimation]
         self._currentColor = None  # type: Optional[QtGui.QColor]
 
-        iconNames = ico.path.listIcons()
+        # Every icon, sorted
+        iconNames = ico.path.searchIcons('')
 
         self._filterTimer = QtCore.QTimer(self)
         self._filterTimer.setSingleShot(True)
         self._filterTimer.setInterval(AUTO_SEARCH_TIMEOUT)
         self._filterTimer.timeout.connect(self._updateFilter)
 
-        model = Model()
-        model.setStringList(sorted(iconNames))
-
-        self._proxyModel = QtCore.QSortFilterProxyModel()
-        self._proxyModel.setSourceModel(model)
-        self._proxyModel.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self._model = Model(self)
+        self._model.setStringList(iconNames)
 
         self._listView = View(self)
         self._listView.setUniformItemSizes(True)
         self._listView.setViewMode(QtWidgets.QListView.IconMode)
-        self._listView.setModel(self._proxyModel)
+        self._listView.setModel(self._model)
         self._listView.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self._listView.doubleClicked.connect(self._copyIconText)
         self._listView.selectionModel().currentChanged.connect(
@@ -187,25 +183,21 @@ class Browser(QtWidgets.QMainWindow):
     def _updateFilter(self):
         # type: () -> None
         """
-        Update the string used for filtering in the proxy model with the
-        current text from the line edit.
+        Show the icons matching the current text from the line edit, best
+        match first.
         """
-        reString = ""
-
         group = self._collectionsCombo.currentText()
-        if group != ALL_COLLECTIONS:
-            reString += "^%s:" % group
-
-        searchTerm = self._lineEdit.text()
-        if searchTerm:
-            reString += ".*%s.*$" % searchTerm
+        namespace = None if group == ALL_COLLECTIONS else group
 
-        self._proxyModel.setFilterRegExp(reString)
+        iconNames = ico.path.searchIcons(
+            self._lineEdit.text(), namespace=namespace
+        )
+        self._model.setStringList(iconNames)
 
     def _triggerDelayedUpdate(self):
         # type: () -> None
         """
-        Reset the timer used for committing the search term to the proxy model.
+        Reset the timer used for committing the search term to the model.
         """
         self._filterTimer.stop()
         self._filterTimer.start()
@@ -214,7 +206,7 @@ class Browser(QtWidgets.QMainWindow):
         # type: () -> None
         """
         Stop the timer used for committing the search term and update the
-        proxy model immediately.
+        model immediately.
         """
         self._filterTimer.stop()
         self._updateFilter()
@@ -267,11 +259,17 @@ class View(QtWidgets.QListView):
 
 class Model(QtCore.QStringListModel):
 
+    def __init__(self, parent=None):
+        # type: (Optional[QtCore.QObject]) -> None
+        super(Model, self).__init__(parent)
+        # Maps icon names to their icons, which are kept while the names
+        # shown by the model change
+        self._icons = {}  # type: Dict[str, ico.Icon]
+
     def flags(self, index):
         # type: (QtCore.QModelIndex) -> QtCore.QItemFlags
         return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
 
-    @cache
     def data(self, index, role=QtCore.Qt.DisplayRole):
         # type: (QtCore.QModelIndex, QtCore.Qt.ItemRole) -> Any
         """
@@ -288,7 +286,10 @@ class Model(QtCore.QStringListModel):
         """
         if role == QtCore.Qt.DecorationRole:
             iconString = self.data(index, role=QtCore.Qt.DisplayRole)
-            return ico.Icon(iconString)
+            icon = self._icons.get(iconString)
+            if icon is None:
+                icon = self._icons[iconString] = ico.Icon(iconString)
+            return icon
         return super(Model, self).data(index, role)
 
 
@@ -0,0 +1,747 @@
+"""
+Caching support for the images rendered by iconify
+"""
+
+import collections
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import weakref
+from typing import IO, TYPE_CHECKING, Any, Dict, Hashable, Optional, Tuple
+
+from iconify.archive import splitArchivePath
+from iconify.path import _USER_DIR, readIcon, statIcon
+from iconify.qt import QtCore, QtGui, QtSvg
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+if TYPE_CHECKING:
+    from collections import OrderedDict
+    from typing import Callable, MutableMapping, Sequence
+
+    RendererCacheKey = Tuple[str, float, int]
+    DiskCacheEntry = Tuple[int, int, int, int]
+
+# The default memory budget, in bytes, for a PixmapCache. This can be
+# overridden with the ICONIFY_CACHE_SIZE environment variable.
+DEFAULT_MAX_COST = int(os.environ.get('ICONIFY_CACHE_SIZE', 64 * 1024 * 1024))
+
+# The default location and size cap, in bytes, of a DiskCache.
+DEFAULT_DISK_CACHE_PATH = os.path.join(_USER_DIR, '.cache', 'pixmaps.bin')
+DEFAULT_DISK_CACHE_SIZE = 256 * 1024 * 1024
+
+
+def imageCost(image):
+    # type: (Any) -> int
+    """
+    Return the number of bytes required to store the provided QPixmap
+    or QImage.
+
+    Parameters
+    ----------
+    image : Union[QtGui.QPixmap, QtGui.QImage]
+
+    Returns
+    -------
+    int
+    """
+    return image.width() * image.height() * image.depth() // 8
+
+
+def encodeKey(key):
+    # type: (Sequence[Any]) -> bytes
+    """
+    Return the bytes used to identify the provided key in a file.
+
+    Parameters
+    ----------
+    key : Sequence[Any]
+        The parts of the key, which must have stable string
+        representations across processes.
+
+    Returns
+    -------
+    bytes
+    """
+    return '\x1f'.join([str(part) for part in key]).encode('utf-8')
+
+
+class PixmapCache(object):
+    """
+    A least recently used cache for rendered images.
+
+    Each entry has a cost, which defaults to the number of bytes required to
+    store the image. When the total cost of the entries exceeds the maximum
+    cost, the least recently used entries are evicted until the cache fits
+    within its budget again.
+    """
+
+    def __init__(self, maxCost=DEFAULT_MAX_COST):
+        # type: (int) -> None
+        self._maxCost = maxCost
+        self._totalCost = 0
+        # Maps keys to (value, cost) tuples in least recently used order
+        self._entries = collections.OrderedDict()  # type: OrderedDict
+
+    def __contains__(self, key):
+        # type: (Hashable) -> bool
+        return key in self._entries
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._entries)
+
+    def get(self, key):
+        # type: (Hashable) -> Optional[Any]
+        """
+        Return the value stored for the provided key, marking it as the most
+        recently used entry, or None if the key is not in the cache.
+
+        Parameters
+        ----------
+        key : Hashable
+
+        Returns
+        -------
+        Optional[Any]
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._entries[key] = entry
+        return entry[0]
+
+    def insert(self, key, value, cost=None):
+        # type: (Hashable, Any, Optional[int]) -> bool
+        """
+        Store the provided value in the cache, evicting the least recently
+        used entries if required.
+
+        Values that cost more than the maximum cost of the cache are not
+        stored.
+
+        Parameters
+        ----------
+        key : Hashable
+        value : Any
+        cost : Optional[int]
+            The cost of the entry. When not provided, the value is expected
+            to be a QPixmap or QImage and its size in bytes will be used.
+
+        Returns
+        -------
+        bool
+            True if the value was stored in the cache.
+        """
+        if cost is None:
+            cost = imageCost(value)
+
+        self.remove(key)
+
+        if cost > self._maxCost:
+            return False
+
+        self._entries[key] = (value, cost)
+        self._totalCost += cost
+        self.trim(self._maxCost)
+        return True
+
+    def remove(self, key):
+        # type: (Hashable) -> bool
+        """
+        Remove the entry for the provided key from the cache.
+
+        Parameters
+        ----------
+        key : Hashable
+
+        Returns
+        -------
+        bool
+            True if an entry was removed.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._totalCost -= entry[1]
+        return True
+
+    def removeMatching(self, predicate):
+        # type: (Callable[[Any], bool]) -> int
+        """
+        Remove the entries whose keys satisfy the provided predicate.
+
+        Parameters
+        ----------
+        predicate : Callable[[Any], bool]
+
+        Returns
+        -------
+        int
+            The number of entries removed.
+        """
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self.remove(key)
+        return len(keys)
+
+    def trim(self, maxCost=None):
+        # type: (Optional[int]) -> None
+        """
+        Evict the least recently used entries until the total cost of the
+        cache is no greater than the provided cost.
+
+        Parameters
+        ----------
+        maxCost : Optional[int]
+            When not provided, the maximum cost of the cache is used.
+        """
+        if maxCost is None:
+            maxCost = self._maxCost
+
+        while self._entries and self._totalCost > maxCost:
+            _, (_, cost) = self._entries.popitem(last=False)
+            self._totalCost -= cost
+
+    def clear(self):
+        # type: () -> None
+        """
+        Remove all entries from the cache.
+        """
+        self._entries.clear()
+        self._totalCost = 0
+
+    def count(self):
+        # type: () -> int
+        """
+        Return the number of entries in the cache.
+
+        Returns
+        -------
+        int
+        """
+        return len(self._entries)
+
+    def totalCost(self):
+        # type: () -> int
+        """
+        Return the sum of the costs of all entries in the cache.
+
+        Returns
+        -------
+        int
+        """
+        return self._totalCost
+
+    def maxCost(self):
+        # type: () -> int
+        """
+        Return the maximum cost the cache will hold before evicting entries.
+
+        Returns
+        -------
+        int
+        """
+        return self._maxCost
+
+    def setMaxCost(self, maxCost):
+        # type: (int) -> None
+        """
+        Set the maximum cost the cache will hold, evicting entries
+        immediately if the cache exceeds the new budget.
+
+        Parameters
+        ----------
+        maxCost : int
+        """
+        self._maxCost = maxCost
+        self.trim(maxCost)
+
+
+class RendererCache(object):
+    """
+    A registry of parsed svg files which allows every PixmapGenerator using
+    the same file to share a single QSvgRenderer.
+
+    Renderers are keyed by the resolved path of the file along with its
+    modification time and size, so an edited file is parsed again rather
+    than serving a stale renderer. Files within a zip archive use the
+    modification time and size of the archive. Renderers are only held
+    weakly and are released once no PixmapGenerator is using them.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self._renderers = weakref.WeakValueDictionary(
+        )  # type: MutableMapping[RendererCacheKey, QtSvg.QSvgRenderer]
+        self._contentHashes = {}  # type: Dict[RendererCacheKey, str]
+
+    @staticmethod
+    def key(path):
+        # type: (str) -> RendererCacheKey
+        """
+        Return the key used to identify the current version of the
+        provided file.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        RendererCacheKey
+        """
+        stat = statIcon(path)
+        return os.path.realpath(path), stat.st_mtime, stat.st_size
+
+    @staticmethod
+    def parse(path):
+        # type: (str) -> QtSvg.QSvgRenderer
+        """
+        Return a new QSvgRenderer for the provided svg file. Files within a
+        zip archive are passed to the renderer from memory rather than being
+        extracted.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        QtSvg.QSvgRenderer
+        """
+        if splitArchivePath(path) is None:
+            return QtSvg.QSvgRenderer(path)
+        return QtSvg.QSvgRenderer(QtCore.QByteArray(readIcon(path)))
+
+    def contentHash(self, path):
+        # type: (str) -> str
+        """
+        Return a hash of the content of the current version of the
+        provided file.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        str
+        """
+        key = self.key(path)
+        contentHash = self._contentHashes.get(key)
+        if contentHash is None:
+            contentHash = hashlib.sha1(readIcon(path)).hexdigest()
+            self._contentHashes[key] = contentHash
+        return contentHash
+
+    def renderer(self, path):
+        # type: (str) -> QtSvg.QSvgRenderer
+        """
+        Return a QSvgRenderer for the provided svg file, parsing the file only
+        if no renderer exists for the current version of it.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        QtSvg.QSvgRenderer
+        """
+        key = self.key(path)
+        renderer = self._renderers.get(key)
+        if renderer is None:
+            renderer = self.parse(path)
+            self._renderers[key] = renderer
+        return renderer
+
+    def count(self):
+        # type: () -> int
+        """
+        Return the number of renderers that are currently alive.
+
+        Returns
+        -------
+        int
+        """
+        return len(self._renderers)
+
+    def invalidate(self, *paths):
+        # type: (*str) -> None
+        """
+        Forget the renderers and content hashes of every version of the
+        provided files, e.g. as they've been edited without changing their
+        modification time or size.
+
+        Parameters
+        ----------
+        *paths : str
+        """
+        realPaths = set(os.path.realpath(path) for path in paths)
+        for key in list(self._renderers.keys()):
+            if key[0] in realPaths:
+                self._renderers.pop(key, None)
+        for key in list(self._contentHashes):
+            if key[0] in realPaths:
+                del self._contentHashes[key]
+
+    def clear(self):
+        # type: () -> None
+        """
+        Forget all registered renderers. Renderers that are still in use are
+        not destroyed but will no longer be shared with new PixmapGenerators.
+        """
+        self._renderers.clear()
+        self._contentHashes.clear()
+
+
+class DiskCache(object):
+    """
+    A persistent cache of rendered images which can be shared between
+    processes and survives restarts.
+
+    All images are stored in a single file, as raw premultiplied ARGB32 data,
+    which is memory mapped for reading. The file starts with a header
+    identifying the format version and is followed by records that are only
+    ever appended. Writers hold an exclusive lock on a sibling `.lock` file
+    while appending, and readers hold a shared lock while indexing new
+    records, so multiple processes can use the same cache.
+
+    When appending an image would grow the file beyond its size cap, the file
+    is atomically replaced with an empty one. Processes still reading the old
+    file keep a valid mapping of it until they notice the replacement.
+    """
+
+    FORMAT_VERSION = 1
+
+    _MAGIC = b'ICONIFYC'
+    _HEADER = struct.Struct('<8sI')
+    # key length, image width, image height, image data length
+    _RECORD = struct.Struct('<IIII')
+
+    def __init__(self, path=DEFAULT_DISK_CACHE_PATH, maxSize=None):
+        # type: (str, Optional[int]) -> None
+        self._path = path
+        self._maxSize = maxSize or DEFAULT_DISK_CACHE_SIZE
+
+        # Maps encoded keys to (offset, width, height, length) tuples
+        self._index = {}  # type: Dict[bytes, DiskCacheEntry]
+        self._file = None  # type: Optional[IO[bytes]]
+        self._mmap = None  # type: Optional[mmap.mmap]
+        self._fileId = None  # type: Optional[Tuple[int, int]]
+        self._end = 0
+
+    def path(self):
+        # type: () -> str
+        """
+        Return the location of the cache file.
+
+        Returns
+        -------
+        str
+        """
+        return self._path
+
+    def maxSize(self):
+        # type: () -> int
+        """
+        Return the size, in bytes, the cache file is allowed to grow to.
+
+        Returns
+        -------
+        int
+        """
+        return self._maxSize
+
+    def size(self):
+        # type: () -> int
+        """
+        Return the size, in bytes, of the cache file.
+
+        Returns
+        -------
+        int
+        """
+        try:
+            return os.path.getsize(self._path)
+        except OSError:
+            return 0
+
+    def count(self):
+        # type: () -> int
+        """
+        Return the number of images available in the cache.
+
+        Returns
+        -------
+        int
+        """
+        self._refresh()
+        return len(self._index)
+
+    def get(self, key):
+        # type: (Sequence[Any]) -> Optional[QtGui.QImage]
+        """
+        Return the image stored for the provided key, or None if the key is
+        not in the cache.
+
+        Parameters
+        ----------
+        key : Sequence[Any]
+            The parts of the key, which must have stable string
+            representations across processes.
+
+        Returns
+        -------
+        Optional[QtGui.QImage]
+        """
+        encodedKey = encodeKey(key)
+        entry = self._index.get(encodedKey)
+        if entry is None:
+            if not self._refresh():
+                return None
+            entry = self._index.get(encodedKey)
+            if entry is None:
+                return None
+
+        offset, width, height, length = entry
+        assert self._mmap is not None
+        data = self._mmap[offset:offset + length]
+        return QtGui.QImage(
+            data,
+            width,
+            height,
+            width * 4,
+            QtGui.QImage.Format_ARGB32_Premultiplied,
+        ).copy()
+
+    def insert(self, key, image):
+        # type: (Sequence[Any], QtGui.QImage) -> bool
+        """
+        Append the provided image to the cache file.
+
+        Parameters
+        ----------
+        key : Sequence[Any]
+        image : QtGui.QImage
+
+        Returns
+        -------
+        bool
+            True if the image was written to the cache.
+        """
+        encodedKey = encodeKey(key)
+
+        if image.format() != QtGui.QImage.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(
+                QtGui.QImage.Format_ARGB32_Premultiplied
+            )
+        data = _imageBytes(image)
+
+        record = self._RECORD.pack(
+            len(encodedKey), image.width(), image.height(), len(data)
+        )
+        recordSize = len(record) + len(encodedKey) + len(data)
+        if self._HEADER.size + recordSize > self._maxSize:
+            return False
+
+        try:
+            with _FileLock(self._path + '.lock', exclusive=True):
+                if not self._hasValidHeader() or \
+                        self.size() + recordSize > self._maxSize:
+                    self._reset()
+                with open(self._path, 'ab') as f:
+                    f.write(record)
+                    f.write(encodedKey)
+                    f.write(data)
+        except (IOError, OSError):
+            return False
+        return True
+
+    def clear(self):
+        # type: () -> None
+        """
+        Remove all images from the cache.
+        """
+        with _FileLock(self._path + '.lock', exclusive=True):
+            self._reset()
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        """
+        Release the memory map and file handle used for reading the cache.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._fileId = None
+        self._index = {}
+        self._end = 0
+
+    def _hasValidHeader(self):
+        # type: () -> bool
+        try:
+            with open(self._path, 'rb') as f:
+                header = f.read(self._HEADER.size)
+        except (IOError, OSError):
+            return False
+        return header == self._HEADER.pack(self._MAGIC, self.FORMAT_VERSION)
+
+    def _reset(self):
+        # type: () -> None
+        """
+        Atomically replace the cache file with one that has no records.
+        """
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        tmpPath = '{}.{}.tmp'.format(self._path, os.getpid())
+        with open(tmpPath, 'wb') as f:
+            f.write(self._HEADER.pack(self._MAGIC, self.FORMAT_VERSION))
+
+        if sys.platform == 'win32' and os.path.isfile(self._path):
+            # Windows can't replace a file that's mapped by another process.
+            os.remove(self._path)
+        os.rename(tmpPath, self._path)
+
+    def _refresh(self):
+        # type: () -> bool
+        """
+        Index any records that have been written since the last refresh,
+        re-opening the file if it has been replaced.
+
+        Returns
+        -------
+        bool
+            True if new records were indexed.
+        """
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return False
+
+        fileId = (stat.st_dev, stat.st_ino)
+        if fileId != self._fileId:
+            self.close()
+        elif stat.st_size <= self._end:
+            return False
+
+        try:
+            with _FileLock(self._path + '.lock', exclusive=False):
+                return self._indexRecords()
+        except (IOError, OSError, ValueError):
+            self.close()
+            return False
+
+    def _indexRecords(self):
+        # type: () -> bool
+        if self._file is None:
+            self._file = open(self._path, 'rb')
+            stat = os.fstat(self._file.fileno())
+            self._fileId = (stat.st_dev, stat.st_ino)
+            header = self._file.read(self._HEADER.size)
+            if header != self._HEADER.pack(self._MAGIC, self.FORMAT_VERSION):
+                # An unknown version, ignore its content until it's replaced.
+                self._end = stat.st_size
+                return False
+            self._end = self._HEADER.size
+
+        size = os.fstat(self._file.fileno()).st_size
+        if size <= self._end:
+            return False
+
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(
+            self._file.fileno(), size, access=mmap.ACCESS_READ
+        )
+
+        offset = self._end
+        while offset + self._RECORD.size <= size:
+            keyLength, width, height, length = self._RECORD.unpack_from(
+                self._mmap, offset
+            )
+            keyOffset = offset + self._RECORD.size
+            dataOffset = keyOffset + keyLength
+            if dataOffset + length > size:
+                break
+            key = self._mmap[keyOffset:dataOffset]
+            self._index[key] = (dataOffset, width, height, length)
+            offset = dataOffset + length
+
+        indexed = offset != self._end
+        self._end = offset
+        return indexed
+
+
+class _FileLock(object):
+    """
+    An advisory lock on a file, used to coordinate access to a DiskCache
+    between processes.
+    """
+
+    def __init__(self, path, exclusive):
+        # type: (str, bool) -> None
+        self._path = path
+        self._exclusive = exclusive
+        self._file = None  # type: Optional[IO[bytes]]
+
+    def __enter__(self):
+        # type: () -> _FileLock
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._file = open(self._path, 'ab')
+        if sys.platform == 'win32':
+            # msvcrt has no shared locks so all locks are exclusive.
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(
+                self._file.fileno(),
+                fcntl.LOCK_EX if self._exclusive else fcntl.LOCK_SH,
+            )
+        return self
+
+    def __exit__(self, *args):
+        # type: (*Any) -> None
+        assert self._file is not None
+        if sys.platform == 'win32':
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+def _imageBytes(image):
+    # type: (QtGui.QImage) -> bytes
+    """
+    Return a copy of the raw pixel data of the provided image.
+
+    Parameters
+    ----------
+    image : QtGui.QImage
+
+    Returns
+    -------
+    bytes
+    """
+    bits = image.constBits()  # type: Any
+    if hasattr(bits, 'setsize'):
+        # PyQt returns a sip.voidptr which needs to be told it's size.
+        bits.setsize(image.bytesPerLine() * image.height())
+    return bytes(bits)
@@ -2,16 +2,84 @@
 The primary objects for interfacing with iconify
 """
 
-from typing import TYPE_CHECKING, MutableMapping, Optional, Tuple
+import os
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
-from iconify.anim import GlobalTick
-from iconify.path import findIcon
-from iconify.qt import QtCore, QtGui, QtSvg
+from iconify.cache import DiskCache, PixmapCache, RendererCache
+from iconify.pack import PackFile
+from iconify.path import IconNotFoundError, findIcon
+from iconify.qt import QtCore, QtGui, QtSvg, QtWidgets
+from iconify.repaint import RepaintScheduler
 
 if TYPE_CHECKING:
-    from iconify.anim import BaseAnimation
-    from iconify.qt import QtWidgets
-    PixmapCacheKey = Tuple[Optional[str], QtCore.QSize, str, int, int]
+    from typing import Iterable, MutableMapping, MutableSet
+
+    from iconify.anim import BaseAnimation, Fingerprint
+    IconKey = Tuple[str, Optional[int], Optional[BaseAnimation],
+                    Optional[bool]]
+    PixmapCacheKey = Tuple[str, int, int, float, Fingerprint, int, int]
+    MaskCacheKey = Tuple[str, int, int, Fingerprint, int]
+    StripCacheKey = Tuple[str, int, int, float, Fingerprint, int]
+
+# Sprite strips wrap onto multiple rows beyond this width
+_MAX_STRIP_WIDTH = 8192
+# Animations with more frames than this can't be rendered to a sprite strip
+_MAX_STRIP_FRAMES = 1024
+
+
+def _defaultDiskCache():
+    # type: () -> Optional[DiskCache]
+    """
+    Return the DiskCache identified by the ICONIFY_DISK_CACHE environment
+    variable, if it's set.
+
+    Returns
+    -------
+    Optional[DiskCache]
+    """
+    path = os.environ.get('ICONIFY_DISK_CACHE')
+    if not path:
+        return None
+    return DiskCache(path)
+
+
+def _defaultPack():
+    # type: () -> Optional[PackFile]
+    """
+    Return the PackFile identified by the ICONIFY_PACK environment variable,
+    if it's set.
+
+    Returns
+    -------
+    Optional[PackFile]
+    """
+    path = os.environ.get('ICONIFY_PACK')
+    if not path:
+        return None
+    return PackFile(path)
+
+
+class _IconPool(object):
+    """
+    The bookkeeping for shared icons and the number of live icon engines.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.sharedDefault = False
+        self.icons = weakref.WeakValueDictionary(
+        )  # type: MutableMapping[IconKey, QtGui.QIcon]
+        # Maps the cache keys of icons to their engines, which allows the
+        # engine to be found from copies of an icon made by Qt.
+        self.engines = weakref.WeakValueDictionary(
+        )  # type: MutableMapping[int, _IconEngine]
+        self.hits = 0
+        self.misses = 0
+        self.liveEngines = 0
+
+
+_iconPool = _IconPool()
 
 
 class Icon(QtGui.QIcon):
@@ -24,7 +92,9 @@ class Icon(QtGui.QIcon):
         cls,
         path,  # type: str
         color=None,  # type: Optional[QtGui.QColor]
-        anim=None  # type: Optional[BaseAnimation]
+        anim=None,  # type: Optional[BaseAnimation]
+        asyncRender=None,  # type: Optional[bool]
+        shared=None,  # type: Optional[bool]
     ):
         # type: (...) -> QtGui.QIcon
         """
@@ -38,50 +108,180 @@ class Icon(QtGui.QIcon):
         path : str
         color : Optional[QtGui.QColor]
         anim : Optional[BaseAnimation]
+        asyncRender : Optional[bool]
+            Render pixmaps in a background thread, see
+            `PixmapGenerator.setAsyncRenderDefault`.
+        shared : Optional[bool]
+            Return the same icon for every call made with the same arguments
+            while that icon is still referenced, see `Icon.setSharedDefault`.
 
         Returns
         -------
         QtGui.QIcon
         """
-        iconEngine = _IconEngine(path, color=color, anim=anim)
+        if shared is None:
+            shared = _iconPool.sharedDefault
+
+        if shared:
+            key = (
+                path if _inPack(path) else findIcon(path),
+                color.rgba() if color is not None else None,
+                anim,
+                asyncRender,
+            )  # type: IconKey
+            sharedIcon = _iconPool.icons.get(key)
+            if sharedIcon is not None:
+                _iconPool.hits += 1
+                return sharedIcon
+            _iconPool.misses += 1
+
+        iconEngine = _IconEngine(
+            path, color=color, anim=anim, asyncRender=asyncRender
+        )
         icon = QtGui.QIcon(iconEngine)
 
+        def _addState(*args, **kwargs):
+            # type: (*Any, **Any) -> None
+            # The icon no longer matches the arguments it was created with,
+            # so it must not be returned for them again.
+            if shared and _iconPool.icons.get(key) is icon:
+                del _iconPool.icons[key]
+            iconEngine.addState(*args, **kwargs)
+
         def _setAsButtonIcon(button):
             # type: (QtWidgets.QAbstractButton) -> None
             button.setIcon(icon)
-            if iconEngine.animCount() > 1:
-                GlobalTick.timeout.connect(button.update)
-            else:
-                if anim is not None:
-                    anim.tick.connect(button.update)
+            scheduler = RepaintScheduler.instance()
+            for pixmapGenerator in iconEngine.pixmapGenerators():
+                pixmapGenerator.updateOnReady(button)
+                generatorAnim = pixmapGenerator.anim()
+                if generatorAnim is not None:
+                    scheduler.register(generatorAnim, button, _buttonIconRect)
 
         icon.setAsButtonIcon = _setAsButtonIcon
-        icon.addState = iconEngine.addState
+        icon.addState = _addState
         icon.pixmapGenerator = iconEngine.pixmapGenerator
         icon.color = iconEngine.color
         icon.anim = iconEngine.anim
         icon.animCount = iconEngine.animCount
+
+        _iconPool.engines[icon.cacheKey()] = iconEngine
+        if shared:
+            _iconPool.icons[key] = icon
         return icon
 
+    @classmethod
+    def animations(cls, icon):
+        # type: (Any) -> List[BaseAnimation]
+        """
+        Return the animations used by the states of the provided icon.
+
+        This works with copies of an icon made by Qt, e.g. the icon returned
+        by `QModelIndex.data`, which don't have the methods added by Icon.
+
+        Parameters
+        ----------
+        icon : Any
+            Values other than icons created by Icon have no animations.
+
+        Returns
+        -------
+        List[BaseAnimation]
+        """
+        if not isinstance(icon, QtGui.QIcon):
+            return []
+
+        iconEngine = _iconPool.engines.get(icon.cacheKey())
+        if iconEngine is None:
+            return []
+
+        anims = []  # type: List[BaseAnimation]
+        for pixmapGenerator in iconEngine.pixmapGenerators():
+            anim = pixmapGenerator.anim()
+            if anim is not None and anim not in anims:
+                anims.append(anim)
+        return anims
+
+    @classmethod
+    def sharedDefault(cls):
+        # type: () -> bool
+        """
+        Indicate if icons are shared when they haven't been told otherwise.
+
+        Returns
+        -------
+        bool
+        """
+        return _iconPool.sharedDefault
+
+    @classmethod
+    def setSharedDefault(cls, shared):
+        # type: (bool) -> None
+        """
+        Set whether calls to Icon, that don't provide the shared kwarg,
+        return the same icon for the same arguments while it's referenced.
+
+        Shared icons are held weakly so they're released once they are no
+        longer used. Calling addState on a shared icon changes it for every
+        holder of that icon, and stops it being returned for new calls.
+
+        Parameters
+        ----------
+        shared : bool
+        """
+        _iconPool.sharedDefault = shared
+
+    @classmethod
+    def stats(cls):
+        # type: () -> Dict[str, int]
+        """
+        Return counters describing the icons that are currently alive.
+
+        `liveEngines` is the number of icon engines that exist, `sharedIcons`
+        is the number of icons available for sharing and `sharedHits` &
+        `sharedMisses` count the calls that did or didn't find a shared icon.
+
+        Returns
+        -------
+        Dict[str, int]
+        """
+        return {
+            'liveEngines': _iconPool.liveEngines,
+            'sharedIcons': len(_iconPool.icons),
+            'sharedHits': _iconPool.hits,
+            'sharedMisses': _iconPool.misses,
+        }
+
 
 class _IconEngine(QtGui.QIconEngine):
     """
     A QIconEngine which uses a PixmapGenerator for it's work.
     """
 
-    def __init__(self, path, color=None, anim=None):
-        # type: (str, Optional[QtGui.QColor], Optional[BaseAnimation]) -> None
+    def __init__(
+        self,
+        path,  # type: str
+        color=None,  # type: Optional[QtGui.QColor]
+        anim=None,  # type: Optional[BaseAnimation]
+        asyncRender=None,  # type: Optional[bool]
+    ):
+        # type: (...) -> None
         super(_IconEngine, self).__init__()
-        self._defaultGenerator = PixmapGenerator(path, color=color, anim=anim)
+        self._asyncRender = asyncRender
+        self._defaultGenerator = PixmapGenerator(
+            path, color=color, anim=anim, asyncRender=asyncRender
+        )
         self._pixmapGenerators = {(QtGui.QIcon.Normal, QtGui.QIcon.Off):
                                   self._defaultGenerator}
+        _iconPool.liveEngines += 1
 
     def __del__(self):
         # type: () -> None
         """
-        Re-implemented to avoid this object being
-        garbage collected unnecessarily.
+        Re-implemented to keep the count of live engines, reported by
+        `Icon.stats`, up to date.
         """
+        _iconPool.liveEngines -= 1
 
     def addState(
         self,
@@ -106,7 +306,9 @@ class _IconEngine(QtGui.QIconEngine):
         """
         color = color or self.color()
         anim = anim or self.anim()
-        generator = PixmapGenerator(path, color=color, anim=anim)
+        generator = PixmapGenerator(
+            path, color=color, anim=anim, asyncRender=self._asyncRender
+        )
         self._pixmapGenerators[(mode, state)] = generator
 
     def pixmapGenerator(self, mode=QtGui.QIcon.Normal, state=QtGui.QIcon.Off):
@@ -131,6 +333,17 @@ class _IconEngine(QtGui.QIconEngine):
             self._defaultGenerator,
         )
 
+    def pixmapGenerators(self):
+        # type: () -> List[PixmapGenerator]
+        """
+        Return the PixmapGenerators used for all modes & states of this icon.
+
+        Returns
+        -------
+        List[PixmapGenerator]
+        """
+        return list(self._pixmapGenerators.values())
+
     def anim(
         self,
         mode=QtGui.QIcon.Normal,  # type: QtGui.QIcon.Mode
@@ -212,15 +425,69 @@ class _IconEngine(QtGui.QIconEngine):
 
     def paint(
         self,
-        painter,  # type: QtCore.QPainter
+        painter,  # type: QtGui.QPainter
         rect,  # type: QtCore.QRect
         mode,  # type: QtGui.QIcon.Mode
         state,  # type: QtGui.QIcon.State
     ):
         # type: (...) -> None
-        painter.drawPixmap(
-            rect.topLeft(), self.pixmap(rect.size(), mode, state)
-        )
+        """
+        Draw the icon for the identified mode & state into the provided rect,
+        rendered at the physical resolution of the painter's device.
+
+        Parameters
+        ----------
+        painter : QtGui.QPainter
+        rect : QtCore.QRect
+        mode : QtGui.QIcon.Mode
+        state : QtGui.QIcon.State
+        """
+        self.pixmapGenerator(mode=mode, state=state).paint(painter, rect)
+
+    def availableSizes(
+        self,
+        mode=QtGui.QIcon.Normal,  # type: QtGui.QIcon.Mode
+        state=QtGui.QIcon.Off,  # type: QtGui.QIcon.State
+    ):
+        # type: (...) -> List[QtCore.QSize]
+        """
+        Return the sizes that have already been rendered for the identified
+        mode & state, allowing Qt to prefer them over new sizes.
+
+        Parameters
+        ----------
+        mode : QtGui.QIcon.Mode
+        state : QtGui.QIcon.State
+
+        Returns
+        -------
+        List[QtCore.QSize]
+        """
+        return self.pixmapGenerator(mode=mode, state=state).sizes()
+
+    def actualSize(
+        self,
+        size,  # type: QtCore.QSize
+        mode,  # type: QtGui.QIcon.Mode
+        state,  # type: QtGui.QIcon.State
+    ):
+        # type: (...) -> QtCore.QSize
+        """
+        Return the size of the pixmap that will be provided for the requested
+        size. Svg images can be rendered at any size so this is the size
+        that's been requested.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+        mode : QtGui.QIcon.Mode
+        state : QtGui.QIcon.State
+
+        Returns
+        -------
+        QtCore.QSize
+        """
+        return QtCore.QSize(size)
 
 
 class PixmapGenerator(QtCore.QObject):
@@ -229,9 +496,25 @@ class PixmapGenerator(QtCore.QObject):
     transform from the animation during the process.
 
     It's backed by a cache to ensure that redundant rendering does not happen.
+
+    When rendering asynchronously, a cache miss returns a placeholder pixmap
+    and the svg is rendered in a background thread. The pixmapReady signal is
+    emitted once the rendered pixmap is available.
     """
 
-    _pixmapCache = {}  # type: MutableMapping[PixmapCacheKey, QtGui.QPixmap]
+    # Emitted when a pixmap rendered in the background is available
+    pixmapReady = QtCore.Signal()
+
+    _asyncRenderDefault = False
+
+    _pixmapCache = PixmapCache()
+    _maskCache = PixmapCache()
+    _rendererCache = RendererCache()
+    _diskCache = _defaultDiskCache()
+    _pack = _defaultPack()
+    # Every PixmapGenerator that's alive, so they can be told when the svg
+    # file they use changes.
+    _generators = weakref.WeakSet()  # type: MutableSet[PixmapGenerator]
 
     def __init__(
         self,
@@ -239,14 +522,232 @@ class PixmapGenerator(QtCore.QObject):
         color=None,  # type: Optional[QtGui.QColor]
         anim=None,  # type: Optional[BaseAnimation]
         parent=None,  # type: Optional[QtCore.QObject]
+        asyncRender=None,  # type: Optional[bool]
     ):
         # type: (...) -> None
         super(PixmapGenerator, self).__init__(parent=parent)
-        self._path = findIcon(path)
+        self._name = path
+        # Icons in the pack don't need their svg file unless they're rendered
+        # at a size that isn't in the pack.
+        self._path = None if _inPack(path) else findIcon(path)
+        # Identifies the image in the in memory caches
+        self._source = self._path or path
         self._color = color  # type: Optional[QtGui.QColor]
         self._anim = anim  # type: Optional[BaseAnimation]
+        self._asyncRender = asyncRender
+
+        # Background renders that haven't finished yet
+        self._pendingRenders = {}  # type: Dict[Any, QtCore.QRunnable]
+        # The most recent pixmap, used as a placeholder when rendering
+        # in the background.
+        self._lastPixmap = None  # type: Optional[QtGui.QPixmap]
+        # The logical sizes that pixmaps have been requested at
+        self._sizes = set()  # type: Set[Tuple[int, int]]
+        # The widgets updated when pixmapReady is emitted
+        self._readyWidgets = weakref.WeakSet(
+        )  # type: MutableSet[QtWidgets.QWidget]
+
+        # The renderer is only created when an image needs to be rendered
+        # so that cache hits never parse the svg file.
+        self._renderer = None  # type: Optional[QtSvg.QSvgRenderer]
+
+        self._generators.add(self)
+
+    @classmethod
+    def pixmapCache(cls):
+        # type: () -> PixmapCache
+        """
+        Return the cache shared by all PixmapGenerators to store the pixmaps
+        they have rendered.
+
+        Returns
+        -------
+        PixmapCache
+        """
+        return cls._pixmapCache
+
+    @classmethod
+    def maskCache(cls):
+        # type: () -> PixmapCache
+        """
+        Return the cache shared by all PixmapGenerators to store the rendered
+        svg images that color variants are created from.
+
+        Returns
+        -------
+        PixmapCache
+        """
+        return cls._maskCache
+
+    @classmethod
+    def asyncRenderDefault(cls):
+        # type: () -> bool
+        """
+        Indicate if PixmapGenerators render in a background thread when they
+        haven't been told otherwise.
+
+        Returns
+        -------
+        bool
+        """
+        return cls._asyncRenderDefault
+
+    @classmethod
+    def setAsyncRenderDefault(cls, asyncRender):
+        # type: (bool) -> None
+        """
+        Set whether PixmapGenerators, which haven't been given an explicit
+        asyncRender value, render in a background thread.
+
+        Parameters
+        ----------
+        asyncRender : bool
+        """
+        cls._asyncRenderDefault = asyncRender
+
+    @classmethod
+    def diskCache(cls):
+        # type: () -> Optional[DiskCache]
+        """
+        Return the persistent cache used by all PixmapGenerators, if any.
+
+        Returns
+        -------
+        Optional[DiskCache]
+        """
+        return cls._diskCache
+
+    @classmethod
+    def setDiskCache(cls, diskCache):
+        # type: (Optional[DiskCache]) -> None
+        """
+        Set the persistent cache used by all PixmapGenerators to store the
+        images they render. Images found in this cache are used rather than
+        rendering the svg file.
+
+        Parameters
+        ----------
+        diskCache : Optional[DiskCache]
+            When None, the persistent cache is disabled.
+        """
+        cls._diskCache = diskCache
+
+    @classmethod
+    def pack(cls):
+        # type: () -> Optional[PackFile]
+        """
+        Return the pack of prerendered images used by all PixmapGenerators,
+        if any.
+
+        Returns
+        -------
+        Optional[PackFile]
+        """
+        return cls._pack
+
+    @classmethod
+    def setPack(cls, pack):
+        # type: (Optional[PackFile]) -> None
+        """
+        Set the pack of prerendered images used by all PixmapGenerators.
+        Images found in the pack are used rather than rendering the svg file.
+
+        Parameters
+        ----------
+        pack : Optional[PackFile]
+            When None, no pack is used.
+        """
+        cls._pack = pack
+        cls._pixmapCache.clear()
+
+    @classmethod
+    def rendererCache(cls):
+        # type: () -> RendererCache
+        """
+        Return the registry of svg renderers shared by all PixmapGenerators.
+
+        Returns
+        -------
+        RendererCache
+        """
+        return cls._rendererCache
+
+    @classmethod
+    def invalidateIcon(cls, filePath):
+        # type: (str) -> List[PixmapGenerator]
+        """
+        Discard the renderers and images of the provided svg file, e.g. when
+        it has been edited or removed, and find the svg file again for every
+        PixmapGenerator that used it, or whose icon is now found at it.
+
+        The pixmapReady signal of every affected PixmapGenerator is emitted
+        so that the widgets displaying them are repainted.
+
+        This should be called after `path.invalidateIcon`, so the svg files
+        aren't found from the cached results of findIcon.
+
+        Parameters
+        ----------
+        filePath : str
+
+        Returns
+        -------
+        List[PixmapGenerator]
+            The affected PixmapGenerators.
+        """
+        return cls.invalidateIcons([filePath])
+
+    @classmethod
+    def invalidateIcons(cls, filePaths):
+        # type: (Iterable[str]) -> List[PixmapGenerator]
+        """
+        Discard the renderers and images of the provided svg files, see
+        invalidateIcon. The caches and the PixmapGenerators are checked once
+        for all of the files.
 
-        self._renderer = QtSvg.QSvgRenderer(self._path)
+        This should be called after `path.invalidateIcons`.
+
+        Parameters
+        ----------
+        filePaths : Iterable[str]
+
+        Returns
+        -------
+        List[PixmapGenerator]
+            The affected PixmapGenerators.
+        """
+        normPaths = set(os.path.normpath(filePath) for filePath in filePaths)
+
+        def isStale(key):
+            # type: (Tuple) -> bool
+            return os.path.normpath(key[0]) in normPaths
+
+        cls._rendererCache.invalidate(*normPaths)
+        cls._pixmapCache.removeMatching(isStale)
+        cls._maskCache.removeMatching(isStale)
+
+        affected = []  # type: List[PixmapGenerator]
+        for generator in list(cls._generators):
+            oldPath = generator._path
+            if oldPath is None:
+                # The svg file hasn't been found yet
+                continue
+
+            try:
+                newPath = findIcon(generator._name)
+            except IconNotFoundError:
+                newPath = oldPath
+
+            if newPath != oldPath or os.path.normpath(oldPath) in normPaths:
+                if generator._source == oldPath:
+                    generator._source = newPath
+                generator._path = newPath
+                generator._renderer = None
+                affected.append(generator)
+
+        for generator in affected:
+            generator.pixmapReady.emit()
+        return affected
 
     def path(self):
         # type: () -> str
@@ -257,8 +758,23 @@ class PixmapGenerator(QtCore.QObject):
         -------
         str
         """
+        if self._path is None:
+            self._path = findIcon(self._name)
         return self._path
 
+    def renderer(self):
+        # type: () -> QtSvg.QSvgRenderer
+        """
+        Return the renderer for the svg file used by this PixmapGenerator.
+
+        Returns
+        -------
+        QtSvg.QSvgRenderer
+        """
+        if self._renderer is None:
+            self._renderer = self._rendererCache.renderer(self.path())
+        return self._renderer
+
     def color(self):
         # type: () -> Optional[QtGui.QColor]
         """
@@ -281,61 +797,798 @@ class PixmapGenerator(QtCore.QObject):
         """
         return self._anim
 
-    def pixmap(self, size):
-        # type: (QtCore.QSize) -> QtGui.QPixmap
+    def asyncRender(self):
+        # type: () -> bool
+        """
+        Indicate if this PixmapGenerator renders in a background thread.
+
+        Returns
+        -------
+        bool
+        """
+        if self._asyncRender is None:
+            return self._asyncRenderDefault
+        return self._asyncRender
+
+    def sizes(self):
+        # type: () -> List[QtCore.QSize]
+        """
+        Return the logical sizes that pixmaps have been requested at from
+        this PixmapGenerator.
+
+        Returns
+        -------
+        List[QtCore.QSize]
+        """
+        return [QtCore.QSize(w, h) for w, h in sorted(self._sizes)]
+
+    def updateOnReady(self, widget):
+        # type: (QtWidgets.QWidget) -> None
+        """
+        Update the provided widget whenever a pixmap rendered in the
+        background is available. A widget is only connected once, however
+        many times it's provided.
+
+        Parameters
+        ----------
+        widget : QtWidgets.QWidget
+        """
+        if widget not in self._readyWidgets:
+            self._readyWidgets.add(widget)
+            self.pixmapReady.connect(widget.update)
+
+    def pixmap(self, size, devicePixelRatio=1.0):
+        # type: (QtCore.QSize, float) -> QtGui.QPixmap
         """
         Render the svg file to a QPixmap, applying the color override and the
         animation transform if applicable.
 
+        When the animation is applied on paint, the untransformed image is
+        cached and the pixmap is a transformed copy of it.
+
         Parameters
         ----------
         size : QtCore.QSize
+            The logical size of the pixmap.
+        devicePixelRatio : float
+            The ratio of physical to logical pixels on the device the pixmap
+            will be drawn on. The pixmap is rendered at the physical size and
+            has it's devicePixelRatio set accordingly.
 
         Returns
         -------
         QtGui.QPixmap
         """
-        color = self._color.rgb() if self._color else -1
+        self._sizes.add((size.width(), size.height()))
+        size = _physicalSize(size, devicePixelRatio)
+
+        pixmap = self._framePixmap(size, devicePixelRatio)
+        if self._transformOnPaint():
+            assert self._anim is not None
+            return _transformPixmap(pixmap, self._anim.transform(size))
+        return pixmap
+
+    def paint(self, painter, rect):
+        # type: (QtGui.QPainter, QtCore.QRect) -> None
+        """
+        Draw the image into the provided rect, rendered at the physical
+        resolution of the painter's device.
+
+        When the animation has been prerendered at this size, the current
+        frame is drawn straight from the sprite strip. When the animation is
+        applied on paint, the untransformed image is drawn with the transform
+        of the current frame.
+
+        Parameters
+        ----------
+        painter : QtGui.QPainter
+        rect : QtCore.QRect
+        """
+        device = painter.device()
+        devicePixelRatio = device.devicePixelRatioF() if device else 1.0
+
+        if self._transformOnPaint():
+            assert self._anim is not None
+            self._sizes.add((rect.width(), rect.height()))
+            pixmap = self._framePixmap(
+                _physicalSize(rect.size(), devicePixelRatio),
+                devicePixelRatio,
+            )
+
+            painter.save()
+            painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+            painter.setClipRect(rect, QtCore.Qt.IntersectClip)
+            # The transform is applied in logical co-ordinates relative to
+            # the rect, which matches the image rendered at the physical size
+            painter.setTransform(
+                self._anim.transform(rect.size()) *
+                QtGui.QTransform.fromTranslate(rect.x(), rect.y()),
+                True,
+            )
+            painter.drawPixmap(
+                QtCore.QRectF(0, 0, rect.width(), rect.height()),
+                pixmap,
+                QtCore.QRectF(pixmap.rect()),
+            )
+            painter.restore()
+            return
 
         if self._anim is not None:
-            key = (
-                self._path, size, str(self._anim.__class__),
-                self._anim.frame(), color
-            )  # type: PixmapCacheKey
+            size = _physicalSize(rect.size(), devicePixelRatio)
+            strip = self._pixmapCache.get(
+                self._stripCacheKey(size, devicePixelRatio)
+            )
+            if strip is not None:
+                self._sizes.add((rect.width(), rect.height()))
+                painter.drawPixmap(
+                    QtCore.QRectF(rect),
+                    strip,
+                    QtCore.QRectF(self._stripFrameRect(size)),
+                )
+                return
+
+        pixmap = self.pixmap(rect.size(), devicePixelRatio=devicePixelRatio)
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def prerender(self, size, devicePixelRatio=1.0, background=False):
+        # type: (QtCore.QSize, float, bool) -> None
+        """
+        Render every frame of the animation at the provided size into a
+        single sprite strip, which is then used for every frame of that size
+        rather than rendering each frame the first time it's shown.
+
+        The strip is stored in the pixmap cache and counts towards it's
+        memory budget. Animations applied on paint only need a single image,
+        which is rendered instead.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+            The logical size of the frames.
+        devicePixelRatio : float
+        background : bool
+            Render the strip in a background thread. The pixmapReady signal
+            is emitted once it's available.
+        """
+        if self._anim is None:
+            raise ValueError(
+                "Unable to prerender a PixmapGenerator with no animation!"
+            )
+
+        frameCount = self._anim.frameCount()
+        if frameCount > _MAX_STRIP_FRAMES:
+            raise ValueError(
+                "Unable to prerender an animation with {} frames, the maximum "
+                "is {}.".format(frameCount, _MAX_STRIP_FRAMES)
+            )
+
+        size = _physicalSize(size, devicePixelRatio)
+        if self._transformOnPaint():
+            # Every frame is drawn from the same image
+            self._framePixmap(size, devicePixelRatio)
+            return
+
+        key = self._stripCacheKey(size, devicePixelRatio)
+        if key in self._pixmapCache or key in self._pendingRenders:
+            return
+
+        transforms = list(self._anim.frameTransforms(size))
+
+        if background:
+            task = _StripRenderTask(key, self.path(), size, transforms)
+            task.signals.finished.connect(self._onStripRenderFinished)
+            self._pendingRenders[key] = task
+            QtCore.QThreadPool.globalInstance().start(task)
         else:
-            key = (self._path, size, "", 0, color)
+            mask = _renderStrip(self.renderer(), size, transforms)
+            self._cacheStrip(key, mask)
 
-        if key in self._pixmapCache:
-            return self._pixmapCache[key]
+    def _framePixmap(self, size, devicePixelRatio):
+        # type: (QtCore.QSize, float) -> QtGui.QPixmap
+        """
+        Return the pixmap of the current frame, or the untransformed pixmap
+        when the animation is applied on paint, from the first cache that
+        holds it and otherwise render it.
 
-        image = QtGui.QImage(
-            size,
-            QtGui.QImage.Format_ARGB32_Premultiplied,
-        )
-        image.fill(QtCore.Qt.transparent)
+        Parameters
+        ----------
+        size : QtCore.QSize
+            The physical size of the pixmap.
+        devicePixelRatio : float
 
-        # Use the QSvgRenderer to draw the image
-        painter = QtGui.QPainter(image)
+        Returns
+        -------
+        QtGui.QPixmap
+        """
+        color = self._color.rgb() if self._color else -1
+        animKey, frame = self._animKey()
 
-        if self._anim:
-            # Rotate the painter's co-ordinate space so
-            # the image is correctly positioned.
-            xfm = self._anim.transform(size)
-            painter.setTransform(xfm)
+        if self._anim is not None and not self._transformOnPaint():
+            strip = self._pixmapCache.get(
+                self._stripCacheKey(size, devicePixelRatio)
+            )
+            if strip is not None:
+                pixmap = strip.copy(self._stripFrameRect(size))
+                pixmap.setDevicePixelRatio(devicePixelRatio)
+                return pixmap
 
-        self._renderer.render(painter)
-        painter.end()
+        key = (
+            self._source,
+            size.width(),
+            size.height(),
+            devicePixelRatio,
+            animKey,
+            frame,
+            color,
+        )  # type: PixmapCacheKey
 
-        if self._color is not None:
-            # Use the alpha channel on a solid colour image
-            colorImage = QtGui.QImage(
-                size,
-                QtGui.QImage.Format_ARGB32_Premultiplied,
+        pixmap = self._pixmapCache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        pack = self._pack
+        if pack is not None:
+            packKey = (
+                self._name, size.width(), size.height(), animKey, frame, color
             )
-            colorImage.fill(QtGui.QColor(self._color))
-            colorImage.setAlphaChannel(image.alphaChannel())
-            image = colorImage
+            image = pack.get(packKey)
+            if image is not None:
+                return self._cachePixmap(key, image)
+
+        diskCache = self._diskCache
+        if diskCache is not None:
+            diskKey = self._diskCacheKey(size, animKey, frame, color)
+            image = diskCache.get(diskKey)
+        else:
+            image = None
 
+        if image is None:
+            maskKey = self._maskCacheKey(size, animKey, frame)
+            mask = self._maskCache.get(maskKey)
+            if mask is None:
+                if self.asyncRender():
+                    self._renderInBackground(key, maskKey, size)
+                    return self._placeholder(size, devicePixelRatio)
+
+                mask = self._renderMask(size)
+                self._maskCache.insert(maskKey, mask)
+
+            image = self._colorize(mask)
+            if diskCache is not None:
+                diskCache.insert(diskKey, image)
+
+        return self._cachePixmap(key, image)
+
+    def _stripCacheKey(self, size, devicePixelRatio):
+        # type: (QtCore.QSize, float) -> StripCacheKey
+        assert self._anim is not None
+        return (
+            self._source,
+            size.width(),
+            size.height(),
+            devicePixelRatio,
+            self._anim.fingerprint(),
+            self._color.rgb() if self._color else -1,
+        )
+
+    def _stripFrameRect(self, size):
+        # type: (QtCore.QSize) -> QtCore.QRect
+        """
+        Return the area of the sprite strip that holds the current frame.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+            The physical size of the frames.
+
+        Returns
+        -------
+        QtCore.QRect
+        """
+        assert self._anim is not None
+        index = self._anim.frame() - self._anim.minFrame()
+        columns = _stripColumns(size, self._anim.frameCount())
+        return QtCore.QRect(
+            (index % columns) * size.width(),
+            (index // columns) * size.height(),
+            size.width(),
+            size.height(),
+        )
+
+    def _cacheStrip(self, key, mask):
+        # type: (StripCacheKey, QtGui.QImage) -> None
+        strip = QtGui.QPixmap.fromImage(self._colorize(mask))
+        self._pixmapCache.insert(key, strip)
+
+    def _onStripRenderFinished(self, key, _, mask):
+        # type: (StripCacheKey, None, QtGui.QImage) -> None
+        self._pendingRenders.pop(key, None)
+        self._cacheStrip(key, mask)
+        self.pixmapReady.emit()
+
+    def _maskCacheKey(self, size, animKey, frame):
+        # type: (QtCore.QSize, Fingerprint, int) -> MaskCacheKey
+        return self.path(), size.width(), size.height(), animKey, frame
+
+    def _diskCacheKey(self, size, animKey, frame, color):
+        # type: (QtCore.QSize, Fingerprint, int, int) -> Tuple
+        return (
+            self._rendererCache.contentHash(self.path()),
+            size.width(),
+            size.height(),
+            animKey,
+            frame,
+            color,
+        )
+
+    def _cachePixmap(self, key, image):
+        # type: (PixmapCacheKey, QtGui.QImage) -> QtGui.QPixmap
         pixmap = QtGui.QPixmap.fromImage(image)
-        self._pixmapCache[key] = pixmap
+        pixmap.setDevicePixelRatio(key[3])
+        self._pixmapCache.insert(key, pixmap)
+        self._lastPixmap = pixmap
         return pixmap
+
+    def _placeholder(self, size, devicePixelRatio):
+        # type: (QtCore.QSize, float) -> QtGui.QPixmap
+        """
+        Return a pixmap to display while the pixmap of the provided size is
+        rendered in the background.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+            The physical size of the pixmap.
+        devicePixelRatio : float
+
+        Returns
+        -------
+        QtGui.QPixmap
+        """
+        if self._lastPixmap is not None:
+            pixmap = self._lastPixmap.scaled(size)
+        else:
+            pixmap = QtGui.QPixmap(size)
+            pixmap.fill(QtCore.Qt.transparent)
+        pixmap.setDevicePixelRatio(devicePixelRatio)
+        return pixmap
+
+    def _renderInBackground(self, key, maskKey, size):
+        # type: (PixmapCacheKey, MaskCacheKey, QtCore.QSize) -> None
+        """
+        Render the mask for the provided cache keys in a background thread.
+
+        Parameters
+        ----------
+        key : PixmapCacheKey
+        maskKey : MaskCacheKey
+        size : QtCore.QSize
+        """
+        if key in self._pendingRenders:
+            return
+
+        # The animation is only accessed from this thread, so the transform
+        # for the current frame is resolved before handing over the work.
+        task = _RenderTask(
+            key,
+            maskKey,
+            self.path(),
+            size,
+            self._renderTransform(size),
+        )
+        task.signals.finished.connect(self._onRenderFinished)
+        self._pendingRenders[key] = task
+        QtCore.QThreadPool.globalInstance().start(task)
+
+    def _onRenderFinished(self, key, maskKey, mask):
+        # type: (PixmapCacheKey, MaskCacheKey, QtGui.QImage) -> None
+        self._pendingRenders.pop(key, None)
+        self._maskCache.insert(maskKey, mask)
+        image = self._colorize(mask)
+
+        diskCache = self._diskCache
+        if diskCache is not None:
+            _, width, height, _, animKey, frame, color = key
+            diskCache.insert(
+                self._diskCacheKey(
+                    QtCore.QSize(width, height), animKey, frame, color
+                ),
+                image,
+            )
+
+        self._cachePixmap(key, image)
+        self.pixmapReady.emit()
+
+    def _animKey(self):
+        # type: () -> Tuple[Fingerprint, int]
+        """
+        Return the parts of a cache key that identify the current
+        animation frame.
+
+        Returns
+        -------
+        Tuple[Fingerprint, int]
+        """
+        if self._anim is None or self._anim.transformOnPaint():
+            return (), 0
+        return self._anim.fingerprint(), self._anim.frame()
+
+    def _transformOnPaint(self):
+        # type: () -> bool
+        """
+        Indicate if the animation transform is applied when the image is
+        painted rather than when it's rendered.
+
+        Returns
+        -------
+        bool
+        """
+        return self._anim is not None and self._anim.transformOnPaint()
+
+    def _renderTransform(self, size):
+        # type: (QtCore.QSize) -> Optional[QtGui.QTransform]
+        """
+        Return the transform to render the svg with for the current frame, if
+        any.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+
+        Returns
+        -------
+        Optional[QtGui.QTransform]
+        """
+        if self._anim is None or self._anim.transformOnPaint():
+            return None
+        return self._anim.transform(size)
+
+    def _renderMask(self, size):
+        # type: (QtCore.QSize) -> QtGui.QImage
+        """
+        Render the svg file to a QImage, applying the animation transform
+        if applicable.
+
+        Parameters
+        ----------
+        size : QtCore.QSize
+
+        Returns
+        -------
+        QtGui.QImage
+        """
+        return _renderMask(self.renderer(), size, self._renderTransform(size))
+
+    def _colorize(self, mask):
+        # type: (QtGui.QImage) -> QtGui.QImage
+        """
+        Return the provided mask with the color override applied.
+
+        Parameters
+        ----------
+        mask : QtGui.QImage
+
+        Returns
+        -------
+        QtGui.QImage
+        """
+        if self._color is None:
+            return mask
+        return _colorize(mask, self._color)
+
+
+class _RenderTaskSignals(QtCore.QObject):
+
+    # Emitted with the cache keys and the rendered mask
+    finished = QtCore.Signal(object, object, object)
+
+
+class _RenderTask(QtCore.QRunnable):
+    """
+    Renders an svg file to a QImage in a QThreadPool.
+    """
+
+    def __init__(
+        self,
+        key,  # type: PixmapCacheKey
+        maskKey,  # type: MaskCacheKey
+        path,  # type: str
+        size,  # type: QtCore.QSize
+        transform,  # type: Optional[QtGui.QTransform]
+    ):
+        # type: (...) -> None
+        super(_RenderTask, self).__init__()
+        # Created in the calling thread so the finished signal is queued
+        # back to it.
+        self.signals = _RenderTaskSignals()
+        self._key = key
+        self._maskKey = maskKey
+        self._path = path
+        self._size = QtCore.QSize(size)
+        self._transform = transform
+
+    def run(self):
+        # type: () -> None
+        # QSvgRenderer isn't thread safe so each task parses it's own copy.
+        renderer = RendererCache.parse(self._path)
+        mask = _renderMask(renderer, self._size, self._transform)
+        self.signals.finished.emit(self._key, self._maskKey, mask)
+
+
+class _StripRenderTask(QtCore.QRunnable):
+    """
+    Renders the frames of an animation into a sprite strip in a QThreadPool.
+    """
+
+    def __init__(
+        self,
+        key,  # type: StripCacheKey
+        path,  # type: str
+        size,  # type: QtCore.QSize
+        transforms,  # type: List[QtGui.QTransform]
+    ):
+        # type: (...) -> None
+        super(_StripRenderTask, self).__init__()
+        # Created in the calling thread so the finished signal is queued
+        # back to it.
+        self.signals = _RenderTaskSignals()
+        self._key = key
+        self._path = path
+        self._size = QtCore.QSize(size)
+        self._transforms = transforms
+
+    def run(self):
+        # type: () -> None
+        # QSvgRenderer isn't thread safe so each task parses it's own copy.
+        renderer = RendererCache.parse(self._path)
+        mask = _renderStrip(renderer, self._size, self._transforms)
+        self.signals.finished.emit(self._key, None, mask)
+
+
+def _inPack(name):
+    # type: (str) -> bool
+    """
+    Indicate if the pack used by PixmapGenerators has images for the
+    provided icon name.
+
+    Parameters
+    ----------
+    name : str
+
+    Returns
+    -------
+    bool
+    """
+    pack = PixmapGenerator.pack()
+    return pack is not None and name in pack
+
+
+def _buttonIconRect(button):
+    # type: (QtWidgets.QAbstractButton) -> QtCore.QRect
+    """
+    Return the area of the provided button that it's icon is drawn in.
+
+    Styles center the icon vertically, but it's horizontal position depends
+    on the text of the button, so the full width of the button is used when
+    it has text.
+
+    Parameters
+    ----------
+    button : QtWidgets.QAbstractButton
+
+    Returns
+    -------
+    QtCore.QRect
+    """
+    rect = button.rect()
+    iconRect = QtCore.QRect(QtCore.QPoint(0, 0), button.iconSize())
+    iconRect.moveCenter(rect.center())
+
+    if isinstance(button, QtWidgets.QToolButton) and \
+            button.toolButtonStyle() != QtCore.Qt.ToolButtonIconOnly:
+        return rect
+    if button.text():
+        iconRect.setLeft(rect.left())
+        iconRect.setRight(rect.right())
+
+    # Allow for styles that offset the icon of pressed buttons
+    return iconRect.adjusted(-2, -2, 2, 2).intersected(rect)
+
+
+def _physicalSize(size, devicePixelRatio):
+    # type: (QtCore.QSize, float) -> QtCore.QSize
+    """
+    Return the number of device pixels required to draw the provided
+    logical size.
+
+    Parameters
+    ----------
+    size : QtCore.QSize
+    devicePixelRatio : float
+
+    Returns
+    -------
+    QtCore.QSize
+    """
+    if devicePixelRatio == 1.0:
+        return size
+    return QtCore.QSize(
+        int(round(size.width() * devicePixelRatio)),
+        int(round(size.height() * devicePixelRatio)),
+    )
+
+
+def _stripColumns(size, frameCount):
+    # type: (QtCore.QSize, int) -> int
+    """
+    Return the number of frames in each row of a sprite strip.
+
+    Parameters
+    ----------
+    size : QtCore.QSize
+        The size of a frame.
+    frameCount : int
+
+    Returns
+    -------
+    int
+    """
+    return max(1, min(frameCount, _MAX_STRIP_WIDTH // max(size.width(), 1)))
+
+
+def _renderStrip(
+    renderer,  # type: QtSvg.QSvgRenderer
+    size,  # type: QtCore.QSize
+    transforms,  # type: List[QtGui.QTransform]
+):
+    # type: (...) -> QtGui.QImage
+    """
+    Render an svg once per transform into a single sprite strip. This only
+    uses classes that are safe to use outside of the gui thread.
+
+    Parameters
+    ----------
+    renderer : QtSvg.QSvgRenderer
+    size : QtCore.QSize
+        The size of each frame.
+    transforms : List[QtGui.QTransform]
+        The transform for each frame.
+
+    Returns
+    -------
+    QtGui.QImage
+    """
+    columns = _stripColumns(size, len(transforms))
+    rows = (len(transforms) + columns - 1) // columns
+    width = size.width()
+    height = size.height()
+
+    image = QtGui.QImage(
+        width * columns,
+        height * rows,
+        QtGui.QImage.Format_ARGB32_Premultiplied,
+    )
+    image.fill(QtCore.Qt.transparent)
+
+    painter = QtGui.QPainter(image)
+    bounds = QtCore.QRectF(0, 0, width, height)
+
+    for index, transform in enumerate(transforms):
+        x = (index % columns) * width
+        y = (index // columns) * height
+
+        # Stop transformed frames from bleeding into their neighbours.
+        painter.setTransform(QtGui.QTransform())
+        painter.setClipRect(x, y, width, height)
+        painter.setTransform(transform * QtGui.QTransform.fromTranslate(x, y))
+        renderer.render(painter, bounds)
+
+    painter.end()
+
+    return image
+
+
+def _renderMask(
+    renderer,  # type: QtSvg.QSvgRenderer
+    size,  # type: QtCore.QSize
+    transform=None,  # type: Optional[QtGui.QTransform]
+):
+    # type: (...) -> QtGui.QImage
+    """
+    Render an svg to a QImage. This only uses classes that are safe to use
+    outside of the gui thread.
+
+    The image is used as is when no color override is required, otherwise
+    it's alpha channel is used as the coverage mask for the color.
+
+    Parameters
+    ----------
+    renderer : QtSvg.QSvgRenderer
+    size : QtCore.QSize
+    transform : Optional[QtGui.QTransform]
+
+    Returns
+    -------
+    QtGui.QImage
+    """
+    image = QtGui.QImage(
+        size,
+        QtGui.QImage.Format_ARGB32_Premultiplied,
+    )
+    image.fill(QtCore.Qt.transparent)
+
+    # Use the QSvgRenderer to draw the image
+    painter = QtGui.QPainter(image)
+
+    if transform is not None:
+        # Rotate the painter's co-ordinate space so
+        # the image is correctly positioned.
+        painter.setTransform(transform)
+
+    renderer.render(painter)
+    painter.end()
+
+    return image
+
+
+def _transformPixmap(pixmap, transform):
+    # type: (QtGui.QPixmap, QtGui.QTransform) -> QtGui.QPixmap
+    """
+    Return a copy of the provided pixmap drawn with the provided transform.
+
+    Parameters
+    ----------
+    pixmap : QtGui.QPixmap
+    transform : QtGui.QTransform
+        The transform in the physical pixels of the pixmap.
+
+    Returns
+    -------
+    QtGui.QPixmap
+    """
+    result = QtGui.QPixmap(pixmap.size())
+    result.fill(QtCore.Qt.transparent)
+
+    painter = QtGui.QPainter(result)
+    painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+    painter.setTransform(transform)
+    # Source & target rects are used so the pixmap is drawn in physical
+    # pixels regardless of it's devicePixelRatio
+    painter.drawPixmap(
+        QtCore.QRectF(result.rect()),
+        pixmap,
+        QtCore.QRectF(pixmap.rect()),
+    )
+    painter.end()
+
+    result.setDevicePixelRatio(pixmap.devicePixelRatio())
+    return result
+
+
+def _colorize(mask, color):
+    # type: (QtGui.QImage, QtGui.QColor) -> QtGui.QImage
+    """
+    Return a solid color image using the alpha channel of the provided mask.
+
+    Parameters
+    ----------
+    mask : QtGui.QImage
+    color : QtGui.QColor
+
+    Returns
+    -------
+    QtGui.QImage
+    """
+    image = QtGui.QImage(
+        mask.size(),
+        QtGui.QImage.Format_ARGB32_Premultiplied,
+    )
+    image.fill(color)
+
+    # Keep the color only where the mask has coverage, in a single pass.
+    painter = QtGui.QPainter(image)
+    painter.setCompositionMode(QtGui.QPainter.CompositionMode_DestinationIn)
+    painter.drawImage(0, 0, mask)
+    painter.end()
+
+    return image
@@ -0,0 +1,274 @@
+"""
+A module for exporting icons as image files, e.g. for use on the web
+"""
+
+import argparse
+import fnmatch
+import os
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from iconify import offscreen
+from iconify.cache import RendererCache
+from iconify.core import _colorize, _renderMask
+from iconify.path import findIcons, listIcons, statIcon
+from iconify.qt import QtCore, QtGui
+
+if TYPE_CHECKING:
+    ExportTarget = Tuple[int, int, Optional[int], str]
+    ExportJob = Tuple[str, List[ExportTarget]]
+
+
+def exportIcons(
+    patterns,  # type: Sequence[str]
+    sizes,  # type: Sequence[Tuple[int, int]]
+    outputDir,  # type: str
+    colors=None,  # type: Optional[Sequence[Optional[str]]]
+    fileFormat='png',  # type: str
+    processes=None,  # type: Optional[int]
+    force=False,  # type: bool
+):
+    # type: (...) -> Dict[str, float]
+    """
+    Export the icons on the iconify path that match the provided glob
+    patterns as image files, with one file per size and color.
+
+    Files are written to `<outputDir>/<icon>-<width>x<height>[-<color>].<ext>`
+    where the `:`'s in the icon name are replaced with directory separators.
+    Files that are newer than the svg they're rendered from are considered up
+    to date and are not exported again.
+
+    The images are rendered and written by a pool of worker processes.
+
+    Parameters
+    ----------
+    patterns : Sequence[str]
+        Glob patterns matched against the names returned by `listIcons`
+        e.g. `fa:solid:*`.
+    sizes : Sequence[Tuple[int, int]]
+        The width & height of the images to export.
+    outputDir : str
+    colors : Optional[Sequence[Optional[str]]]
+        Anything accepted by QColor, with None for the original colors of the
+        svg. When not provided, only the original colors are exported.
+    fileFormat : str
+        Any format Qt is able to write e.g. `png` or `webp`.
+    processes : Optional[int]
+        The number of processes used to export the images. When not
+        provided, the number of CPUs is used.
+    force : bool
+        Export files even if they're up to date.
+
+    Returns
+    -------
+    Dict[str, float]
+        `exported` & `skipped` are the number of files that were or weren't
+        written, `seconds` is the time taken and `imagesPerSecond` is the
+        throughput of the export.
+    """
+    supportedFormats = [
+        bytes(fmt).decode('utf-8')
+        for fmt in QtGui.QImageWriter.supportedImageFormats()
+    ]
+    if fileFormat not in supportedFormats:
+        raise ValueError("Unsupported image format: {}".format(fileFormat))
+
+    colorValues = []  # type: List[Tuple[Optional[int], str]]
+    for colorName in colors or [None]:
+        if colorName is None:
+            colorValues.append((None, ''))
+            continue
+        qColor = QtGui.QColor(colorName)
+        if not qColor.isValid():
+            raise ValueError("Invalid color: {}".format(colorName))
+        colorValues.append((qColor.rgba(), '-' + qColor.name()[1:]))
+
+    names = set()
+    for name in listIcons():
+        for pattern in patterns:
+            if fnmatch.fnmatch(name, pattern):
+                names.add(name)
+                break
+
+    startTime = time.time()
+    jobs = []  # type: List[ExportJob]
+    skipped = 0
+
+    paths = findIcons(names)
+    for name in sorted(paths):
+        path = paths[name]
+        svgTime = statIcon(path).st_mtime
+        basePath = os.path.join(outputDir, name.replace(':', os.sep))
+
+        targets = []  # type: List[ExportTarget]
+        for width, height in sizes:
+            for color, colorSuffix in colorValues:
+                outputPath = '{}-{}x{}{}.{}'.format(
+                    basePath, width, height, colorSuffix, fileFormat
+                )
+                if not force and os.path.isfile(outputPath) and \
+                        os.path.getmtime(outputPath) >= svgTime:
+                    skipped += 1
+                    continue
+                targets.append((width, height, color, outputPath))
+
+        if targets:
+            jobs.append((path, targets))
+
+    exported = 0
+    if jobs:
+        workers = offscreen.pool(processes)
+        try:
+            for count in workers.imap_unordered(_exportIcon, jobs):
+                exported += count
+        finally:
+            workers.close()
+            workers.join()
+
+    seconds = time.time() - startTime
+    return {
+        'exported': exported,
+        'skipped': skipped,
+        'seconds': seconds,
+        'imagesPerSecond': exported / seconds if seconds else 0.0,
+    }
+
+
+def run():
+    # type: () -> None
+    """
+    The command line interface to `exportIcons`.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export the icons on the iconify path as image files."
+    )
+    parser.add_argument('outputDir', help="The directory to export to.")
+    parser.add_argument(
+        'patterns',
+        nargs='+',
+        help="Glob patterns matching the icons to export e.g. 'fa:solid:*'.",
+    )
+    parser.add_argument(
+        '-s',
+        '--size',
+        action='append',
+        required=True,
+        type=_parseSize,
+        help="A size to export, as either 'N' or 'WIDTHxHEIGHT'. Can be "
+        "used multiple times.",
+    )
+    parser.add_argument(
+        '-c',
+        '--color',
+        action='append',
+        help="A color to export, as anything accepted by QColor. Can be used "
+        "multiple times. Defaults to the original colors.",
+    )
+    parser.add_argument(
+        '-f',
+        '--format',
+        default='png',
+        help="The image format to export e.g. png or webp.",
+    )
+    parser.add_argument(
+        '-j',
+        '--processes',
+        type=int,
+        help="The number of processes to export with, defaults to the "
+        "number of CPUs.",
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help="Export files that are already up to date.",
+    )
+    args = parser.parse_args()
+
+    stats = exportIcons(
+        args.patterns,
+        args.size,
+        args.outputDir,
+        colors=args.color,
+        fileFormat=args.format,
+        processes=args.processes,
+        force=args.force,
+    )
+    print(
+        "Exported {} images ({} up to date) in {:.2f}s, {:.1f} images/s".
+        format(
+            int(stats['exported']),
+            int(stats['skipped']),
+            stats['seconds'],
+            stats['imagesPerSecond'],
+        )
+    )
+
+
+def _parseSize(value):
+    # type: (str) -> Tuple[int, int]
+    """
+    Return the width & height identified by the provided string.
+
+    Parameters
+    ----------
+    value : str
+        Either 'N' or 'WIDTHxHEIGHT'.
+
+    Returns
+    -------
+    Tuple[int, int]
+    """
+    try:
+        if 'x' in value:
+            width, height = value.split('x')
+            return int(width), int(height)
+        return int(value), int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Invalid size: {}".format(value))
+
+
+def _exportIcon(job):
+    # type: (ExportJob) -> int
+    """
+    Render and write the image files for the provided job. This is run in a
+    worker process.
+
+    Parameters
+    ----------
+    job : ExportJob
+
+    Returns
+    -------
+    int
+        The number of files written.
+    """
+    path, targets = job
+    renderer = RendererCache.parse(path)
+    masks = {}  # type: Dict[Tuple[int, int], QtGui.QImage]
+
+    written = 0
+    for width, height, color, outputPath in targets:
+        # The svg is only rendered once per size for all of it's colors
+        mask = masks.get((width, height))
+        if mask is None:
+            mask = _renderMask(renderer, QtCore.QSize(width, height))
+            masks[(width, height)] = mask
+
+        if color is None:
+            image = mask
+        else:
+            image = _colorize(mask, QtGui.QColor.fromRgba(color))
+
+        directory = os.path.dirname(outputPath)
+        if directory and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another worker may have created it
+                if not os.path.isdir(directory):
+                    raise
+
+        if image.save(outputPath):
+            written += 1
+
+    return written
@@ -0,0 +1,49 @@
+"""
+Support for rendering images in worker processes that have no display
+"""
+
+import multiprocessing
+import os
+from typing import Any, Optional
+
+from iconify.qt import QtGui
+
+# The application owned by a worker process, which must outlive any rendering
+_app = None  # type: Optional[QtGui.QGuiApplication]
+
+
+def initWorker():
+    # type: () -> None
+    """
+    Prepare the current process for rendering images with Qt using the
+    offscreen platform, so no display is required.
+    """
+    global _app
+
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    if QtGui.QGuiApplication.instance() is None:
+        _app = QtGui.QGuiApplication([])
+
+
+def pool(processes=None):
+    # type: (Optional[int]) -> Any
+    """
+    Return a pool of worker processes that are ready to render images.
+
+    Workers are started fresh, rather than forked, on platforms that allow
+    it so they don't inherit the Qt state of the calling process.
+
+    Parameters
+    ----------
+    processes : Optional[int]
+        The number of workers. When not provided, the number of CPUs is used.
+
+    Returns
+    -------
+    multiprocessing.pool.Pool
+    """
+    if hasattr(multiprocessing, 'get_context'):
+        context = multiprocessing.get_context('spawn')  # type: Any
+    else:
+        context = multiprocessing
+    return context.Pool(processes, initializer=initWorker)
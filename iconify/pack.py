@@ -0,0 +1,396 @@
+"""
+Support for prebuilt packs of rendered images, which allow an application
+to ship the exact icons it uses without rendering them at runtime
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+import iconify.anim
+from iconify import offscreen
+from iconify.cache import RendererCache, _imageBytes, encodeKey
+from iconify.path import findIcon
+from iconify.qt import QtCore, QtGui
+
+if TYPE_CHECKING:
+    from typing import Mapping, Sequence, Union
+
+    from iconify.anim import BaseAnimation
+    PackEntry = Tuple[int, int, int]
+    AnimSpec = Union[None, str, Dict[str, Any]]
+    BakeJob = Tuple[str, str, int, int, Optional[int], AnimSpec]
+    BakedImage = Tuple[bytes, int, int, bytes]
+
+
+class PackFile(object):
+    """
+    A read only collection of images rendered ahead of time by `bake`.
+
+    The file starts with a header identifying the format version, followed by
+    the raw premultiplied ARGB32 data of each image and finally an index of
+    the images. The file is memory mapped so images are only read from disk
+    when they are used.
+
+    Images are identified by the name of the icon, as it would be given to
+    `Icon`, the physical size, the animation fingerprint & frame and the
+    color override.
+    """
+
+    FORMAT_VERSION = 1
+
+    _MAGIC = b'ICONIFYP'
+    # magic, version, image count, index offset
+    _HEADER = struct.Struct('<8sIIQ')
+    # key length, image width, image height, image data offset
+    _RECORD = struct.Struct('<IIIQ')
+
+    def __init__(self, path):
+        # type: (str) -> None
+        self._path = path
+
+        if os.path.getsize(path) < self._HEADER.size:
+            raise ValueError("Invalid iconify pack file: {}".format(path))
+
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, offset = self._HEADER.unpack_from(self._mmap)
+        if magic != self._MAGIC or version != self.FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError("Invalid iconify pack file: {}".format(path))
+
+        # Maps encoded keys to (offset, width, height) tuples
+        self._index = {}  # type: Dict[bytes, PackEntry]
+        self._names = set()  # type: Set[str]
+
+        for _ in range(count):
+            keyLength, width, height, dataOffset = self._RECORD.unpack_from(
+                self._mmap, offset
+            )
+            offset += self._RECORD.size
+            key = self._mmap[offset:offset + keyLength]
+            offset += keyLength
+
+            self._index[key] = (dataOffset, width, height)
+            self._names.add(key.split(b'\x1f', 1)[0].decode('utf-8'))
+
+    def __contains__(self, name):
+        # type: (str) -> bool
+        return name in self._names
+
+    def path(self):
+        # type: () -> str
+        """
+        Return the location of the pack file.
+
+        Returns
+        -------
+        str
+        """
+        return self._path
+
+    def count(self):
+        # type: () -> int
+        """
+        Return the number of images in the pack.
+
+        Returns
+        -------
+        int
+        """
+        return len(self._index)
+
+    def names(self):
+        # type: () -> List[str]
+        """
+        Return the names of the icons that have images in the pack.
+
+        Returns
+        -------
+        List[str]
+        """
+        return sorted(self._names)
+
+    def get(self, key):
+        # type: (Sequence[Any]) -> Optional[QtGui.QImage]
+        """
+        Return the image stored for the provided key, or None if the key is
+        not in the pack.
+
+        Parameters
+        ----------
+        key : Sequence[Any]
+            The name, width, height, animation fingerprint, frame and color
+            of the image.
+
+        Returns
+        -------
+        Optional[QtGui.QImage]
+        """
+        entry = self._index.get(encodeKey(key))
+        if entry is None:
+            return None
+
+        offset, width, height = entry
+        data = self._mmap[offset:offset + width * height * 4]
+        return QtGui.QImage(
+            data,
+            width,
+            height,
+            width * 4,
+            QtGui.QImage.Format_ARGB32_Premultiplied,
+        ).copy()
+
+    def close(self):
+        # type: () -> None
+        """
+        Release the memory map of the pack file.
+        """
+        self._mmap.close()
+
+
+def bake(manifest, output, processes=None):
+    # type: (Union[str, Dict[str, Any]], str, Optional[int]) -> int
+    """
+    Render the images described by the provided manifest and write them to a
+    single pack file, which can be loaded with `PackFile`.
+
+    The manifest is a mapping, or the location of a json file holding one,
+    with an `icons` list. Each icon has a `name` and may override the
+    `sizes`, `colors` and `anims` provided at the top level of the manifest::
+
+        {
+            "sizes": [16, 32],
+            "icons": [
+                {"name": "fa:solid:cog", "anims": [null, "Spin"]},
+                {"name": "delete", "colors": ["red", "#00ff00"]}
+            ]
+        }
+
+    Sizes are in physical pixels, either a single number or a
+    `[width, height]` pair. Colors are anything accepted by QColor, with
+    `null` for the original colors of the svg. Animations are the name of a
+    class in `iconify.anim`, or an object with a `type` key and the keyword
+    arguments to create it with, with `null` for no animation. Every frame of
+    an animation is rendered.
+
+    Parameters
+    ----------
+    manifest : Union[str, Dict[str, Any]]
+    output : str
+        The location of the pack file to write.
+    processes : Optional[int]
+        The number of processes used to render the images. When not
+        provided, the number of CPUs is used.
+
+    Returns
+    -------
+    int
+        The number of images written to the pack.
+    """
+    if isinstance(manifest, dict):
+        jobs = _bakeJobs(manifest)
+    else:
+        with open(manifest) as manifestFile:
+            jobs = _bakeJobs(json.load(manifestFile))
+
+    directory = os.path.dirname(output)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    index = []  # type: List[Tuple[bytes, int, int, int]]
+    tmpPath = output + '.tmp'
+    workers = offscreen.pool(processes)
+    try:
+        with open(tmpPath, 'wb') as f:
+            f.write(b'\0' * PackFile._HEADER.size)
+
+            for images in workers.imap(_renderBakeJob, jobs):
+                for key, width, height, data in images:
+                    index.append((key, width, height, f.tell()))
+                    f.write(data)
+
+            indexOffset = f.tell()
+            for key, width, height, offset in index:
+                f.write(PackFile._RECORD.pack(len(key), width, height, offset))
+                f.write(key)
+
+            f.seek(0)
+            f.write(
+                PackFile._HEADER.pack(
+                    PackFile._MAGIC,
+                    PackFile.FORMAT_VERSION,
+                    len(index),
+                    indexOffset,
+                )
+            )
+    finally:
+        workers.close()
+        workers.join()
+
+    # os.rename can't replace an existing file on windows
+    if sys.platform == 'win32' and os.path.exists(output):
+        os.remove(output)
+    os.rename(tmpPath, output)
+
+    return len(index)
+
+
+def run():
+    # type: () -> None
+    """
+    The command line interface to `bake`.
+    """
+    parser = argparse.ArgumentParser(
+        description="Render the icons described by a json manifest into a "
+        "pack file that iconify can load with the ICONIFY_PACK environment "
+        "variable."
+    )
+    parser.add_argument('manifest', help="The json manifest to bake.")
+    parser.add_argument('output', help="The pack file to write.")
+    parser.add_argument(
+        '-j',
+        '--processes',
+        type=int,
+        help="The number of processes to render with, defaults to the "
+        "number of CPUs.",
+    )
+    args = parser.parse_args()
+
+    count = bake(args.manifest, args.output, processes=args.processes)
+    print("Baked {} images into: {}".format(count, args.output))
+
+
+def _bakeJobs(manifest):
+    # type: (Mapping[str, Any]) -> List[BakeJob]
+    """
+    Return the work required to render the provided manifest, with one job
+    per icon, size, color and animation combination.
+
+    Parameters
+    ----------
+    manifest : Mapping[str, Any]
+
+    Returns
+    -------
+    List[BakeJob]
+    """
+    jobs = []  # type: List[BakeJob]
+    seen = set()  # type: Set[Tuple[Any, ...]]
+
+    for icon in manifest['icons']:
+        name = icon['name']
+        path = findIcon(name)
+        sizes = icon.get('sizes', manifest.get('sizes', []))
+        colors = icon.get('colors', manifest.get('colors', [None]))
+        anims = icon.get('anims', manifest.get('anims', [None]))
+
+        for size in sizes:
+            if isinstance(size, int):
+                width, height = size, size
+            else:
+                width, height = size
+
+            for colorName in colors:
+                if colorName is None:
+                    color = None
+                else:
+                    qColor = QtGui.QColor(colorName)
+                    if not qColor.isValid():
+                        raise ValueError(
+                            "Invalid color for {}: {}".format(name, colorName)
+                        )
+                    color = qColor.rgba()
+
+                for anim in anims:
+                    # Fail early, rather than in a worker, for invalid anims
+                    _createAnim(anim)
+
+                    jobKey = (name, width, height, color, json.dumps(anim))
+                    if jobKey in seen:
+                        continue
+                    seen.add(jobKey)
+                    jobs.append((name, path, width, height, color, anim))
+
+    return jobs
+
+
+def _createAnim(spec):
+    # type: (AnimSpec) -> Optional[BaseAnimation]
+    """
+    Return the animation described by the provided manifest entry.
+
+    Parameters
+    ----------
+    spec : AnimSpec
+
+    Returns
+    -------
+    Optional[BaseAnimation]
+    """
+    if spec is None:
+        return None
+
+    if isinstance(spec, dict):
+        kwargs = dict(spec)
+        animType = kwargs.pop('type')
+    else:
+        kwargs = {}
+        animType = spec
+
+    cls = getattr(iconify.anim, animType, None)
+    if not isinstance(cls, type) or \
+            not issubclass(cls, iconify.anim.BaseAnimation):
+        raise ValueError("Invalid animation: {}".format(animType))
+
+    return cls(**kwargs)
+
+
+def _renderBakeJob(job):
+    # type: (BakeJob) -> List[BakedImage]
+    """
+    Render the images for the provided job. This is run in a worker process.
+
+    Parameters
+    ----------
+    job : BakeJob
+
+    Returns
+    -------
+    List[BakedImage]
+        The encoded key, width, height and data of each image.
+    """
+    # Imported here as core depends on this module
+    from iconify.core import _colorize, _renderMask
+
+    name, path, width, height, color, animSpec = job
+    size = QtCore.QSize(width, height)
+    # PixmapGenerator identifies colors without their alpha
+    keyColor = QtGui.QColor.fromRgba(color).rgb() if color is not None else -1
+    renderer = RendererCache.parse(path)
+    anim = _createAnim(animSpec)
+
+    frames = []  # type: List[Tuple[Any, int, Optional[QtGui.QTransform]]]
+    if anim is None:
+        frames.append(((), 0, None))
+    else:
+        fingerprint = anim.fingerprint()
+        for index, xfm in enumerate(anim.frameTransforms(size)):
+            frames.append((fingerprint, anim.minFrame() + index, xfm))
+
+    images = []  # type: List[BakedImage]
+    for fingerprint, frame, transform in frames:
+        image = _renderMask(renderer, size, transform)
+        if color is not None:
+            image = _colorize(image, QtGui.QColor.fromRgba(color))
+
+        # Matches the keys used by PixmapGenerator
+        key = encodeKey((name, width, height, fingerprint, frame, keyColor))
+        images.append((key, width, height, _imageBytes(image)))
+
+    return images
@@ -2,34 +2,559 @@
 Image location support
 """
 
+import bisect
 import fnmatch
+import heapq
+import json
 import os
-from typing import List
+import re
+import sys
+import time
+import zipfile
+from multiprocessing.pool import ThreadPool
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set, Tuple
 
-from kids.cache import cache
+from iconify.archive import openArchive, splitArchivePath
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Iterator
+    # The mtime, svg file names and sub directory names of a directory
+    DirectoryEntry = Tuple[float, List[str], List[str]]
 
 _USER_DIR = os.path.expanduser('~/.iconify')
+# Entries may also be zip archives of svg files, or directories within them
+# e.g. `/icons/feather.zip/icons`.
 _ICON_PATH = os.environ.get('ICONIFY_PATH', _USER_DIR).split(os.pathsep)
 
+# The default location of the persistent IconIndex. This can be overridden
+# with the ICONIFY_INDEX environment variable, which disables the index
+# when it's set to an empty string.
+DEFAULT_INDEX_PATH = os.path.join(_USER_DIR, '.cache', 'index.json')
+
+# Directories modified within this many seconds of being scanned are scanned
+# again on the next update, as a coarse mtime may not change if they're
+# modified again within the same tick.
+_MTIME_SLACK = 2.0
+
+# Not available in python 2
+_scandir = getattr(os, 'scandir', None)
+
+# Maps the strings given to findIcon to the svg files they were found at
+_foundIcons = {}  # type: Dict[str, str]
+
+# Maps the directories on the iconify path to their mtime when listed and the
+# names of the svg files and the namespace directories they hold, which routes
+# names to the directories that can hold them without probing every directory.
+_rootListings = {}  # type: Dict[str, Tuple[float, Set[str], Set[str]]]
+
+# The IconSearchIndex used by searchIcons, built on first use
+_searchIndex = None  # type: Optional[IconSearchIndex]
+
+# The characters that separate the words of icon names
+_WORD_SEPARATORS = re.compile(r'[\s:_\-./]+')
+
+# Called with each directory added with addIconDirectory and each svg file
+# found by findIcon, e.g. so they can be watched for changes.
+_directoryHooks = []  # type: List[Callable[[str], None]]
+_iconHooks = []  # type: List[Callable[[str], None]]
+
 
 class IconNotFoundError(Exception):
     pass
 
 
+class IconIndex(object):
+    """
+    A persistent index of the svg files found in the directories on the
+    iconify path, which avoids walking every directory each time the icons
+    are listed.
+
+    The index records the mtime of every directory it has scanned, along with
+    the svg files and sub directories it contains. When the index is updated
+    only the directories whose mtime has changed are scanned again, so an
+    unchanged tree costs a single stat per directory.
+
+    The index is stored as json and is written atomically whenever it
+    changes, so it can be shared between processes. Failing to read or write
+    the file is not an error, the index is rebuilt in memory instead.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        # type: (str) -> None
+        self._path = path
+        # Maps root directories to {relative directory: DirectoryEntry} dicts
+        self._roots = None  # type: Optional[Dict[str, Dict[str, Any]]]
+        # Maps root directories to {icon name: svg path} dicts
+        self._paths = {}  # type: Dict[str, Dict[str, str]]
+        # The root directories updated by this process
+        self._updated = set()  # type: Set[str]
+
+    def path(self):
+        # type: () -> str
+        """
+        Return the location of the index file.
+
+        Returns
+        -------
+        str
+        """
+        return self._path
+
+    def update(self, roots):
+        # type: (Sequence[str]) -> None
+        """
+        Scan the directories under the provided roots that have changed since
+        they were last scanned, discard everything recorded for any other
+        roots, e.g. as they've been removed from the iconify path, and save
+        the index if anything changed.
+
+        Parameters
+        ----------
+        roots : Sequence[str]
+        """
+        data = self._load()
+        changed = False
+        for root in set(data) - set(roots):
+            del data[root]
+            self._paths.pop(root, None)
+            changed = True
+        self._refresh(roots, changed)
+
+    def refresh(self, roots):
+        # type: (Sequence[str]) -> None
+        """
+        Scan the directories under the provided roots that have changed since
+        they were last scanned, leaving any other roots untouched, and save
+        the index if anything changed.
+
+        Parameters
+        ----------
+        roots : Sequence[str]
+        """
+        self._refresh(roots, False)
+
+    def rebuild(self, roots):
+        # type: (Sequence[str]) -> None
+        """
+        Discard everything recorded for the provided roots and scan them
+        again in full.
+
+        Parameters
+        ----------
+        roots : Sequence[str]
+        """
+        data = self._load()
+        for root in roots:
+            data.pop(root, None)
+            self._paths.pop(root, None)
+        self.update(roots)
+
+    def names(self, roots):
+        # type: (Sequence[str]) -> List[str]
+        """
+        Return the names of the icons found under the provided roots, in the
+        order of the roots. Roots that haven't been updated by this process
+        are updated first.
+
+        Parameters
+        ----------
+        roots : Sequence[str]
+
+        Returns
+        -------
+        List[str]
+        """
+        names = []  # type: List[str]
+        for root in roots:
+            names.extend(self._rootPaths(root))
+        return names
+
+    def _rootPaths(self, root):
+        # type: (str) -> Dict[str, str]
+        """
+        Return the icon names and svg paths found under the provided root.
+
+        Parameters
+        ----------
+        root : str
+
+        Returns
+        -------
+        Dict[str, str]
+        """
+        if root not in self._updated:
+            self.refresh([root])
+
+        paths = self._paths.get(root)
+        if paths is None:
+            paths = self._paths[root] = {}
+            entries = self._load().get(root, {})
+            for relDir in sorted(entries):
+                prefix = relDir.replace(os.sep, ':') + ':' if relDir else ''
+                dirPath = os.path.join(root, relDir)
+                for filename in entries[relDir][1]:
+                    name = prefix + os.path.splitext(filename)[0]
+                    paths[name] = os.path.join(dirPath, filename)
+        return paths
+
+    def _refresh(self, roots, changed):
+        # type: (Sequence[str], bool) -> None
+        """
+        Scan the directories under the provided roots that have changed, and
+        save the index if anything changed.
+
+        Parameters
+        ----------
+        roots : Sequence[str]
+        changed : bool
+            Whether the index has already been changed.
+        """
+        for root in roots:
+            changed = self._updateRoot(root) or changed
+        if changed:
+            self._save()
+
+    def _updateRoot(self, root):
+        # type: (str) -> bool
+        """
+        Scan the directories under the provided root that have changed.
+
+        Parameters
+        ----------
+        root : str
+
+        Returns
+        -------
+        bool
+            True if anything changed.
+        """
+        self._updated.add(root)
+        entries = self._load().setdefault(root, {})
+        changed = False
+        seen = set()  # type: Set[str]
+        pending = ['']
+
+        while pending:
+            relDir = pending.pop()
+            dirPath = os.path.join(root, relDir) if relDir else root
+            try:
+                mtime = statIcon(dirPath).st_mtime
+            except OSError:
+                continue
+
+            seen.add(relDir)
+            entry = entries.get(relDir)
+            if entry is None or entry[0] != mtime:
+                newEntry = _scanDirectory(dirPath, mtime)
+                # Directories modified recently are scanned on every update,
+                # which only changes the index if their contents changed.
+                if entry is None or list(entry) != list(newEntry):
+                    changed = True
+                entry = entries[relDir] = newEntry
+
+            for dirname in entry[2]:
+                pending.append(os.path.join(relDir, dirname))
+
+        for relDir in set(entries) - seen:
+            del entries[relDir]
+            changed = True
+
+        if changed:
+            self._paths.pop(root, None)
+        return changed
+
+    def _load(self):
+        # type: () -> Dict[str, Dict[str, Any]]
+        """
+        Return the recorded directories of every root, reading them from the
+        index file the first time they're required.
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+        """
+        if self._roots is not None:
+            return self._roots
+
+        roots = {}  # type: Dict[str, Dict[str, Any]]
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+            if data.get('version') == self.FORMAT_VERSION:
+                roots = data['roots']
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+
+        self._roots = roots
+        return roots
+
+    def _save(self):
+        # type: () -> None
+        """
+        Atomically write the index file.
+        """
+        tmpPath = '{}.{}.tmp'.format(self._path, os.getpid())
+        try:
+            directory = os.path.dirname(self._path)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            with open(tmpPath, 'w') as f:
+                data = {'version': self.FORMAT_VERSION, 'roots': self._load()}
+                json.dump(data, f)
+            # os.rename can't replace an existing file on windows
+            if sys.platform == 'win32' and os.path.exists(self._path):
+                os.remove(self._path)
+            os.rename(tmpPath, self._path)
+        except (IOError, OSError):
+            if os.path.exists(tmpPath):
+                os.remove(tmpPath)
+
+
+class IconSearchIndex(object):
+    """
+    An in-memory index of icon names for searching them as the user types.
+
+    Names are split into words, e.g. `font-awesome:solid:arrow-left` holds
+    `font`, `awesome`, `solid`, `arrow` and `left`, and each distinct word is
+    indexed by its trigrams, the runs of three characters it contains. A
+    search finds the words holding each word of the query through the least
+    common of its trigrams, and only considers the names holding those
+    words, rather than testing every name.
+
+    Searches are case insensitive and every word of the query must be found
+    within a word of a name, in any order. Names with a word that is the
+    query word rank first, followed by names with a word that starts with it
+    and finally names with a word that contains it. Names with shorter base
+    names rank first within each.
+    """
+
+    def __init__(self, names):
+        # type: (Iterable[str]) -> None
+        self._names = sorted(set(names))
+
+        # Maps words to the indexes of the names that hold them
+        wordNames = {}  # type: Dict[str, List[int]]
+        baseLengths = []  # type: List[int]
+        for index, name in enumerate(self._names):
+            lowered = name.lower()
+            for word in set(_WORD_SEPARATORS.split(lowered)):
+                if word:
+                    wordNames.setdefault(word, []).append(index)
+            baseLengths.append(len(lowered.rsplit(':', 1)[-1]))
+
+        self._words = sorted(wordNames)
+        self._wordNames = [wordNames[word] for word in self._words]
+
+        # Maps trigrams to the indexes of the words that contain them
+        self._trigrams = {}  # type: Dict[str, List[int]]
+        for wordIndex, word in enumerate(self._words):
+            for trigram in set(_trigrams(word)):
+                self._trigrams.setdefault(trigram, []).append(wordIndex)
+
+        # The position of each name among names that rank equally. The sort
+        # is stable so names with base names of the same length stay sorted.
+        self._positions = [0] * len(self._names)
+        order = sorted(range(len(self._names)), key=baseLengths.__getitem__)
+        for position, index in enumerate(order):
+            self._positions[index] = position
+
+    def names(self):
+        # type: () -> List[str]
+        """
+        Return the sorted names in the index.
+
+        Returns
+        -------
+        List[str]
+        """
+        return list(self._names)
+
+    def search(self, query, namespace=None, limit=None):
+        # type: (str, Optional[str], Optional[int]) -> List[str]
+        """
+        Return the names that match the provided query, best match first.
+
+        Parameters
+        ----------
+        query : str
+            The words to search for. Every name is matched when it's empty.
+        namespace : Optional[str]
+            When provided, only names within the namespace are matched.
+        limit : Optional[int]
+            The maximum number of names to return.
+
+        Returns
+        -------
+        List[str]
+        """
+        start, end = 0, len(self._names)
+        if namespace is not None:
+            # Names are sorted so those in a namespace are contiguous
+            start = bisect.bisect_left(self._names, namespace + ':')
+            end = bisect.bisect_left(self._names, namespace + ';', start)
+
+        terms = list(filter(None, _WORD_SEPARATORS.split(query.lower())))
+        if not terms:
+            names = self._names[start:end]
+            return names if limit is None else names[:limit]
+
+        tiers = self._termTiers(terms[0])
+        if len(terms) > 1:
+            # Maps the indexes of the names matching every term to the sum
+            # of their ranks
+            ranks = _tierRanks(tiers)
+            for term in terms[1:]:
+                termRanks = _tierRanks(self._termTiers(term))
+                ranks = {
+                    index: rank + termRanks[index]
+                    for index, rank in ranks.items() if index in termRanks
+                }
+            tiers = []
+            for index, rank in ranks.items():
+                while len(tiers) <= rank:
+                    tiers.append(set())
+                tiers[rank].add(index)
+
+        matches = []  # type: List[str]
+        for tier in tiers:
+            if namespace is not None:
+                tier = set(index for index in tier if start <= index < end)
+            if limit is None:
+                indexes = sorted(tier, key=self._positions.__getitem__)
+            else:
+                indexes = heapq.nsmallest(
+                    limit - len(matches),
+                    tier,
+                    key=self._positions.__getitem__,
+                )
+            matches.extend(self._names[index] for index in indexes)
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def _termTiers(self, term):
+        # type: (str) -> List[Set[int]]
+        """
+        Return the indexes of the names with a word that is the provided
+        term, the names with a word that starts with it and the names with a
+        word that contains it.
+
+        Parameters
+        ----------
+        term : str
+
+        Returns
+        -------
+        List[Set[int]]
+        """
+        wordIndexes = range(len(self._words))  # type: Sequence[int]
+        for trigram in _trigrams(term):
+            posting = self._trigrams.get(trigram, [])
+            if len(posting) < len(wordIndexes):
+                wordIndexes = posting
+
+        wordTiers = ([], [], [])  # type: Tuple[List[int], ...]
+        for wordIndex in wordIndexes:
+            word = self._words[wordIndex]
+            if word == term:
+                wordTiers[0].append(wordIndex)
+            elif word.startswith(term):
+                wordTiers[1].append(wordIndex)
+            elif term in word:
+                wordTiers[2].append(wordIndex)
+
+        tiers = []  # type: List[Set[int]]
+        seen = set()  # type: Set[int]
+        for wordTier in wordTiers:
+            tier = set()  # type: Set[int]
+            tier.update(*[self._wordNames[index] for index in wordTier])
+            tier -= seen
+            seen |= tier
+            tiers.append(tier)
+        return tiers
+
+
+def _defaultIconIndex():
+    # type: () -> Optional[IconIndex]
+    """
+    Return the IconIndex identified by the ICONIFY_INDEX environment
+    variable, or the default one when it's not set.
+
+    Returns
+    -------
+    Optional[IconIndex]
+    """
+    path = os.environ.get('ICONIFY_INDEX', DEFAULT_INDEX_PATH)
+    if not path:
+        return None
+    return IconIndex(path)
+
+
+_iconIndex = _defaultIconIndex()
+
+
+def iconIndex():
+    # type: () -> Optional[IconIndex]
+    """
+    Return the persistent index used to find icons, if any.
+
+    Returns
+    -------
+    Optional[IconIndex]
+    """
+    return _iconIndex
+
+
+def setIconIndex(index):
+    # type: (Optional[IconIndex]) -> None
+    """
+    Set the persistent index used to find icons.
+
+    Parameters
+    ----------
+    index : Optional[IconIndex]
+        When None, the directories on the iconify path are walked every time
+        the icons are listed.
+    """
+    global _iconIndex
+    _iconIndex = index
+    _clearFoundIcons()
+
+
+def rebuildIconIndex():
+    # type: () -> None
+    """
+    Scan every directory on the iconify path again in full, rather than only
+    those that have changed, and update the persistent index.
+    """
+    if _iconIndex is not None:
+        _iconIndex.rebuild(_ICON_PATH)
+    _clearFoundIcons()
+
+
 def addIconDirectory(directoryLocation):
     # type: (str) -> None
     """
     Add the provided path to the list of directories that iconify will use
     when looking for svg files.
 
+    The directory is searched after every other directory, so it can't
+    change where an icon that has already been found is found, and no
+    cached results of findIcon are discarded.
+
     Parameters
     ----------
     directoryLocation : str
     """
+    global _searchIndex
     _ICON_PATH.append(directoryLocation)
+    _searchIndex = None
+    for hook in _directoryHooks:
+        hook(directoryLocation)
 
 
-@cache
 def findIcon(iconPath):
     # type: (str) -> str
     """
@@ -38,6 +563,517 @@ def findIcon(iconPath):
     Any `:`'s in the provided string will be replaced with the current
     platform's directory separator.
 
+    Relative paths are routed by their namespace, the part before the first
+    `:`, to the directories on the iconify path that hold that namespace, so
+    a lookup is usually a single stat. When it's not found that way, the
+    directories that have been modified since they were listed, e.g. as a
+    namespace has been installed into them, are listed again and searched.
+
+    Results are cached until the svg file they were found at changes, see
+    invalidateIcon, or the cache is cleared with `findIcon.cache_clear()`.
+
+    Parameters
+    ----------
+    iconPath : str
+
+    Returns
+    -------
+    str
+    """
+    absIconPath = _foundIcons.get(iconPath)
+    if absIconPath is None:
+        absIconPath = _findIcon(iconPath)
+        _foundIcons[iconPath] = absIconPath
+        for hook in _iconHooks:
+            hook(absIconPath)
+    return absIconPath
+
+
+def _clearFoundIcons():
+    # type: () -> None
+    """
+    Discard every cached result of findIcon, and the index used by
+    searchIcons.
+    """
+    global _searchIndex
+    _foundIcons.clear()
+    _rootListings.clear()
+    _searchIndex = None
+
+
+findIcon.cache_clear = _clearFoundIcons  # type: ignore
+
+
+def findIcons(names):
+    # type: (Iterable[str]) -> Dict[str, str]
+    """
+    Find the svg files for many names at once.
+
+    Rather than a stat per name, each directory that may hold the names is
+    listed at most once, which makes resolving thousands of names a single
+    pass over the directories involved.
+
+    Parameters
+    ----------
+    names : Iterable[str]
+        Anything accepted by findIcon.
+
+    Returns
+    -------
+    Dict[str, str]
+        Maps the names that were found to their svg files. Names that
+        weren't found are omitted.
+    """
+    found = {}  # type: Dict[str, str]
+    # Maps directories to their entries, listed on first use
+    listings = {}  # type: Dict[str, Set[str]]
+
+    def route(name, roots):
+        # type: (str, Sequence[str]) -> Optional[str]
+        parts = name.replace(os.sep, ':').split(':')
+        filename = parts[-1] + '.svg'
+        for root in roots:
+            rootFiles, rootDirs = _rootListing(root)
+            if len(parts) == 1:
+                if filename in rootFiles:
+                    return os.path.join(root, filename)
+                continue
+            if parts[0] not in rootDirs:
+                continue
+
+            directory = os.path.join(root, *parts[:-1])
+            entries = listings.get(directory)
+            if entries is None:
+                entries = set(_listDirectory(directory)[0])
+                listings[directory] = entries
+            if filename in entries:
+                return os.path.join(directory, filename)
+        return None
+
+    def record(name, absIconPath):
+        # type: (str, str) -> None
+        found[name] = _foundIcons[name] = absIconPath
+        for hook in _iconHooks:
+            hook(absIconPath)
+
+    missing = []  # type: List[str]
+    for name in names:
+        absIconPath = _foundIcons.get(name)
+        if absIconPath is not None:
+            found[name] = absIconPath
+        elif os.path.isabs(name):
+            if _isIconFile(name):
+                record(name, name)
+        else:
+            absIconPath = route(name, _ICON_PATH)
+            if absIconPath is None:
+                missing.append(name)
+            else:
+                record(name, absIconPath)
+
+    if missing:
+        # The listings may be out of date, see _resolveIcon
+        roots = _relistRoots()
+        for name in missing:
+            absIconPath = route(name, roots)
+            if absIconPath is not None:
+                record(name, absIconPath)
+
+    return found
+
+
+def invalidateIcon(filePath):
+    # type: (str) -> List[str]
+    """
+    Discard the cached results of findIcon affected by the provided svg file
+    being edited, added or removed. That's the names found at the file, and
+    the names that would be found at the file if they were looked up again.
+    The index used by searchIcons is rebuilt when it's next used.
+
+    Parameters
+    ----------
+    filePath : str
+
+    Returns
+    -------
+    List[str]
+        The names whose results were discarded.
+    """
+    return invalidateIcons([filePath])
+
+
+def invalidateIcons(filePaths):
+    # type: (Iterable[str]) -> List[str]
+    """
+    Discard the cached results of findIcon affected by the provided svg
+    files, see invalidateIcon. The index is updated, and the cached results
+    are checked, once for all of the files.
+
+    Parameters
+    ----------
+    filePaths : Iterable[str]
+
+    Returns
+    -------
+    List[str]
+        The names whose results were discarded.
+    """
+    global _searchIndex
+    normPaths = set(os.path.normpath(filePath) for filePath in filePaths)
+
+    roots = []  # type: List[str]
+    names = set()  # type: Set[str]
+    for root in _ICON_PATH:
+        normRoot = os.path.normpath(root)
+        for filePath in normPaths:
+            try:
+                relPath = os.path.relpath(filePath, normRoot)
+            except ValueError:
+                # The file is on a different drive to the root
+                continue
+            if not relPath.startswith(os.pardir):
+                if root not in roots:
+                    roots.append(root)
+                names.add(os.path.splitext(relPath)[0].replace(os.sep, ':'))
+
+    if _iconIndex is not None and roots:
+        _iconIndex.refresh(roots)
+    for root in roots:
+        _rootListings.pop(root, None)
+    if roots:
+        _searchIndex = None
+
+    invalidated = []  # type: List[str]
+    for name, foundPath in list(_foundIcons.items()):
+        if name in names or os.path.normpath(foundPath) in normPaths:
+            del _foundIcons[name]
+            invalidated.append(name)
+    return invalidated
+
+
+def readIcon(filePath):
+    # type: (str) -> bytes
+    """
+    Return the contents of the provided svg file, which may be within a zip
+    archive.
+
+    Parameters
+    ----------
+    filePath : str
+        A location returned by findIcon.
+
+    Returns
+    -------
+    bytes
+    """
+    location = splitArchivePath(filePath)
+    if location is not None:
+        return openArchive(location[0]).read(location[1])
+    with open(filePath, 'rb') as f:
+        return f.read()
+
+
+def statIcon(filePath):
+    # type: (str) -> os.stat_result
+    """
+    Return the status of the provided svg file or directory. Locations
+    within a zip archive share the status, e.g. the modification time and
+    size, of the archive.
+
+    Parameters
+    ----------
+    filePath : str
+        A location returned by findIcon, or a directory holding icons.
+
+    Returns
+    -------
+    os.stat_result
+    """
+    location = splitArchivePath(filePath)
+    return os.stat(filePath if location is None else location[0])
+
+
+def listIcons():
+    # type: () -> List[str]
+    """
+    Return the sorted names of all icons found on the iconify path. Names
+    found in several directories are only returned once.
+
+    When the persistent index is enabled, only the directories that have
+    changed since it was last updated are scanned.
+
+    Returns
+    -------
+    List[str]
+    """
+    if _iconIndex is not None:
+        _iconIndex.update(_ICON_PATH)
+        return sorted(set(_iconIndex.names(_ICON_PATH)))
+    return sorted(iterIcons())
+
+
+def iterIcons(
+    patterns=None,  # type: Optional[Sequence[str]]
+    namespaces=None,  # type: Optional[Sequence[str]]
+    threads=None,  # type: Optional[int]
+):
+    # type: (...) -> Iterator[str]
+    """
+    Yield the names of the icons found on the iconify path as they're found.
+
+    The directories on the iconify path, and the namespace directories
+    within them, are walked concurrently by a pool of threads, so the names
+    are yielded in no particular order. Each name is only yielded once.
+
+    Parameters
+    ----------
+    patterns : Optional[Sequence[str]]
+        Glob patterns the names must match e.g. `fa:solid:*`. Directories
+        that can't hold a matching name aren't walked.
+    namespaces : Optional[Sequence[str]]
+        The namespaces to walk e.g. `font-awesome`. When provided, icons
+        that aren't in a namespace are skipped.
+    threads : Optional[int]
+        The number of threads used to walk the directories. When not
+        provided, the number of CPUs is used.
+
+    Returns
+    -------
+    Iterator[str]
+    """
+    # The leading components of each pattern that don't contain wildcards
+    prefixes = None  # type: Optional[List[List[str]]]
+    if patterns is not None:
+        prefixes = [_literalPrefix(pattern) for pattern in patterns]
+
+    def isWanted(dirParts):
+        # type: (List[str]) -> bool
+        if namespaces is not None and dirParts[0] not in namespaces:
+            return False
+        if prefixes is None:
+            return True
+        for prefix in prefixes:
+            length = min(len(prefix), len(dirParts))
+            if prefix[:length] == dirParts[:length]:
+                return True
+        return False
+
+    def walkNamespace(task):
+        # type: (Tuple[str, List[str]]) -> List[str]
+        root, dirParts = task
+        names = []  # type: List[str]
+        pending = [dirParts]
+        while pending:
+            dirParts = pending.pop()
+            filenames, dirnames = _listDirectory(os.path.join(root, *dirParts))
+            prefix = ':'.join(dirParts) + ':'
+            for filename in filenames:
+                names.append(prefix + os.path.splitext(filename)[0])
+            for dirname in dirnames:
+                if isWanted(dirParts + [dirname]):
+                    pending.append(dirParts + [dirname])
+        return names
+
+    seen = set()  # type: Set[str]
+
+    def newMatches(names):
+        # type: (Iterable[str]) -> List[str]
+        matches = []  # type: List[str]
+        for name in names:
+            if name in seen:
+                continue
+            if patterns is not None and not any(
+                fnmatch.fnmatch(name, pattern) for pattern in patterns
+            ):
+                continue
+            seen.add(name)
+            matches.append(name)
+        return matches
+
+    roots = list(_ICON_PATH)
+    pool = ThreadPool(threads)
+    try:
+        tasks = []  # type: List[Tuple[str, List[str]]]
+        listings = pool.imap(_listDirectory, roots)
+        for root, (filenames, dirnames) in zip(roots, listings):
+            if namespaces is None:
+                for name in newMatches(
+                    os.path.splitext(filename)[0] for filename in filenames
+                ):
+                    yield name
+            for dirname in dirnames:
+                if isWanted([dirname]):
+                    tasks.append((root, [dirname]))
+
+        for names in pool.imap_unordered(walkNamespace, tasks):
+            for name in newMatches(names):
+                yield name
+    finally:
+        # Stops the workers if the caller doesn't consume every name
+        pool.terminate()
+
+
+def searchIcons(query, namespace=None, limit=None):
+    # type: (str, Optional[str], Optional[int]) -> List[str]
+    """
+    Return the names of the icons on the iconify path that match the provided
+    query, best match first e.g. for completers and search fields.
+
+    The names are indexed the first time they're searched, and the index is
+    kept until the icons found on the iconify path change, see
+    IconSearchIndex.
+
+    Parameters
+    ----------
+    query : str
+        The words to search for. Every name is matched when it's empty.
+    namespace : Optional[str]
+        When provided, only icons within the namespace are matched e.g.
+        `font-awesome`.
+    limit : Optional[int]
+        The maximum number of names to return.
+
+    Returns
+    -------
+    List[str]
+    """
+    global _searchIndex
+    if _searchIndex is None:
+        _searchIndex = IconSearchIndex(listIcons())
+    return _searchIndex.search(query, namespace=namespace, limit=limit)
+
+
+def _scanDirectory(dirPath, mtime):
+    # type: (str, float) -> DirectoryEntry
+    """
+    Return the index entry for the provided directory.
+
+    Parameters
+    ----------
+    dirPath : str
+    mtime : float
+        The mtime of the directory before it was scanned.
+
+    Returns
+    -------
+    DirectoryEntry
+    """
+    filenames, dirnames = _listDirectory(dirPath)
+    if time.time() - mtime < _MTIME_SLACK:
+        mtime = -1.0
+    return mtime, filenames, dirnames
+
+
+def _listDirectory(dirPath):
+    # type: (str) -> Tuple[List[str], List[str]]
+    """
+    Return the sorted names of the svg files and the sub directories in the
+    provided directory, which may be within a zip archive. Symlinked
+    directories aren't included, matching os.walk which doesn't follow them,
+    and neither are hidden directories such as `.cache`, which holds the
+    IconIndex within the default root.
+
+    os.scandir is used where it's available, as it doesn't need to stat each
+    entry to tell directories and files apart on most platforms.
+
+    Parameters
+    ----------
+    dirPath : str
+
+    Returns
+    -------
+    Tuple[List[str], List[str]]
+    """
+    location = splitArchivePath(dirPath)
+    if location is not None:
+        try:
+            archive = openArchive(location[0])
+        except (IOError, OSError, zipfile.BadZipfile):
+            return [], []
+        listing = archive.listDirectory(location[1])
+        return list(listing[0]), list(listing[1])
+
+    filenames = []  # type: List[str]
+    dirnames = []  # type: List[str]
+
+    if _scandir is not None:
+        try:
+            entries = list(_scandir(dirPath))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.'):
+                    dirnames.append(entry.name)
+            elif fnmatch.fnmatch(entry.name, '*.svg'):
+                filenames.append(entry.name)
+    else:
+        try:
+            names = os.listdir(dirPath)
+        except OSError:
+            names = []
+        for name in names:
+            path = os.path.join(dirPath, name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                if not name.startswith('.'):
+                    dirnames.append(name)
+            elif fnmatch.fnmatch(name, '*.svg'):
+                filenames.append(name)
+
+    return sorted(filenames), sorted(dirnames)
+
+
+def _literalPrefix(pattern):
+    # type: (str) -> List[str]
+    """
+    Return the leading components of the provided glob pattern that don't
+    contain any wildcards.
+
+    Parameters
+    ----------
+    pattern : str
+
+    Returns
+    -------
+    List[str]
+    """
+    prefix = []  # type: List[str]
+    for part in pattern.split(':'):
+        if any(char in part for char in '*?['):
+            break
+        prefix.append(part)
+    return prefix
+
+
+def _isIconFile(filePath):
+    # type: (str) -> bool
+    """
+    Indicate if there's an svg file at the provided location, which may be
+    within a zip archive.
+
+    Parameters
+    ----------
+    filePath : str
+
+    Returns
+    -------
+    bool
+    """
+    location = splitArchivePath(filePath)
+    if location is None:
+        return os.path.isfile(filePath)
+    try:
+        return openArchive(location[0]).contains(location[1])
+    except (IOError, OSError, zipfile.BadZipfile):
+        return False
+
+
+def _findIcon(iconPath):
+    # type: (str) -> str
+    """
+    Find the svg file for the provided string without using the results
+    cached by findIcon.
+
     Parameters
     ----------
     iconPath : str
@@ -47,40 +1083,180 @@ def findIcon(iconPath):
     str
     """
     if os.path.isabs(iconPath):
-        if not os.path.isfile(iconPath):
+        if not _isIconFile(iconPath):
             raise IconNotFoundError(
                 "Unable to locate icon file: {}".format(iconPath)
             )
         return iconPath
     else:
-        iconPath = iconPath.replace(":", os.sep)
-        for dir_ in _ICON_PATH:
-            absIconPath = os.path.join(dir_, iconPath + ".svg")
-            if os.path.isfile(absIconPath):
-                return absIconPath
+        absIconPath = _resolveIcon(iconPath)
+        if absIconPath is not None:
+            return absIconPath
 
         raise IconNotFoundError(
             "Unable to find an icon on the ICONIFY_PATH that matches '{}'".
-            format(iconPath)
+            format(iconPath.replace(":", os.sep))
         )
 
 
-def listIcons():
+def _resolveIcon(name):
+    # type: (str) -> Optional[str]
+    """
+    Return the svg file for the provided relative name from the directories
+    on the iconify path that hold it's namespace, if any. The directories
+    modified since they were listed are listed again when it's not found.
+
+    Parameters
+    ----------
+    name : str
+
+    Returns
+    -------
+    Optional[str]
+    """
+    absIconPath = _routeIcon(name, _ICON_PATH)
+    if absIconPath is None:
+        # The listings may be out of date e.g. as an icon library has been
+        # installed since they were made
+        absIconPath = _routeIcon(name, _relistRoots())
+    return absIconPath
+
+
+def _routeIcon(name, roots):
+    # type: (str, Sequence[str]) -> Optional[str]
+    """
+    Return the svg file for the provided relative name from the provided
+    directories that hold it's namespace, according to their listings.
+
+    Parameters
+    ----------
+    name : str
+    roots : Sequence[str]
+
+    Returns
+    -------
+    Optional[str]
+    """
+    parts = name.replace(os.sep, ':').split(':')
+    filename = parts[-1] + '.svg'
+
+    for root in roots:
+        rootFiles, rootDirs = _rootListing(root)
+        if len(parts) == 1:
+            if filename not in rootFiles:
+                continue
+        elif parts[0] not in rootDirs:
+            continue
+
+        # The listing may be out of date, so the file is checked
+        absIconPath = os.path.join(root, *parts[:-1] + [filename])
+        if _isIconFile(absIconPath):
+            return absIconPath
+
+    return None
+
+
+def _rootListing(root):
+    # type: (str) -> Tuple[Set[str], Set[str]]
+    """
+    Return the names of the svg files and the namespace directories in the
+    provided directory on the iconify path, listing it on first use.
+
+    Parameters
+    ----------
+    root : str
+
+    Returns
+    -------
+    Tuple[Set[str], Set[str]]
+    """
+    listing = _rootListings.get(root)
+    if listing is None:
+        listing = _listRoot(root)
+    return listing[1], listing[2]
+
+
+def _relistRoots():
     # type: () -> List[str]
     """
-    Return all icons found on the iconify path.
+    List the directories on the iconify path again if they've been modified
+    since they were listed.
 
     Returns
     -------
     List[str]
+        The directories that were listed again.
+    """
+    roots = []  # type: List[str]
+    for root in _ICON_PATH:
+        listing = _rootListings.get(root)
+        if listing is None:
+            continue
+        try:
+            mtime = statIcon(root).st_mtime
+        except OSError:
+            mtime = -1.0
+        if listing[0] != mtime:
+            _listRoot(root, mtime)
+            roots.append(root)
+    return roots
+
+
+def _listRoot(root, mtime=None):
+    # type: (str, Optional[float]) -> Tuple[float, Set[str], Set[str]]
+    """
+    List the provided directory on the iconify path into its cached listing.
+
+    Parameters
+    ----------
+    root : str
+    mtime : Optional[float]
+        The mtime of the directory, when it's already known.
+
+    Returns
+    -------
+    Tuple[float, Set[str], Set[str]]
+    """
+    if mtime is None:
+        try:
+            mtime = statIcon(root).st_mtime
+        except OSError:
+            mtime = -1.0
+    mtime, filenames, dirnames = _scanDirectory(root, mtime)
+    listing = _rootListings[root] = (mtime, set(filenames), set(dirnames))
+    return listing
+
+
+def _trigrams(text):
+    # type: (str) -> List[str]
+    """
+    Return the runs of three characters in the provided text.
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    -------
+    List[str]
+    """
+    return [text[index:index + 3] for index in range(len(text) - 2)]
+
+
+def _tierRanks(tiers):
+    # type: (List[Set[int]]) -> Dict[int, int]
+    """
+    Map the indexes in the provided tiers to the position of their tier.
+
+    Parameters
+    ----------
+    tiers : List[Set[int]]
+
+    Returns
+    -------
+    Dict[int, int]
     """
-    matches = []  # type: List[str]
-    for dir_ in _ICON_PATH:
-        for root, dirnames, filenames in os.walk(dir_):
-            for filename in fnmatch.filter(filenames, '*.svg'):
-                filePath = os.path.join(root, filename)
-                filePath = filePath.replace(dir_, "")
-                filePath, _ = os.path.splitext(filePath)
-                filePath = filePath.lstrip(os.sep).replace(os.sep, ":")
-                matches.append(str(filePath))
-    return matches
+    ranks = {}  # type: Dict[int, int]
+    for rank, tier in enumerate(tiers):
+        ranks.update(dict.fromkeys(tier, rank))
+    return ranks
@@ -0,0 +1,301 @@
+"""
+Coalesced repainting of the widgets that display animated icons
+"""
+
+import functools
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from iconify.qt import QtCore
+
+if TYPE_CHECKING:
+    from typing import Callable, Set, Tuple, Union
+
+    from iconify.anim import BaseAnimation
+    from iconify.qt import QtWidgets
+    RectCallable = Callable[[QtWidgets.QWidget], QtCore.QRect]
+    RepaintRect = Union[None, QtCore.QRect, RectCallable]
+    DirtyEntry = Tuple[weakref.ReferenceType, Optional[QtCore.QRect]]
+
+
+class RepaintScheduler(QtCore.QObject):
+    """
+    A singleton which repaints the widgets that display animations.
+
+    Widgets are registered with the animations they display, and are marked
+    dirty when the frame of one of those animations changes. Every animation
+    ticked by the GlobalTick is ticked in the same pass of the event loop, so
+    the dirty widgets are updated once that pass is complete, with one update
+    per widget limited to the area of it's icons.
+
+    Widgets that aren't visible, e.g. on a hidden tab, in a minimized window
+    or scrolled out of view, aren't updated. When pausing hidden animations
+    is enabled, an animation none of whose widgets are visible is suspended,
+    so it stops ticking and no new frames are rendered, until one of them is
+    shown or painted again.
+    """
+
+    _instance = None  # type: Optional[RepaintScheduler]
+
+    def __init__(self):
+        # type: () -> None
+        # Note: No parent so it's owned by Qt
+        super(RepaintScheduler, self).__init__()
+        # Maps animations to {widget id: (widget ref, rect)} dicts
+        self._targets = {}  # type: Dict[BaseAnimation, Dict[int, Any]]
+        # Maps widget ids to (widget ref, rect to update) tuples
+        self._dirty = {}  # type: Dict[int, DirtyEntry]
+        self._widgets = set()  # type: Set[int]
+        # The animations that have been suspended by the scheduler
+        self._suspended = set()  # type: Set[BaseAnimation]
+        self._pauseHidden = False
+        self._flushScheduled = False
+        self._requests = 0
+        self._updates = 0
+        self._suppressed = 0
+
+    @classmethod
+    def instance(cls):
+        # type: () -> RepaintScheduler
+        """
+        Return the global instance of the scheduler.
+
+        Returns
+        -------
+        RepaintScheduler
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register(self, anim, widget, rect=None):
+        # type: (BaseAnimation, QtWidgets.QWidget, RepaintRect) -> None
+        """
+        Repaint the provided widget whenever the frame of the provided
+        animation changes.
+
+        Parameters
+        ----------
+        anim : BaseAnimation
+        widget : QtWidgets.QWidget
+        rect : RepaintRect
+            The area of the widget to repaint, or a callable which returns it
+            for the widget when it's repainted. When None, the whole widget
+            is repainted.
+        """
+        targets = self._targets.get(anim)
+        if targets is None:
+            targets = self._targets[anim] = {}
+            anim.tick.connect(self._onTick)
+
+        widgetId = id(widget)
+        targets[widgetId] = (weakref.ref(widget), rect)
+
+        if widgetId not in self._widgets:
+            self._widgets.add(widgetId)
+            widget.installEventFilter(self)
+            widget.destroyed.connect(
+                functools.partial(self._removeWidget, widgetId)
+            )
+
+    def unregister(self, anim, widget=None):
+        # type: (BaseAnimation, Optional[QtWidgets.QWidget]) -> None
+        """
+        Stop repainting the provided widget when the frame of the provided
+        animation changes.
+
+        Parameters
+        ----------
+        anim : BaseAnimation
+        widget : Optional[QtWidgets.QWidget]
+            When None, no widgets are repainted for the animation.
+        """
+        targets = self._targets.get(anim)
+        if targets is None:
+            return
+
+        if widget is not None:
+            targets.pop(id(widget), None)
+
+        if widget is None or not targets:
+            del self._targets[anim]
+            anim.tick.disconnect(self._onTick)
+            self._resume(anim)
+
+    def pauseHidden(self):
+        # type: () -> bool
+        """
+        Indicate if animations are suspended while none of their widgets
+        are visible.
+
+        Returns
+        -------
+        bool
+        """
+        return self._pauseHidden
+
+    def setPauseHidden(self, pauseHidden):
+        # type: (bool) -> None
+        """
+        Set whether animations are suspended while none of their widgets
+        are visible. This is disabled by default.
+
+        Suspending an animation stops it for every consumer, so this should
+        only be enabled when every widget that displays an animation is
+        registered with the scheduler, including those using it through
+        `anim.tick.connect`.
+
+        Parameters
+        ----------
+        pauseHidden : bool
+        """
+        self._pauseHidden = pauseHidden
+        if not pauseHidden:
+            for anim in list(self._suspended):
+                self._resume(anim)
+
+    def markDirty(self, widget, rect=None):
+        # type: (QtWidgets.QWidget, Optional[QtCore.QRect]) -> None
+        """
+        Schedule an update of the provided area of the widget, which is
+        merged with any other updates scheduled for it.
+
+        Parameters
+        ----------
+        widget : QtWidgets.QWidget
+        rect : Optional[QtCore.QRect]
+            When None, the whole widget is updated.
+        """
+        self._requests += 1
+
+        widgetId = id(widget)
+        entry = self._dirty.get(widgetId)
+        if entry is not None:
+            if entry[1] is None or rect is None:
+                rect = None
+            else:
+                rect = entry[1].united(rect)
+            self._dirty[widgetId] = (entry[0], rect)
+        else:
+            self._dirty[widgetId] = (weakref.ref(widget), rect)
+
+        if not self._flushScheduled:
+            self._flushScheduled = True
+            QtCore.QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        # type: () -> None
+        """
+        Update the widgets that have been marked dirty.
+        """
+        self._flushScheduled = False
+        dirty = self._dirty
+        self._dirty = {}
+
+        for widgetRef, rect in dirty.values():
+            widget = widgetRef()
+            if widget is None:
+                continue
+            if rect is None:
+                widget.update()
+            else:
+                widget.update(rect)
+            self._updates += 1
+
+    def stats(self):
+        # type: () -> Dict[str, int]
+        """
+        Return counters describing the work done by the scheduler.
+
+        `animations` is the number of animations with registered widgets,
+        `requests` is the number of times a widget was marked dirty,
+        `updates` is the number of updates issued to widgets,
+        `suspendedAnimations` is the number of animations suspended as their
+        widgets are hidden and `suppressedRenders` is the number of frames
+        that weren't drawn because a widget wasn't visible.
+
+        Returns
+        -------
+        Dict[str, int]
+        """
+        return {
+            'animations': len(self._targets),
+            'requests': self._requests,
+            'updates': self._updates,
+            'suspendedAnimations': len(self._suspended),
+            'suppressedRenders': self._suppressed,
+        }
+
+    def eventFilter(self, watched, event):
+        # type: (QtCore.QObject, QtCore.QEvent) -> bool
+        """
+        Resume the suspended animations of widgets that are shown or painted,
+        which includes widgets that are scrolled back into view.
+        """
+        if self._suspended and event.type() in (
+            QtCore.QEvent.Show,
+            QtCore.QEvent.Paint,
+        ):
+            widgetId = id(watched)
+            for anim in list(self._suspended):
+                if widgetId in self._targets.get(anim, ()):
+                    self._resume(anim)
+        return False
+
+    def _onTick(self):
+        # type: () -> None
+        anim = self.sender()
+        targets = self._targets.get(anim)
+        if not targets:
+            return
+
+        visible = False
+        for widgetRef, rect in list(targets.values()):
+            widget = widgetRef()
+            if widget is None:
+                continue
+            if not _isVisible(widget):
+                self._suppressed += 1
+                continue
+            visible = True
+            if callable(rect):
+                rect = rect(widget)
+            if rect is None or not rect.isEmpty():
+                self.markDirty(widget, rect)
+
+        if not visible and self._pauseHidden:
+            self._suspended.add(anim)
+            anim.setSuspended(True)
+
+    def _resume(self, anim):
+        # type: (BaseAnimation) -> None
+        if anim in self._suspended:
+            self._suspended.discard(anim)
+            anim.setSuspended(False)
+
+    def _removeWidget(self, widgetId, *args):
+        # type: (int, *Any) -> None
+        self._widgets.discard(widgetId)
+        self._dirty.pop(widgetId, None)
+        for anim, targets in list(self._targets.items()):
+            targets.pop(widgetId, None)
+            if not targets:
+                self.unregister(anim)
+
+
+def _isVisible(widget):
+    # type: (QtWidgets.QWidget) -> bool
+    """
+    Indicate if any part of the provided widget can be seen on screen.
+
+    Parameters
+    ----------
+    widget : QtWidgets.QWidget
+
+    Returns
+    -------
+    bool
+    """
+    return widget.isVisible() and \
+        not widget.window().isMinimized() and \
+        not widget.visibleRegion().isEmpty()
@@ -0,0 +1,140 @@
+"""
+Support for animated icons in Qt's model / view framework
+"""
+
+import functools
+from typing import TYPE_CHECKING, Dict, List
+
+from iconify.core import Icon
+from iconify.qt import QtCore, QtGui, QtWidgets
+from iconify.repaint import RepaintScheduler
+
+if TYPE_CHECKING:
+    from typing import Optional, Tuple
+
+    from iconify.anim import BaseAnimation
+    IndexKey = Tuple[int, int, int]
+    IndexMap = Dict[IndexKey, QtCore.QPersistentModelIndex]
+
+
+class AnimatedIconDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    An item delegate that repaints the indexes whose DecorationRole is an
+    animated iconify icon when their animations tick, rather than the whole
+    viewport of the view.
+
+    Indexes are tracked when they're painted, which only happens while
+    they're visible, and are forgotten once they're scrolled out of view or
+    removed from the model. So the work done on each tick depends on the
+    number of visible animated icons, not the number of rows in the model.
+
+    The repaints are issued through the RepaintScheduler, so every animation
+    that ticks at the same time results in a single update of the viewport.
+    """
+
+    def __init__(self, view):
+        # type: (QtWidgets.QAbstractItemView) -> None
+        super(AnimatedIconDelegate, self).__init__(parent=view)
+        self._view = view
+        # Maps animations to the indexes painted with them
+        self._indexes = {}  # type: Dict[BaseAnimation, IndexMap]
+
+    def paint(
+        self,
+        painter,  # type: QtGui.QPainter
+        option,  # type: QtWidgets.QStyleOptionViewItem
+        index,  # type: QtCore.QModelIndex
+    ):
+        # type: (...) -> None
+        super(AnimatedIconDelegate, self).paint(painter, option, index)
+
+        anims = Icon.animations(index.data(QtCore.Qt.DecorationRole))
+        if not anims:
+            return
+
+        key = (index.row(), index.column(), index.internalId())
+        for anim in anims:
+            indexes = self._indexes.get(anim)
+            if indexes is None:
+                indexes = self._indexes[anim] = {}
+                RepaintScheduler.instance().register(
+                    anim,
+                    self._view.viewport(),
+                    functools.partial(self._animRect, anim),
+                )
+            if key not in indexes:
+                indexes[key] = QtCore.QPersistentModelIndex(index)
+
+    def animatedIndexes(self):
+        # type: () -> List[QtCore.QModelIndex]
+        """
+        Return the indexes with animated icons that are currently tracked.
+
+        Returns
+        -------
+        List[QtCore.QModelIndex]
+        """
+        found = {}  # type: Dict[IndexKey, QtCore.QModelIndex]
+        for indexes in self._indexes.values():
+            for key, persistentIndex in indexes.items():
+                index = _modelIndex(persistentIndex)
+                if index is not None:
+                    found[key] = index
+        return [found[key] for key in sorted(found)]
+
+    def _animRect(self, anim, viewport):
+        # type: (BaseAnimation, QtWidgets.QWidget) -> QtCore.QRect
+        """
+        Return the area of the viewport covered by the indexes painted with
+        the provided animation, forgetting those that are no longer visible.
+
+        Parameters
+        ----------
+        anim : BaseAnimation
+        viewport : QtWidgets.QWidget
+
+        Returns
+        -------
+        QtCore.QRect
+        """
+        indexes = self._indexes.get(anim, {})
+        viewportRect = viewport.rect()
+        rect = QtCore.QRect()
+
+        for key, persistentIndex in list(indexes.items()):
+            index = _modelIndex(persistentIndex)
+            if index is not None:
+                indexRect = self._view.visualRect(index)
+                if indexRect.intersects(viewportRect):
+                    rect = rect.united(indexRect)
+                    continue
+            del indexes[key]
+
+        if not indexes:
+            self._indexes.pop(anim, None)
+            RepaintScheduler.instance().unregister(anim, viewport)
+
+        return rect
+
+
+def _modelIndex(persistentIndex):
+    # type: (QtCore.QPersistentModelIndex) -> Optional[QtCore.QModelIndex]
+    """
+    Return the model index identified by the provided persistent index, or
+    None if it's no longer valid.
+
+    Parameters
+    ----------
+    persistentIndex : QtCore.QPersistentModelIndex
+
+    Returns
+    -------
+    Optional[QtCore.QModelIndex]
+    """
+    if not persistentIndex.isValid():
+        return None
+    return persistentIndex.model().index(
+        persistentIndex.row(),
+        persistentIndex.column(),
+        persistentIndex.parent(),
+    )
@@ -0,0 +1,277 @@
+"""
+Invalidation of cached icons when the svg files on the iconify path change
+"""
+
+import fnmatch
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import iconify.path
+from iconify.core import PixmapGenerator
+from iconify.qt import QtCore
+
+if TYPE_CHECKING:
+    from typing import Set, Tuple
+    # The svg file names and sub directory names of a directory
+    Listing = Tuple[Set[str], Set[str]]
+
+
+class IconWatcher(QtCore.QObject):
+    """
+    A singleton which watches the directories on the iconify path, and the
+    svg files that have been found on it, for changes.
+
+    When an svg file is added, edited or removed, only the results of
+    findIcon, the shared renderers and the cached images affected by that
+    file are discarded, and the PixmapGenerators using it are repainted.
+
+    Watching is disabled by default. It uses QFileSystemWatcher, which is
+    backed by inotify on linux.
+    """
+
+    # Emitted with the location of each svg file that's added, edited or
+    # removed while watching is enabled.
+    iconChanged = QtCore.Signal(str)
+
+    _instance = None  # type: Optional[IconWatcher]
+
+    def __init__(self):
+        # type: () -> None
+        # Note: No parent so it's owned by Qt
+        super(IconWatcher, self).__init__()
+        self._watcher = QtCore.QFileSystemWatcher()
+        self._watcher.fileChanged.connect(self._onFileChanged)
+        self._watcher.directoryChanged.connect(self._onDirectoryChanged)
+        # Maps watched directories to their contents when they were last seen
+        self._listings = {}  # type: Dict[str, Listing]
+        self._enabled = False
+
+    @classmethod
+    def instance(cls):
+        # type: () -> IconWatcher
+        """
+        Return the global instance of the watcher.
+
+        Returns
+        -------
+        IconWatcher
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def enabled(self):
+        # type: () -> bool
+        """
+        Indicate if the iconify path is being watched.
+
+        Returns
+        -------
+        bool
+        """
+        return self._enabled
+
+    def setEnabled(self, enabled):
+        # type: (bool) -> None
+        """
+        Start or stop watching the directories on the iconify path, including
+        those added with `path.addIconDirectory`, and the svg files found on
+        it with `path.findIcon`.
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        if enabled == self._enabled:
+            return
+        self._enabled = enabled
+
+        if enabled:
+            iconify.path._directoryHooks.append(self.watchDirectory)
+            iconify.path._iconHooks.append(self.watchFile)
+            for directory in iconify.path._ICON_PATH:
+                self.watchDirectory(directory)
+            for filePath in set(iconify.path._foundIcons.values()):
+                self.watchFile(filePath)
+        else:
+            iconify.path._directoryHooks.remove(self.watchDirectory)
+            iconify.path._iconHooks.remove(self.watchFile)
+            for paths in (self._watcher.files(), self._watcher.directories()):
+                if paths:
+                    self._watcher.removePaths(paths)
+            self._listings.clear()
+
+    def watchDirectory(self, directory):
+        # type: (str) -> None
+        """
+        Watch the provided directory, and every directory under it, for svg
+        files being added or removed.
+
+        Parameters
+        ----------
+        directory : str
+        """
+        directory = os.path.normpath(directory)
+        if directory in self._listings or not os.path.isdir(directory):
+            return
+
+        listing = _listDirectory(directory)
+        self._listings[directory] = listing
+        self._watcher.addPath(directory)
+
+        for dirname in listing[1]:
+            self.watchDirectory(os.path.join(directory, dirname))
+
+    def watchFile(self, filePath):
+        # type: (str) -> None
+        """
+        Watch the provided svg file for being edited.
+
+        Parameters
+        ----------
+        filePath : str
+        """
+        if os.path.isfile(filePath):
+            self._watcher.addPath(os.path.normpath(filePath))
+
+    def directories(self):
+        # type: () -> List[str]
+        """
+        Return the directories that are being watched.
+
+        Returns
+        -------
+        List[str]
+        """
+        return sorted(self._watcher.directories())
+
+    def files(self):
+        # type: () -> List[str]
+        """
+        Return the svg files that are being watched.
+
+        Returns
+        -------
+        List[str]
+        """
+        return sorted(self._watcher.files())
+
+    def _invalidate(self, filePaths):
+        # type: (List[str]) -> None
+        """
+        Discard everything cached for the provided svg files, in a single
+        pass over the caches and PixmapGenerators for all of them.
+
+        Parameters
+        ----------
+        filePaths : List[str]
+        """
+        if not filePaths:
+            return
+        iconify.path.invalidateIcons(filePaths)
+        PixmapGenerator.invalidateIcons(filePaths)
+        for filePath in filePaths:
+            self.iconChanged.emit(filePath)
+
+    def _onFileChanged(self, filePath):
+        # type: (str) -> None
+        # Files that are replaced, rather than modified, are no longer
+        # watched so they're watched again.
+        if os.path.isfile(filePath) and \
+                filePath not in self._watcher.files():
+            self._watcher.addPath(filePath)
+        self._invalidate([filePath])
+
+    def _onDirectoryChanged(self, directory):
+        # type: (str) -> None
+        oldFiles, oldDirs = self._listings.pop(directory, (set(), set()))
+        if os.path.isdir(directory):
+            newFiles, newDirs = _listDirectory(directory)
+            self._listings[directory] = (newFiles, newDirs)
+        else:
+            newFiles, newDirs = set(), set()
+
+        filePaths = []  # type: List[str]
+        for dirname in newDirs - oldDirs:
+            subDirectory = os.path.join(directory, dirname)
+            self.watchDirectory(subDirectory)
+            filePaths.extend(_walkIcons(subDirectory))
+
+        for dirname in oldDirs - newDirs:
+            filePaths.extend(
+                self._unwatchDirectory(os.path.join(directory, dirname))
+            )
+
+        for filename in newFiles ^ oldFiles:
+            filePaths.append(os.path.join(directory, filename))
+
+        self._invalidate(filePaths)
+
+    def _unwatchDirectory(self, directory):
+        # type: (str) -> List[str]
+        """
+        Stop watching the provided directory, which has been removed.
+
+        Parameters
+        ----------
+        directory : str
+
+        Returns
+        -------
+        List[str]
+            The svg files the directory held, whose cached results must be
+            discarded.
+        """
+        listing = self._listings.pop(directory, None)
+        if listing is None:
+            return []
+
+        if directory in self._watcher.directories():
+            self._watcher.removePath(directory)
+
+        filePaths = []  # type: List[str]
+        for dirname in listing[1]:
+            filePaths.extend(
+                self._unwatchDirectory(os.path.join(directory, dirname))
+            )
+        for filename in listing[0]:
+            filePaths.append(os.path.join(directory, filename))
+        return filePaths
+
+
+def _listDirectory(directory):
+    # type: (str) -> Listing
+    """
+    Return the svg file names and sub directory names of the provided
+    directory.
+
+    Parameters
+    ----------
+    directory : str
+
+    Returns
+    -------
+    Listing
+    """
+    _, filenames, dirnames = iconify.path._scanDirectory(directory, 0.0)
+    return set(filenames), set(dirnames)
+
+
+def _walkIcons(directory):
+    # type: (str) -> List[str]
+    """
+    Return the svg files found under the provided directory.
+
+    Parameters
+    ----------
+    directory : str
+
+    Returns
+    -------
+    List[str]
+    """
+    filePaths = []  # type: List[str]
+    for root, _, filenames in os.walk(directory):
+        for filename in fnmatch.filter(filenames, '*.svg'):
+            filePaths.append(os.path.join(root, filename))
+    return filePaths
@@ -40,7 +40,9 @@ setup(
     ],
     entry_points={
         'console_scripts': [
+            'iconify-bake=iconify.pack:run',
             'iconify-browser=iconify.browser:run',
+            'iconify-export=iconify.export:run',
             'iconify-fetch=iconify.fetch:fetch',
             'iconify-fetch-font-awesome=iconify.fetch:FontAwesome.fetch',
             'iconify-fetch-material-design=iconify.fetch:MaterialDesign.fetch',
@@ -7,6 +7,17 @@ import iconify.path
 import tempfile
 
 
+@pytest.fixture(autouse=True)
+def tmpIconIndex(monkeypatch, tmpdir):
+    """
+    Keep the icon index written by tests out of the user's ~/.iconify.
+    """
+    indexPath = str(tmpdir.join('index.json'))
+    monkeypatch.setattr(
+        iconify.path, '_iconIndex', iconify.path.IconIndex(indexPath)
+    )
+
+
 @pytest.fixture
 def validIconPath(monkeypatch):
     iconDir = os.path.join(os.path.dirname(__file__), "fixtures", "icons")
@@ -75,4 +75,175 @@ def test_concatAnim():
     frameC = anim.frame()
 
     # assert frameB != frameC
-    # assert anim.active() is False
\ No newline at end of file
+    # assert anim.active() is False
+
+
+def test_fingerprint():
+    Spin = iconify.anim.Spin
+
+    assert Spin().fingerprint() == Spin().fingerprint()
+    assert hash(Spin().fingerprint()) == hash(Spin().fingerprint())
+    assert Spin().fingerprint() != Spin(rpm=30).fingerprint()
+    assert Spin().fingerprint() != Spin(
+        direction=Spin.Directions.ANTI_CLOCKWISE
+    ).fingerprint()
+    assert Spin().fingerprint() != iconify.anim.SingleShotSpin().fingerprint()
+
+    Scroll = iconify.anim.Scroll
+    assert Scroll().fingerprint() == Scroll().fingerprint()
+    assert Scroll().fingerprint() != Scroll(
+        direction=Scroll.Directions.UP
+    ).fingerprint()
+
+    concatA = Spin() + iconify.anim.Breathe()
+    concatB = Spin() + iconify.anim.Breathe()
+    concatC = Spin(rpm=30) + iconify.anim.Breathe()
+    assert concatA.fingerprint() == concatB.fingerprint()
+    assert concatA.fingerprint() != concatC.fingerprint()
+
+    # The fingerprint is built once, until the parameters change
+    assert concatA.fingerprint() is concatA.fingerprint()
+    concatA.setAnimations((Spin(rpm=30), iconify.anim.Breathe()))
+    assert concatA.fingerprint() == concatC.fingerprint()
+
+
+def test_globalTick(qtbot):
+    GlobalTick = iconify.anim.GlobalTick
+    tick = GlobalTick.instance()
+    assert tick is GlobalTick.instance()
+    initCount = tick.subscriberCount()
+
+    anim = iconify.anim.Spin()
+    anim.start()
+    assert tick.subscriberCount() == initCount + 1
+    assert tick.isActive()
+    assert tick.interval() == 17
+
+    anim.setFps(100)
+    assert tick.interval() == 10
+
+    initFrame = anim.frame()
+    qtbot.waitUntil(lambda: anim.frame() != initFrame)
+
+    anim.pause()
+    assert tick.subscriberCount() == initCount
+    if not initCount:
+        assert not tick.isActive()
+
+    calls = []
+
+    def callback():
+        calls.append(1)
+
+    GlobalTick.setDefaultFps(30)
+    try:
+        tick.subscribe(callback)
+        assert tick.interval() == 33
+        qtbot.waitUntil(lambda: len(calls) > 0)
+    finally:
+        GlobalTick.setDefaultFps(60)
+        tick.unsubscribe(callback)
+    assert tick.subscriberCount() == initCount
+
+
+def test_timeBasedAnim(qtbot):
+    tick = iconify.anim.GlobalTick.instance()
+
+    anim = iconify.anim.Spin()
+    assert not anim.timeBased()
+    anim.setTimeBased(True)
+    assert anim.timeBased()
+
+    ticks = []
+    anim.tick.connect(lambda: ticks.append(anim.frame()))
+
+    anim.start()
+    try:
+        # Half a second at 60 frames per second
+        anim._startTime = tick.elapsed() - 500
+        anim._tick()
+        assert anim.frame() == 30
+        assert ticks == [30]
+
+        # Ticks that don't change the frame aren't emitted
+        anim._tick()
+        assert ticks == [30]
+
+        anim.setMaxDistinctFrames(6)
+        anim._startTime = tick.elapsed() - 250
+        anim._tick()
+        assert anim.frame() == 11
+        assert ticks == [30, 11]
+
+        # Pausing and starting again continues from the current frame
+        anim.pause()
+        anim.start()
+        anim._tick()
+        assert anim.frame() == 11
+    finally:
+        anim.stop()
+
+    singleShot = iconify.anim.SingleShotSpin()
+    singleShot.setTimeBased(True)
+    singleShot.start()
+    singleShot._startTime = tick.elapsed() - 5000
+    singleShot._tick()
+    assert not singleShot.active()
+    assert singleShot.frame() == singleShot.minFrame()
+
+
+def test_concatAnimPeriod():
+    anim = iconify.anim.Spin() + iconify.anim.Scroll()
+    assert anim.frameCount() == 61
+    assert anim.childFrames(10) == (10, 10)
+
+    anim = iconify.anim.Spin(rpm=120) + iconify.anim.Spin(rpm=240)
+    assert anim.frameCount() == 31 * 16
+    assert anim.childFrames(40) == (9, 8)
+
+    # The lowest common multiple of 61 and 101 frames is too long, so the
+    # period is capped to whole cycles of the longest child.
+    anim = iconify.anim.Spin() + iconify.anim.Breathe()
+    assert anim.frameCount() == 1010
+    assert anim.childFrames(0) == (0, 0)
+    assert anim.childFrames(101) == (42, 0)
+
+    for _ in range(anim.frameCount()):
+        anim.forceTick()
+    assert anim.frame() == anim.minFrame()
+
+
+def test_frameTransforms():
+    size = iconify.qt.QtCore.QSize(16, 16)
+    anim = iconify.anim.Spin()
+    transforms = anim.frameTransforms(size)
+    assert len(transforms) == anim.frameCount()
+    assert anim.frameTransform(size, 15) == transforms[15]
+
+    # A quarter turn about the center of the image
+    point = transforms[15].map(iconify.qt.QtCore.QPointF(8, 0))
+    assert abs(point.x() - 14.4) < 1e-6
+    assert abs(point.y() - 8) < 1e-6
+
+    # Animations with the same parameters share their tables
+    assert iconify.anim.Spin().frameTransforms(size) is transforms
+    assert iconify.anim.Spin(rpm=120).frameTransforms(size) is not transforms
+
+    # The shared tables are bounded, but animations keep their own tables
+    tables = iconify.anim.BaseAnimation._transformTables
+    initMaxCost = tables.maxCost()
+    try:
+        tables.setMaxCost(anim.frameCount())
+        iconify.anim.Spin().frameTransforms(iconify.qt.QtCore.QSize(8, 8))
+        assert tables.count() == 1
+        assert tables.totalCost() <= anim.frameCount()
+        assert iconify.anim.Spin().frameTransforms(size) is not transforms
+        assert anim.frameTransforms(size) is transforms
+    finally:
+        tables.setMaxCost(initMaxCost)
+
+    concat = iconify.anim.Spin() + iconify.anim.Breathe()
+    spinFrame, breatheFrame = concat.childFrames(20)
+    expected = iconify.anim.Breathe().frameTransform(size, breatheFrame) * \
+        anim.frameTransform(size, spinFrame)
+    assert concat.frameTransform(size, 20) == expected
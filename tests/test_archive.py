@@ -0,0 +1,94 @@
+import os
+import zipfile
+
+import iconify
+from iconify.qt import QtCore
+
+
+def _writeArchive(archivePath, compression):
+    iconDir = os.path.join(os.path.dirname(__file__), "fixtures", "icons")
+    with zipfile.ZipFile(archivePath, 'w', compression) as zipData:
+        for root, _, filenames in os.walk(iconDir):
+            for filename in filenames:
+                filePath = os.path.join(root, filename)
+                member = os.path.relpath(filePath, iconDir)
+                zipData.write(filePath, 'pack/' + member.replace(os.sep, '/'))
+        zipData.writestr('pack/README.md', 'Not an icon')
+    return iconDir
+
+
+def test_iconArchive(tmpdir):
+    for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        archivePath = str(tmpdir.join('icons{}.zip'.format(compression)))
+        iconDir = _writeArchive(archivePath, compression)
+
+        archive = iconify.archive.IconArchive(archivePath)
+        assert archive.listDirectory('') == ([], ['pack'])
+        assert archive.listDirectory('pack') == (
+            ['delete.svg', 'duotone.svg'],
+            ['spinners'],
+        )
+        assert archive.listDirectory('invalid') == ([], [])
+        assert archive.contains('pack/spinners/dots.svg')
+        assert not archive.contains('pack/README.md')
+
+        with open(os.path.join(iconDir, 'spinners', 'dots.svg'), 'rb') as f:
+            assert archive.read('pack/spinners/dots.svg') == f.read()
+
+
+def test_splitArchivePath(tmpdir):
+    archivePath = str(tmpdir.join('icons.zip'))
+    _writeArchive(archivePath, zipfile.ZIP_DEFLATED)
+
+    svgPath = os.path.join(archivePath, 'pack', 'delete.svg')
+    assert iconify.archive.splitArchivePath(svgPath) == \
+        (archivePath, 'pack/delete.svg')
+    assert iconify.archive.splitArchivePath(archivePath) == (archivePath, '')
+    assert iconify.archive.splitArchivePath(str(tmpdir)) is None
+    # Only files are archives
+    assert iconify.archive.splitArchivePath(
+        os.path.join(str(tmpdir.mkdir('other.zip')), 'delete.svg')
+    ) is None
+
+
+def test_archiveIconPath(qtbot, monkeypatch, tmpdir):
+    archivePath = str(tmpdir.join('icons.zip'))
+    iconDir = _writeArchive(archivePath, zipfile.ZIP_DEFLATED)
+    root = os.path.join(archivePath, 'pack')
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [root])
+    monkeypatch.setattr(iconify.path, '_iconIndex', None)
+    iconify.path.findIcon.cache_clear()
+
+    try:
+        assert sorted(iconify.path.listIcons()) == [
+            'delete',
+            'duotone',
+            'spinners:colored',
+            'spinners:dots',
+        ]
+
+        svgPath = iconify.path.findIcon('spinners:dots')
+        assert svgPath == os.path.join(root, 'spinners', 'dots.svg')
+        assert iconify.path.findIcons(['delete', 'invalid']) == {
+            'delete': os.path.join(root, 'delete.svg'),
+        }
+
+        with open(os.path.join(iconDir, 'spinners', 'dots.svg'), 'rb') as f:
+            assert iconify.path.readIcon(svgPath) == f.read()
+
+        # Icons in archives are rendered the same as extracted icons
+        renderer = iconify.cache.RendererCache.parse(svgPath)
+        assert renderer.isValid()
+        extracted = iconify.cache.RendererCache.parse(
+            os.path.join(iconDir, 'spinners', 'dots.svg')
+        )
+        assert renderer.defaultSize() == extracted.defaultSize()
+
+        size = QtCore.QSize(32, 32)
+        icon = iconify.Icon('spinners:dots')
+        image = icon.pixmap(size).toImage()
+        monkeypatch.setattr(iconify.path, '_ICON_PATH', [iconDir])
+        iconify.path.findIcon.cache_clear()
+        assert image == iconify.Icon('spinners:dots').pixmap(size).toImage()
+    finally:
+        iconify.path.findIcon.cache_clear()
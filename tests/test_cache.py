@@ -0,0 +1,165 @@
+
+import iconify
+from iconify.qt import QtCore, QtGui
+
+
+def test_pixmapCacheEviction(qtbot):
+    size = QtCore.QSize(16, 16)
+    pixmap = QtGui.QPixmap(size)
+    cost = iconify.cache.imageCost(pixmap)
+    assert cost == 16 * 16 * pixmap.depth() // 8
+
+    cache = iconify.cache.PixmapCache(maxCost=cost * 2)
+    cache.insert('a', pixmap)
+    cache.insert('b', pixmap)
+    assert cache.count() == 2
+    assert cache.totalCost() == cost * 2
+
+    # Touch 'a' so that 'b' is the least recently used entry.
+    assert cache.get('a') is pixmap
+
+    cache.insert('c', pixmap)
+    assert cache.count() == 2
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert cache.get('b') is None
+
+    # Entries larger than the budget are never stored.
+    assert not cache.insert('d', QtGui.QPixmap(QtCore.QSize(64, 64)))
+    assert 'd' not in cache
+    assert cache.totalCost() == cost * 2
+
+
+def test_pixmapCacheTrim(qtbot):
+    cache = iconify.cache.PixmapCache(maxCost=100)
+    for i in range(10):
+        cache.insert(i, str(i), cost=10)
+    assert cache.totalCost() == 100
+
+    cache.trim(35)
+    assert cache.count() == 3
+    assert cache.totalCost() == 30
+    assert list(range(7, 10)) == [i for i in range(10) if i in cache]
+
+    cache.setMaxCost(10)
+    assert cache.count() == 1
+    assert 9 in cache
+
+    cache.remove(9)
+    assert cache.totalCost() == 0
+
+    cache.insert('a', 'a', cost=5)
+    cache.clear()
+    assert cache.count() == 0
+    assert cache.totalCost() == 0
+
+
+def test_rendererCache(qtbot, validIconPath, tmpdir):
+    rendererCache = iconify.cache.RendererCache()
+
+    path = iconify.path.findIcon('delete')
+    rendererA = rendererCache.renderer(path)
+    rendererB = rendererCache.renderer(path)
+    assert rendererA is rendererB
+    assert rendererCache.count() == 1
+
+    # Renderers are released once they are no longer used.
+    del rendererA, rendererB
+    assert rendererCache.count() == 0
+
+    # Editing a file results in a new renderer.
+    svgFile = tmpdir.join('edited.svg')
+    with open(path) as f:
+        svgFile.write(f.read())
+
+    rendererA = rendererCache.renderer(str(svgFile))
+    svgFile.write('\n', mode='a')
+    rendererB = rendererCache.renderer(str(svgFile))
+    assert rendererA is not rendererB
+
+
+def test_pixmapGeneratorSharesRenderers(qtbot, validIconPath):
+    pixGenA = iconify.PixmapGenerator('delete')
+    pixGenB = iconify.PixmapGenerator('delete', color=QtGui.QColor('red'))
+    assert pixGenA.renderer() is pixGenB.renderer()
+
+
+def test_diskCache(qtbot, tmpdir):
+    path = str(tmpdir.join('cache', 'pixmaps.bin'))
+
+    image = QtGui.QImage(8, 4, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtGui.QColor(255, 0, 0, 128))
+
+    writer = iconify.cache.DiskCache(path)
+    assert writer.get(('a', 8, 4)) is None
+    assert writer.insert(('a', 8, 4), image)
+
+    # A second cache, e.g. in another process, sees the same images.
+    reader = iconify.cache.DiskCache(path)
+    assert reader.count() == 1
+    assert reader.get(('a', 8, 4)) == image
+    assert reader.get(('b', 8, 4)) is None
+
+    writer.insert(('b', 8, 4), image)
+    assert reader.get(('b', 8, 4)) == image
+    assert reader.count() == 2
+
+    # Files from another version of the format are ignored and replaced.
+    with open(path, 'r+b') as f:
+        f.write(b'OLDMAGIC')
+    assert iconify.cache.DiskCache(path).count() == 0
+    assert writer.insert(('c', 8, 4), image)
+    assert iconify.cache.DiskCache(path).count() == 1
+
+    reader.clear()
+    assert reader.count() == 0
+    reader.close()
+    writer.close()
+
+
+def test_diskCacheMaxSize(qtbot, tmpdir):
+    path = str(tmpdir.join('pixmaps.bin'))
+
+    image = QtGui.QImage(8, 8, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtGui.QColor('blue'))
+
+    cache = iconify.cache.DiskCache(path, maxSize=600)
+    assert cache.insert((1, ), image)
+    assert cache.insert((2, ), image)
+    assert cache.count() == 2
+
+    # Exceeding the cap starts the file again.
+    assert cache.insert((3, ), image)
+    assert cache.size() <= cache.maxSize()
+    assert cache.count() == 1
+    assert cache.get((3, )) == image
+
+    # Images that can never fit aren't written.
+    largeImage = QtGui.QImage(64, 64, QtGui.QImage.Format_ARGB32_Premultiplied)
+    assert not cache.insert((4, ), largeImage)
+    cache.close()
+
+
+def test_pixmapGeneratorDiskCache(qtbot, validIconPath, tmpdir):
+    diskCache = iconify.cache.DiskCache(str(tmpdir.join('pixmaps.bin')))
+    pixmapCache = iconify.PixmapGenerator.pixmapCache()
+    size = QtCore.QSize(24, 24)
+
+    iconify.PixmapGenerator.setDiskCache(diskCache)
+    try:
+        pixmapCache.clear()
+        pixGen = iconify.PixmapGenerator('delete', color=QtGui.QColor('red'))
+        image = pixGen.pixmap(size).toImage()
+        assert diskCache.count() == 1
+
+        # Simulate a restart, the image should come from disk without
+        # parsing the svg file.
+        pixmapCache.clear()
+        pixGen = iconify.PixmapGenerator('delete', color=QtGui.QColor('red'))
+        assert pixGen.pixmap(size).toImage() == image
+        assert pixGen._renderer is None
+    finally:
+        iconify.PixmapGenerator.setDiskCache(None)
+        pixmapCache.clear()
+        diskCache.close()
@@ -1,6 +1,8 @@
 
 import os
 
+import pytest
+
 import iconify
 from iconify.qt import QtCore, QtGui, QtWidgets
 
@@ -115,3 +117,272 @@ def test_multiState(qtbot, validIconPath):
     assert icon.animCount() == 3
     assert icon.anim(mode=QtGui.QIcon.Selected) == breatheAnim
     assert icon.color(mode=QtGui.QIcon.Selected) == blueColor
+
+
+def test_pixmapGeneratorCacheBudget(qtbot, validIconPath):
+    cache = iconify.PixmapGenerator.pixmapCache()
+    initMaxCost = cache.maxCost()
+    cache.clear()
+
+    try:
+        size = QtCore.QSize(24, 24)
+        pixGen = iconify.core.PixmapGenerator('delete')
+        pixmap = pixGen.pixmap(size)
+        assert cache.count() == 1
+        assert cache.totalCost() == iconify.cache.imageCost(pixmap)
+
+        # Only the most recently rendered size fits in the budget.
+        cache.setMaxCost(cache.totalCost())
+        pixGen.pixmap(QtCore.QSize(16, 16))
+        assert cache.count() == 1
+        assert pixGen.pixmap(size) is not pixmap
+    finally:
+        cache.setMaxCost(initMaxCost)
+        cache.clear()
+
+
+def test_pixmapGeneratorAsyncRender(qtbot, validIconPath):
+    size = QtCore.QSize(24, 24)
+    color = QtGui.QColor('blue')
+
+    syncPixGen = iconify.PixmapGenerator('delete', color=color)
+    asyncPixGen = iconify.PixmapGenerator(
+        'delete', color=color, asyncRender=True
+    )
+    assert not syncPixGen.asyncRender()
+    assert asyncPixGen.asyncRender()
+
+    expectedImage = syncPixGen.pixmap(size).toImage()
+    iconify.PixmapGenerator.pixmapCache().clear()
+    iconify.PixmapGenerator.maskCache().clear()
+
+    # A cache miss returns a placeholder and renders in the background.
+    with qtbot.waitSignal(asyncPixGen.pixmapReady, timeout=5000):
+        placeholder = asyncPixGen.pixmap(size)
+        assert placeholder.size() == size
+        assert placeholder.toImage() != expectedImage
+
+    pixmap = asyncPixGen.pixmap(size)
+    assert pixmap.toImage() == expectedImage
+    assert asyncPixGen.pixmap(size) is pixmap
+
+    # Placeholders for new sizes are scaled from previous renders.
+    altSize = QtCore.QSize(32, 32)
+    with qtbot.waitSignal(asyncPixGen.pixmapReady, timeout=5000):
+        assert asyncPixGen.pixmap(altSize).size() == altSize
+
+    # Color variants of rendered masks don't need to wait for a render.
+    redPixGen = iconify.PixmapGenerator(
+        'delete', color=QtGui.QColor('red'), asyncRender=True
+    )
+    assert redPixGen.pixmap(size).toImage() != expectedImage
+    assert not redPixGen._pendingRenders
+
+    iconify.PixmapGenerator.pixmapCache().clear()
+    iconify.PixmapGenerator.maskCache().clear()
+
+
+def test_iconAsyncRenderDefault(qtbot, validIconPath):
+    assert not iconify.PixmapGenerator.asyncRenderDefault()
+    iconify.PixmapGenerator.setAsyncRenderDefault(True)
+    try:
+        icon = iconify.Icon('delete')
+        assert icon.pixmapGenerator().asyncRender()
+
+        icon = iconify.Icon('delete', asyncRender=False)
+        icon.addState('delete', mode=QtGui.QIcon.Active)
+        assert not icon.pixmapGenerator(mode=QtGui.QIcon.Active).asyncRender()
+    finally:
+        iconify.PixmapGenerator.setAsyncRenderDefault(False)
+
+
+def test_iconHighDpi(qtbot, validIconPath):
+    icon = iconify.Icon('delete', color=QtGui.QColor('red'))
+    pixGen = icon.pixmapGenerator()
+    size = QtCore.QSize(24, 24)
+
+    pixmap = pixGen.pixmap(size, devicePixelRatio=2.0)
+    assert pixmap.size() == size * 2
+    assert pixmap.devicePixelRatio() == 2.0
+    assert pixGen.pixmap(size, devicePixelRatio=2.0) is pixmap
+    assert pixGen.pixmap(size) is not pixmap
+
+    # Painting onto a high dpi device uses the physical resolution.
+    image = QtGui.QImage(
+        size * 2, QtGui.QImage.Format_ARGB32_Premultiplied
+    )
+    image.setDevicePixelRatio(2.0)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    icon.paint(painter, QtCore.QRect(QtCore.QPoint(0, 0), size))
+    painter.end()
+
+    image.setDevicePixelRatio(1.0)
+    assert image == pixmap.toImage().convertToFormat(image.format())
+
+    assert icon.availableSizes() == [size]
+    assert icon.actualSize(QtCore.QSize(48, 48)) == QtCore.QSize(48, 48)
+
+
+def test_pixmapGeneratorMaskCache(qtbot, validIconPath):
+    maskCache = iconify.PixmapGenerator.maskCache()
+    maskCache.clear()
+    size = QtCore.QSize(24, 24)
+
+    colors = ('red', 'green', 'blue')
+    images = []
+    for color in colors:
+        pixGen = iconify.PixmapGenerator('delete', color=QtGui.QColor(color))
+        images.append(pixGen.pixmap(size).toImage())
+
+    # All color variants are created from a single render of the svg.
+    assert maskCache.count() == 1
+    assert len(set(image.pixel(12, 12) for image in images)) == len(colors)
+
+    for color, image in zip(colors, images):
+        pixel = image.pixelColor(12, 12)
+        assert pixel.hue() == QtGui.QColor(color).hue()
+    maskCache.clear()
+
+
+def test_pixmapGeneratorAnimFingerprint(qtbot, validIconPath):
+    size = QtCore.QSize(24, 24)
+    spinA = iconify.anim.Spin()
+    spinB = iconify.anim.Spin()
+    slowSpin = iconify.anim.Spin(rpm=30)
+    for anim in (spinA, spinB, slowSpin):
+        anim.forceTick()
+
+    pixGenA = iconify.PixmapGenerator('delete', anim=spinA)
+    pixGenB = iconify.PixmapGenerator('delete', anim=spinB)
+    slowPixGen = iconify.PixmapGenerator('delete', anim=slowSpin)
+
+    # Identical animations share the frames they render...
+    assert pixGenA.pixmap(size) is pixGenB.pixmap(size)
+
+    # ...but different animations never do.
+    assert slowPixGen.pixmap(size) is not pixGenA.pixmap(size)
+    assert slowPixGen.pixmap(size).toImage() != pixGenA.pixmap(size).toImage()
+
+
+def test_sharedIcons(qtbot, validIconPath):
+    import gc
+
+    color = QtGui.QColor('red')
+    anim = iconify.anim.Spin()
+
+    # Icons aren't shared unless requested.
+    assert not iconify.Icon.sharedDefault()
+    assert iconify.Icon('delete') is not iconify.Icon('delete')
+
+    gc.collect()
+    initStats = iconify.Icon.stats()
+    iconA = iconify.Icon('delete', color=color, anim=anim, shared=True)
+    iconB = iconify.Icon(
+        'delete', color=QtGui.QColor('red'), anim=anim, shared=True
+    )
+    iconC = iconify.Icon('delete', color=color, shared=True)
+    assert iconA is iconB
+    assert iconA is not iconC
+
+    stats = iconify.Icon.stats()
+    assert stats['liveEngines'] == initStats['liveEngines'] + 2
+    assert stats['sharedHits'] == initStats['sharedHits'] + 1
+    assert stats['sharedMisses'] == initStats['sharedMisses'] + 2
+
+    # Adding a state stops the icon being shared with new callers.
+    iconC.addState('spinners:dots', mode=QtGui.QIcon.Active)
+    assert iconify.Icon('delete', color=color, shared=True) is not iconC
+
+    # Shared icons are released once they're no longer referenced.
+    iconify.Icon.setSharedDefault(True)
+    try:
+        del iconA, iconB, iconC
+        gc.collect()
+        assert iconify.Icon.stats()['sharedIcons'] == 0
+        assert iconify.Icon.stats()['liveEngines'] == initStats['liveEngines']
+        assert iconify.Icon('delete') is iconify.Icon('delete')
+    finally:
+        iconify.Icon.setSharedDefault(False)
+
+
+def test_pixmapGeneratorPrerender(qtbot, validIconPath):
+    pixmapCache = iconify.PixmapGenerator.pixmapCache()
+    pixmapCache.clear()
+    size = QtCore.QSize(24, 24)
+    anim = iconify.anim.Spin()
+    pixGen = iconify.PixmapGenerator(
+        'delete', color=QtGui.QColor('red'), anim=anim
+    )
+
+    with pytest.raises(ValueError):
+        iconify.PixmapGenerator('delete').prerender(size)
+
+    pixGen.prerender(size)
+    assert pixmapCache.count() == 1
+    strip = pixmapCache.get(pixGen._stripCacheKey(size, 1.0))
+    assert pixmapCache.totalCost() == iconify.cache.imageCost(strip)
+    assert strip.width() * strip.height() >= \
+        size.width() * size.height() * anim.frameCount()
+
+    # Every frame is drawn from the strip and matches a regular render.
+    for _ in range(anim.frameCount()):
+        expected = pixGen._colorize(pixGen._renderMask(size))
+        assert pixGen.pixmap(size).toImage() == expected
+        anim.forceTick()
+    assert pixmapCache.count() == 1
+
+    # Painting draws the current frame from the strip.
+    image = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    pixGen.paint(painter, QtCore.QRect(QtCore.QPoint(0, 0), size))
+    painter.end()
+    assert image == pixGen.pixmap(size).toImage()
+
+    # Strips can also be rendered in the background.
+    altSize = QtCore.QSize(32, 32)
+    with qtbot.waitSignal(pixGen.pixmapReady, timeout=5000):
+        pixGen.prerender(altSize, background=True)
+    assert pixmapCache.count() == 2
+    expected = pixGen._colorize(pixGen._renderMask(altSize))
+    assert pixGen.pixmap(altSize).toImage() == expected
+    pixmapCache.clear()
+
+
+def test_pixmapGeneratorTransformOnPaint(qtbot, validIconPath):
+    pixmapCache = iconify.PixmapGenerator.pixmapCache()
+    pixmapCache.clear()
+    size = QtCore.QSize(24, 24)
+    anim = iconify.anim.Spin()
+    anim.setTransformOnPaint(True)
+    assert anim.transformOnPaint()
+    pixGen = iconify.PixmapGenerator(
+        'delete', color=QtGui.QColor('red'), anim=anim
+    )
+    staticPixGen = iconify.PixmapGenerator('delete', color=QtGui.QColor('red'))
+
+    # A single untransformed image is cached for every frame.
+    for _ in range(10):
+        pixGen.pixmap(size)
+        anim.forceTick()
+    assert pixmapCache.count() == 1
+    staticPixmap = staticPixGen.pixmap(size)
+    assert pixmapCache.count() == 1
+
+    # Frames are the static image drawn with the transform of the frame.
+    pixmap = pixGen.pixmap(size)
+    assert pixmap.size() == size
+    assert pixmap.toImage() != staticPixmap.toImage()
+
+    image = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    pixGen.paint(painter, QtCore.QRect(QtCore.QPoint(0, 0), size))
+    painter.end()
+    assert image == pixmap.toImage()
+
+    # Prerendering only needs the static image.
+    pixGen.prerender(QtCore.QSize(32, 32))
+    assert pixmapCache.count() == 2
+    pixmapCache.clear()
@@ -0,0 +1,85 @@
+import os
+import zipfile
+
+import pytest
+
+import iconify
+from iconify.qt import QtCore, QtGui
+
+
+def test_exportIcons(qtbot, validIconPath, tmpdir):
+    outputDir = str(tmpdir)
+
+    stats = iconify.export.exportIcons(
+        ['delete', 'spinners:*'],
+        [(16, 16), (8, 12)],
+        outputDir,
+        colors=[None, 'red'],
+        processes=1,
+    )
+    assert stats['exported'] == 12
+    assert stats['skipped'] == 0
+
+    redPath = os.path.join(outputDir, 'delete-8x12-ff0000.png')
+    image = QtGui.QImage(redPath)
+    assert image.size() == QtCore.QSize(8, 12)
+
+    image = QtGui.QImage(os.path.join(outputDir, 'spinners', 'dots-16x16.png'))
+    assert image.size() == QtCore.QSize(16, 16)
+
+    # Files that are older than their svg are exported again
+    os.utime(redPath, (0, 0))
+
+    stats = iconify.export.exportIcons(
+        ['delete', 'spinners:*'],
+        [(16, 16), (8, 12)],
+        outputDir,
+        colors=[None, 'red'],
+        processes=1,
+    )
+    assert stats['exported'] == 1
+    assert stats['skipped'] == 11
+
+    with pytest.raises(ValueError):
+        iconify.export.exportIcons(
+            ['delete'], [(16, 16)], outputDir, fileFormat='invalid'
+        )
+
+
+def test_exportArchiveIcons(qtbot, monkeypatch, tmpdir):
+    iconDir = os.path.join(os.path.dirname(__file__), 'fixtures', 'icons')
+    archivePath = str(tmpdir.join('icons.zip'))
+    with zipfile.ZipFile(archivePath, 'w') as zipData:
+        for name in ('delete.svg', 'spinners/dots.svg'):
+            zipData.write(
+                os.path.join(iconDir, name.replace('/', os.sep)),
+                'pack/' + name,
+            )
+    monkeypatch.setattr(
+        iconify.path, '_ICON_PATH', [os.path.join(archivePath, 'pack')]
+    )
+    iconify.path.findIcon.cache_clear()
+    outputDir = str(tmpdir.mkdir('export'))
+
+    try:
+        stats = iconify.export.exportIcons(
+            ['delete', 'spinners:*'], [(16, 16)], outputDir, processes=1
+        )
+        assert stats['exported'] == 2
+        image = QtGui.QImage(os.path.join(outputDir, 'delete-16x16.png'))
+        assert image.size() == QtCore.QSize(16, 16)
+
+        # Files are up to date until the archive changes
+        stats = iconify.export.exportIcons(
+            ['delete', 'spinners:*'], [(16, 16)], outputDir, processes=1
+        )
+        assert stats['exported'] == 0
+        assert stats['skipped'] == 2
+
+        os.utime(archivePath, None)
+        stats = iconify.export.exportIcons(
+            ['delete', 'spinners:*'], [(16, 16)], outputDir, processes=1
+        )
+        assert stats['exported'] == 2
+    finally:
+        iconify.path.findIcon.cache_clear()
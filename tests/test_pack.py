@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+import iconify
+from iconify.qt import QtCore, QtGui
+
+
+def test_bake(qtbot, validIconPath, tmpdir):
+    packPath = os.path.join(str(tmpdir), 'icons.pack')
+    manifest = {
+        'sizes': [16],
+        'icons': [
+            {'name': 'delete', 'colors': [None, 'red']},
+            {'name': 'spinners:dots', 'sizes': [[8, 12]], 'anims': ['Spin']},
+        ],
+    }
+
+    count = iconify.pack.bake(manifest, packPath, processes=1)
+
+    anim = iconify.anim.Spin()
+    assert count == 2 + anim.frameCount()
+
+    pack = iconify.pack.PackFile(packPath)
+    assert pack.count() == count
+    assert pack.names() == ['delete', 'spinners:dots']
+    assert 'delete' in pack
+    assert 'invalid' not in pack
+
+    color = QtGui.QColor('red')
+    red = color.rgb()
+    image = pack.get(('delete', 16, 16, (), 0, red))
+    assert image.size() == QtCore.QSize(16, 16)
+
+    pixmapGenerator = iconify.PixmapGenerator('delete', color=color)
+    assert image == pixmapGenerator.pixmap(QtCore.QSize(16, 16)).toImage()
+
+    assert pack.get(('delete', 32, 32, (), 0, red)) is None
+    image = pack.get(('spinners:dots', 8, 12, anim.fingerprint(), 5, -1))
+    assert image.size() == QtCore.QSize(8, 12)
+
+    pack.close()
+
+    with pytest.raises(ValueError):
+        iconify.pack.bake(
+            {'sizes': [16], 'icons': [{'name': 'delete', 'anims': ['Bad']}]},
+            packPath,
+        )
+
+
+def test_pixmapGeneratorPack(qtbot, validIconPath, tmpdir):
+    packPath = os.path.join(str(tmpdir), 'icons.pack')
+    iconify.pack.bake(
+        {'sizes': [16], 'icons': [{'name': 'delete'}]}, packPath, processes=1
+    )
+
+    iconify.PixmapGenerator.setPack(iconify.pack.PackFile(packPath))
+    try:
+        # Icons in the pack don't need their svg file
+        iconify.path._ICON_PATH[:] = []
+        iconify.path.findIcon.cache_clear()
+
+        pixmapGenerator = iconify.PixmapGenerator('delete')
+        pixmap = pixmapGenerator.pixmap(QtCore.QSize(16, 16))
+        assert pixmap.size() == QtCore.QSize(16, 16)
+        assert pixmapGenerator._renderer is None
+
+        icon = iconify.Icon('delete')
+        assert not icon.pixmap(QtCore.QSize(16, 16)).isNull()
+
+        with pytest.raises(iconify.path.IconNotFoundError):
+            pixmapGenerator.pixmap(QtCore.QSize(32, 32))
+    finally:
+        iconify.PixmapGenerator.pack().close()
+        iconify.PixmapGenerator.setPack(None)
+
+    with pytest.raises(ValueError):
+        iconify.pack.PackFile(__file__)
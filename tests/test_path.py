@@ -1,4 +1,5 @@
 
+import json
 import os
 
 import pytest
@@ -37,3 +38,271 @@ def test_listIcons():
         icon = iconify.path.findIcon(iconName)
         assert icon is not None
         assert os.path.isfile(icon)
+
+
+def test_listIconsOrder(monkeypatch, tmpdir):
+    iconDir = os.path.join(os.path.dirname(__file__), 'fixtures', 'icons')
+    root = os.path.join(str(tmpdir), 'icons')
+    os.makedirs(os.path.join(root, 'spinners'))
+    for name in ('add.svg', os.path.join('spinners', 'dots.svg')):
+        open(os.path.join(root, name), 'w').close()
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [root, iconDir])
+
+    # Names repeated across directories are returned once, in the same order
+    # with and without the index
+    expected = [
+        'add',
+        'delete',
+        'duotone',
+        'spinners:colored',
+        'spinners:dots',
+    ]
+    assert iconify.path.listIcons() == expected
+    monkeypatch.setattr(iconify.path, '_iconIndex', None)
+    assert iconify.path.listIcons() == expected
+
+
+def test_iconIndex(monkeypatch, tmpdir):
+    root = os.path.join(str(tmpdir), 'icons')
+    os.makedirs(os.path.join(root, 'spinners'))
+    for name in ('delete.svg', os.path.join('spinners', 'dots.svg')):
+        open(os.path.join(root, name), 'w').close()
+
+    def setOldMtime():
+        # Recently modified directories are always scanned again
+        for dirPath in (root, os.path.join(root, 'spinners')):
+            os.utime(dirPath, (1000000000, 1000000000))
+
+    setOldMtime()
+
+    scanned = []
+    scanDirectory = iconify.path._scanDirectory
+
+    def _scanDirectory(dirPath, mtime):
+        scanned.append(dirPath)
+        return scanDirectory(dirPath, mtime)
+
+    monkeypatch.setattr(iconify.path, '_scanDirectory', _scanDirectory)
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [root])
+
+    initIndex = iconify.path.iconIndex()
+    indexPath = os.path.join(str(tmpdir), 'index.json')
+    iconify.path.setIconIndex(iconify.path.IconIndex(indexPath))
+    try:
+        assert sorted(iconify.path.listIcons()) == ['delete', 'spinners:dots']
+        assert len(scanned) == 2
+        assert os.path.isfile(indexPath)
+        assert iconify.path.findIcon('spinners:dots') == \
+            os.path.join(root, 'spinners', 'dots.svg')
+
+        # A new process reads the index without scanning anything
+        del scanned[:]
+        iconify.path.setIconIndex(iconify.path.IconIndex(indexPath))
+        assert sorted(iconify.path.listIcons()) == ['delete', 'spinners:dots']
+        assert scanned == []
+
+        # Only the directories that changed are scanned again
+        open(os.path.join(root, 'spinners', 'simple.svg'), 'w').close()
+        os.utime(os.path.join(root, 'spinners'), (1000000001, 1000000001))
+        assert sorted(iconify.path.listIcons()) == [
+            'delete', 'spinners:dots', 'spinners:simple'
+        ]
+        assert scanned == [os.path.join(root, 'spinners')]
+
+        del scanned[:]
+        iconify.path.rebuildIconIndex()
+        assert len(scanned) == 2
+
+        # Roots that have left the path are discarded
+        index = iconify.path.iconIndex()
+        index.update([str(tmpdir)])
+        assert index.names([root]) == []
+        with open(indexPath) as f:
+            assert list(json.load(f)['roots']) == [str(tmpdir)]
+    finally:
+        iconify.path.setIconIndex(initIndex)
+
+
+def test_iconIndexInRoot(monkeypatch, tmpdir):
+    # The default index is stored within the default root
+    root = str(tmpdir)
+    open(os.path.join(root, 'delete.svg'), 'w').close()
+    indexPath = os.path.join(root, '.cache', 'index.json')
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [root])
+
+    saves = []
+    save = iconify.path.IconIndex._save
+
+    def _save(self):
+        save(self)
+        saves.append(self)
+        # Saving modifies the cache directory, a while before the next
+        # process starts
+        mtime = 1000000000 + len(saves)
+        os.utime(os.path.dirname(indexPath), (mtime, mtime))
+        os.utime(root, (1000000000, 1000000000))
+
+    monkeypatch.setattr(iconify.path.IconIndex, '_save', _save)
+
+    index = iconify.path.IconIndex(indexPath)
+    assert index.names([root]) == ['delete']
+    index.rebuild([root])
+    del saves[:]
+
+    for _ in range(3):
+        index = iconify.path.IconIndex(indexPath)
+        assert index.names([root]) == ['delete']
+    assert saves == []
+
+
+def test_findIcons(monkeypatch, tmpdir):
+    iconDir = os.path.join(os.path.dirname(__file__), "fixtures", "icons")
+    emptyDir = str(tmpdir)
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [emptyDir, iconDir])
+    iconify.path.findIcon.cache_clear()
+
+    try:
+        found = iconify.path.findIcons(
+            ['delete', 'spinners:dots', 'invalid', 'spinners:invalid']
+        )
+        assert found == {
+            'delete': os.path.join(iconDir, 'delete.svg'),
+            'spinners:dots': os.path.join(iconDir, 'spinners', 'dots.svg'),
+        }
+
+        # Names are routed to the directory that holds their namespace, so
+        # the directories without it aren't probed.
+        iconify.path.findIcon.cache_clear()
+        iconify.path._rootListing(emptyDir)
+        iconify.path._rootListing(iconDir)
+
+        probed = []
+        isfile = os.path.isfile
+
+        def _isfile(path):
+            probed.append(path)
+            return isfile(path)
+
+        monkeypatch.setattr(os.path, 'isfile', _isfile)
+        assert iconify.path.findIcon('spinners:dots') == \
+            found['spinners:dots']
+        assert probed == [found['spinners:dots']]
+
+        # Names that aren't routed to a directory aren't probed at all
+        del probed[:]
+        for name in ('invalid', 'other:invalid', 'spinners:invalid'):
+            with pytest.raises(iconify.path.IconNotFoundError):
+                iconify.path.findIcon(name)
+        assert probed == [os.path.join(iconDir, 'spinners', 'invalid.svg')]
+    finally:
+        iconify.path.findIcon.cache_clear()
+
+
+def test_findInstalledIcon(monkeypatch, tmpdir):
+    root = tmpdir.mkdir('icons')
+    root.join('delete.svg').write('<svg/>')
+    os.utime(str(root), (1000000000, 1000000000))
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [str(root)])
+    iconify.path.findIcon.cache_clear()
+
+    scanned = []
+    scanDirectory = iconify.path._scanDirectory
+
+    def _scanDirectory(dirPath, mtime):
+        scanned.append(dirPath)
+        return scanDirectory(dirPath, mtime)
+
+    monkeypatch.setattr(iconify.path, '_scanDirectory', _scanDirectory)
+
+    try:
+        for name in ('fresh:add', 'add'):
+            with pytest.raises(iconify.path.IconNotFoundError):
+                iconify.path.findIcon(name)
+        assert iconify.path.findIcons(['fresh:add', 'add']) == {}
+        # Directories that haven't changed aren't listed again
+        assert scanned == [str(root)]
+
+        # A namespace installed after a failed lookup is found
+        root.mkdir('fresh').join('add.svg').write('<svg/>')
+        assert iconify.path.findIcon('fresh:add') == \
+            os.path.join(str(root), 'fresh', 'add.svg')
+
+        root.join('add.svg').write('<svg/>')
+        os.utime(str(root), (1000000001, 1000000001))
+        assert iconify.path.findIcons(['add']) == {
+            'add': os.path.join(str(root), 'add.svg'),
+        }
+    finally:
+        iconify.path.findIcon.cache_clear()
+
+
+def test_iterIcons(monkeypatch, tmpdir):
+    iconDir = os.path.join(os.path.dirname(__file__), "fixtures", "icons")
+    # A directory whose name appears again within it
+    otherDir = tmpdir.mkdir("icons").mkdir("icons")
+    otherDir.mkdir("icons").join("nested.svg").write("<svg/>")
+    otherDir.join("delete.svg").write("<svg/>")
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [str(otherDir), iconDir])
+
+    assert sorted(iconify.path.iterIcons()) == [
+        'delete',
+        'duotone',
+        'icons:nested',
+        'spinners:colored',
+        'spinners:dots',
+    ]
+    assert sorted(iconify.path.iterIcons(threads=1)) == \
+        sorted(iconify.path.iterIcons())
+
+    assert sorted(iconify.path.iterIcons(patterns=['spinners:*'])) == [
+        'spinners:colored',
+        'spinners:dots',
+    ]
+    assert sorted(iconify.path.iterIcons(patterns=['d*'])) == [
+        'delete',
+        'duotone',
+    ]
+    assert sorted(iconify.path.iterIcons(namespaces=['icons'])) == [
+        'icons:nested',
+    ]
+
+
+def test_searchIcons(validIconPath):
+    index = iconify.path.IconSearchIndex([
+        'fa:solid:arrow-left',
+        'fa:solid:arrow',
+        'fa:solid:narrow',
+        'md:arrows',
+        'md:arrow-left-bold',
+        'md:left',
+    ])
+
+    # Exact words first, then words starting with the query and finally
+    # words containing it, shortest base names first
+    assert index.search('arrow') == [
+        'fa:solid:arrow',
+        'fa:solid:arrow-left',
+        'md:arrow-left-bold',
+        'md:arrows',
+        'fa:solid:narrow',
+    ]
+    assert index.search('ARROW', namespace='md', limit=1) == [
+        'md:arrow-left-bold',
+    ]
+    assert index.search('left arr') == [
+        'fa:solid:arrow-left',
+        'md:arrow-left-bold',
+    ]
+    # Queries are not patterns
+    assert index.search('arr.*') == []
+    assert index.search('(arrow') == []
+    assert index.search('', namespace='fa', limit=2) == [
+        'fa:solid:arrow',
+        'fa:solid:arrow-left',
+    ]
+
+    assert iconify.path.searchIcons('dots') == ['spinners:dots']
+    assert iconify.path.searchIcons('o', namespace='spinners') == [
+        'spinners:dots',
+        'spinners:colored',
+    ]
@@ -0,0 +1,132 @@
+import iconify
+from iconify.qt import QtCore, QtGui, QtWidgets
+
+
+def test_repaintScheduler(qtbot):
+    scheduler = iconify.repaint.RepaintScheduler.instance()
+    assert scheduler is iconify.repaint.RepaintScheduler.instance()
+
+    widget = QtWidgets.QWidget()
+    widget.resize(100, 100)
+    qtbot.addWidget(widget)
+    widget.show()
+    qtbot.waitExposed(widget)
+
+    updates = []
+    widget.update = lambda *args: updates.append(args)
+
+    animA = iconify.anim.Spin()
+    animB = iconify.anim.Breathe()
+    scheduler.register(animA, widget, QtCore.QRect(0, 0, 10, 10))
+    scheduler.register(animB, widget, lambda w: QtCore.QRect(20, 20, 10, 10))
+
+    initStats = scheduler.stats()
+
+    # Both frame changes are merged into a single update
+    animA.forceTick()
+    animB.forceTick()
+    assert updates == []
+    qtbot.waitUntil(lambda: len(updates) > 0)
+    assert updates == [(QtCore.QRect(0, 0, 30, 30), )]
+
+    stats = scheduler.stats()
+    assert stats['requests'] == initStats['requests'] + 2
+    assert stats['updates'] == initStats['updates'] + 1
+
+    scheduler.unregister(animA, widget)
+    scheduler.unregister(animB)
+    assert scheduler.stats()['animations'] == initStats['animations'] - 2
+
+    animA.forceTick()
+    scheduler.flush()
+    assert len(updates) == 1
+
+
+def test_setAsButtonIcon(qtbot, validIconPath):
+    scheduler = iconify.repaint.RepaintScheduler.instance()
+
+    anim = iconify.anim.Spin()
+    icon = iconify.Icon('delete', anim=anim)
+    icon.addState('delete', anim=iconify.anim.Breathe(), mode=QtGui.QIcon.Active)
+
+    button = QtWidgets.QPushButton()
+    button.resize(100, 40)
+    button.setIconSize(QtCore.QSize(16, 16))
+    qtbot.addWidget(button)
+
+    initCount = scheduler.stats()['animations']
+    icon.setAsButtonIcon(button)
+    assert scheduler.stats()['animations'] == initCount + 2
+
+    # Setting the icon again doesn't connect the button again
+    icon.setAsButtonIcon(button)
+    for mode in (QtGui.QIcon.Normal, QtGui.QIcon.Active):
+        pixmapGenerator = icon.pixmapGenerator(mode=mode)
+        assert pixmapGenerator.receivers(
+            QtCore.SIGNAL('pixmapReady()')
+        ) == 1
+
+    assert iconify.core._buttonIconRect(button) == QtCore.QRect(40, 10, 20, 20)
+    button.setText('text')
+    assert iconify.core._buttonIconRect(button) == QtCore.QRect(0, 10, 100, 20)
+
+    button.deleteLater()
+    qtbot.waitUntil(
+        lambda: scheduler.stats()['animations'] == initCount, timeout=1000
+    )
+
+
+def test_pauseHidden(qtbot, validIconPath):
+    scheduler = iconify.repaint.RepaintScheduler.instance()
+    tick = iconify.anim.GlobalTick.instance()
+
+    anim = iconify.anim.Spin()
+    icon = iconify.Icon('delete', anim=anim)
+
+    tabs = QtWidgets.QTabWidget()
+    qtbot.addWidget(tabs)
+    button = QtWidgets.QPushButton()
+    tabs.addTab(button, 'button')
+    tabs.addTab(QtWidgets.QWidget(), 'other')
+    icon.setAsButtonIcon(button)
+
+    tabs.show()
+    qtbot.waitExposed(tabs)
+
+    anim.start()
+    try:
+        # Hidden animations keep playing by default
+        tabs.setCurrentIndex(1)
+        anim.forceTick()
+        assert not anim.suspended()
+        tabs.setCurrentIndex(0)
+
+        scheduler.setPauseHidden(True)
+        initCount = tick.subscriberCount()
+        initStats = scheduler.stats()
+
+        anim.forceTick()
+        assert not anim.suspended()
+
+        # The animation is suspended once it's button is hidden
+        tabs.setCurrentIndex(1)
+        frame = anim.frame()
+        anim.forceTick()
+        assert anim.suspended()
+        assert anim.active()
+        assert tick.subscriberCount() == initCount - 1
+
+        stats = scheduler.stats()
+        assert stats['suspendedAnimations'] == \
+            initStats['suspendedAnimations'] + 1
+        assert stats['suppressedRenders'] == \
+            initStats['suppressedRenders'] + 1
+
+        # and resumed from the same frame once it's shown again
+        tabs.setCurrentIndex(0)
+        assert not anim.suspended()
+        assert anim.frame() == frame + 1
+        assert tick.subscriberCount() == initCount
+    finally:
+        scheduler.setPauseHidden(False)
+        anim.stop()
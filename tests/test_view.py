@@ -0,0 +1,64 @@
+import iconify
+from iconify.qt import QtCore, QtWidgets
+
+
+class Model(QtCore.QStringListModel):
+
+    def __init__(self, anim):
+        super(Model, self).__init__(['delete'] * 20000)
+        self.anim = anim
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DecorationRole:
+            # Only every 1000th row is animated
+            if index.row() % 1000 == 2:
+                return iconify.Icon('delete', anim=self.anim)
+            return iconify.Icon('delete')
+        return super(Model, self).data(index, role)
+
+
+def test_iconAnimations(qtbot, validIconPath):
+    anim = iconify.anim.Spin()
+    model = Model(anim)
+
+    icon = model.index(2).data(QtCore.Qt.DecorationRole)
+    assert not hasattr(icon, 'anim')
+    assert iconify.Icon.animations(icon) == [anim]
+    assert iconify.Icon.animations(model.index(0).data(
+        QtCore.Qt.DecorationRole
+    )) == []
+    assert iconify.Icon.animations(None) == []
+
+
+def test_animatedIconDelegate(qtbot, validIconPath):
+    anim = iconify.anim.Spin()
+    model = Model(anim)
+
+    view = QtWidgets.QListView()
+    view.setUniformItemSizes(True)
+    view.resize(200, 200)
+    view.setModel(model)
+    delegate = iconify.view.AnimatedIconDelegate(view)
+    view.setItemDelegate(delegate)
+    qtbot.addWidget(view)
+
+    view.show()
+    qtbot.waitExposed(view)
+    qtbot.waitUntil(lambda: len(delegate.animatedIndexes()) > 0)
+
+    # Only the visible animated index is tracked
+    assert [i.row() for i in delegate.animatedIndexes()] == [2]
+
+    updates = []
+    viewport = view.viewport()
+    viewport.update = lambda *args: updates.append(args)
+
+    anim.forceTick()
+    qtbot.waitUntil(lambda: len(updates) > 0)
+    assert updates == [(view.visualRect(model.index(2)), )]
+
+    # Indexes scrolled out of view are forgotten
+    view.scrollTo(model.index(10000))
+    anim.forceTick()
+    iconify.repaint.RepaintScheduler.instance().flush()
+    assert delegate.animatedIndexes() == []
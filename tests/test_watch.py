@@ -0,0 +1,83 @@
+import os
+import shutil
+
+import iconify
+from iconify.qt import QtCore, QtGui
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "icons")
+
+
+def test_iconWatcher(qtbot, monkeypatch, tmpdir):
+    rootA = os.path.join(str(tmpdir), 'a')
+    rootB = os.path.join(str(tmpdir), 'b')
+    os.makedirs(rootA)
+    os.makedirs(rootB)
+    shutil.copy(os.path.join(FIXTURES, 'delete.svg'), rootB)
+
+    monkeypatch.setattr(iconify.path, '_ICON_PATH', [rootA, rootB])
+    iconify.path.findIcon.cache_clear()
+    iconify.PixmapGenerator.pixmapCache().clear()
+
+    watcher = iconify.watch.IconWatcher.instance()
+    watcher.setEnabled(True)
+    try:
+        assert watcher.directories() == [rootA, rootB]
+
+        size = QtCore.QSize(16, 16)
+        pixGen = iconify.PixmapGenerator('delete')
+        deletePath = os.path.join(rootB, 'delete.svg')
+        assert pixGen.path() == deletePath
+        assert watcher.files() == [deletePath]
+        pixGen.pixmap(size)
+
+        # Editing the svg file discards it's cached images
+        with qtbot.waitSignal(pixGen.pixmapReady, timeout=5000):
+            shutil.copy(os.path.join(FIXTURES, 'duotone.svg'), deletePath)
+        assert iconify.PixmapGenerator.pixmapCache().count() == 0
+        expected = iconify.PixmapGenerator(deletePath).pixmap(size)
+        assert pixGen.pixmap(size).toImage() == expected.toImage()
+
+        # An svg file added to an earlier directory is found instead
+        newPath = os.path.join(rootA, 'delete.svg')
+        with qtbot.waitSignal(watcher.iconChanged, timeout=5000):
+            shutil.copy(os.path.join(FIXTURES, 'delete.svg'), newPath)
+        assert iconify.path.findIcon('delete') == newPath
+        assert pixGen.path() == newPath
+
+        # As are svg files in new sub directories, which are all discarded
+        # in a single pass
+        shutil.copytree(
+            os.path.join(FIXTURES, 'spinners'),
+            os.path.join(str(tmpdir), 'spinners'),
+        )
+        invalidated = []
+        invalidateIcons = iconify.path.invalidateIcons
+
+        def _invalidateIcons(filePaths):
+            invalidated.append(sorted(filePaths))
+            return invalidateIcons(filePaths)
+
+        monkeypatch.setattr(
+            iconify.path, 'invalidateIcons', _invalidateIcons
+        )
+        with qtbot.waitSignal(watcher.iconChanged, timeout=5000):
+            shutil.move(os.path.join(str(tmpdir), 'spinners'), rootB)
+        assert invalidated == [[
+            os.path.join(rootB, 'spinners', 'colored.svg'),
+            os.path.join(rootB, 'spinners', 'dots.svg'),
+        ]]
+        assert iconify.path.findIcon('spinners:dots') == \
+            os.path.join(rootB, 'spinners', 'dots.svg')
+        assert os.path.join(rootB, 'spinners') in watcher.directories()
+
+        # Removing the svg file falls back to the later directory
+        with qtbot.waitSignal(pixGen.pixmapReady, timeout=5000):
+            os.remove(newPath)
+        assert pixGen.path() == deletePath
+    finally:
+        watcher.setEnabled(False)
+        iconify.path.findIcon.cache_clear()
+        iconify.PixmapGenerator.pixmapCache().clear()
+
+    assert watcher.directories() == []
+    assert watcher.files() == []